@@ -0,0 +1,122 @@
+"""
+Synthetic restaurant pages for benchmarks.
+
+Each generator returns the raw response body the restaurant's parser expects,
+with `scale` multiplying both the menu items and the unrelated page content
+around them.
+"""
+
+import json
+from datetime import date, timedelta
+
+DAY_NAMES = ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai"]
+
+DISHES = [
+    "Lohikeittoa ja ruisleipää (L, G)",
+    "Broileripastaa tomaattikastikkeessa (L)",
+    "Kasviscurrya ja basmatiriisiä (M, G, VEG)",
+    "Jauhelihakastiketta ja perunamuusia (L, G)",
+    "Uunilohta ja tilliperunoita (L, G)",
+    "Pinaattiohukaisia ja puolukkasurvosta (L)",
+]
+
+
+def _dishes(day_index: int, scale: int):
+    """Get the dishes of one day, repeated according to scale."""
+    return [DISHES[(day_index + i) % len(DISHES)] for i in range(max(2, 2 * scale))]
+
+
+def _filler(scale: int) -> str:
+    """Get unrelated page content such as navigation and footers."""
+    return "".join(
+        f'<div class="nav"><a href="/page-{i}">Sivu {i}</a>'
+        f"<span>Aukioloajat MA - PE 08:00 - 15:00</span></div>"
+        for i in range(20 * scale)
+    )
+
+
+def kahvila_epila_page(scale: int = 1) -> bytes:
+    """Kahvila Epilä: day headings followed by paragraph siblings."""
+    body = [_filler(scale), '<div class="menu">']
+    for day_index, day in enumerate(DAY_NAMES):
+        body.append(f"<h2>{day}</h2>")
+        body.extend(f"<p>{dish}</p>" for dish in _dishes(day_index, scale))
+    body.append("</div>")
+    body.append(_filler(scale))
+    return f"<html><body>{''.join(body)}</body></html>".encode("utf-8")
+
+
+def stahlberg_kolmenkulma_page(scale: int = 1) -> bytes:
+    """Ståhlberg Kolmenkulma: day headings followed by ruokalista tables."""
+    body = [_filler(scale)]
+    for day_index, day in enumerate(DAY_NAMES):
+        rows = "".join(
+            f'<tr><td class="column-1">{dish}</td><td class="column-2">12,50</td></tr>'
+            for dish in _dishes(day_index, scale)
+        )
+        body.append(
+            f'<div class="et_pb_text"><h3>{day} 10:30-15:00</h3></div>'
+            f'<div class="et_pb_code"><table class="tablepress ruokalista">'
+            f"<tbody>{rows}</tbody></table></div>"
+        )
+    body.append(_filler(scale))
+    return f"<html><body>{''.join(body)}</body></html>".encode("utf-8")
+
+
+def pizza_buffa_page(scale: int = 1) -> bytes:
+    """Pizza Buffa: day names and dishes in running page text."""
+    body = [_filler(scale)]
+    for day_index, day in enumerate(DAY_NAMES):
+        body.append(f"<h3>{day}</h3>")
+        body.append("<p>Lounas: salaatti- ja leipäpöytä, ruokajuomat ja kahvi</p>")
+        body.extend(f"<p>{dish} 12,90 €</p>" for dish in _dishes(day_index, scale))
+    body.append(_filler(scale))
+    return f"<html><body>{''.join(body)}</body></html>".encode("utf-8")
+
+
+def nokian_kartano_feed(scale: int = 1, week_start: date = date(2026, 10, 12)) -> bytes:
+    """Nokian Kartano: Compass Group menuapi JSON feed."""
+    days = []
+    for day_index in range(7):
+        day_date = week_start + timedelta(days=day_index)
+        components = _dishes(day_index, scale) if day_index < 5 else []
+        days.append(
+            {
+                "Date": f"{day_date.isoformat()}T00:00:00+00:00",
+                "LunchTime": "10.30-13.00",
+                "SetMenus": [
+                    {"Name": "Lounas", "Price": "12,40", "Components": components},
+                    {"Name": "Jälkiruoka", "Components": ["Mustikkakiisseli"]},
+                ],
+            }
+        )
+    feed = {"RestaurantName": "Nokian Kartano", "MenusForDays": days}
+    return json.dumps(feed).encode("utf-8")
+
+
+def kontukeittio_feed(scale: int = 1) -> bytes:
+    """Kontukeittiö Nokia: Luncher week JSON document."""
+    days = []
+    for day_index, day in enumerate(DAY_NAMES):
+        lunches = [
+            {
+                "title": {"fi": dish.split(" (")[0]},
+                "description": {"fi": "Salaattipöytä"},
+                "allergens": [{"abbreviation": {"fi": "L"}}],
+                "normalPrice": {"price": "11,50"},
+            }
+            for dish in _dishes(day_index, scale)
+        ]
+        lunches.append({"title": {"fi": "Salaattipöytä"}, "description": {}})
+        days.append({"dayName": {"fi": day}, "lunches": lunches})
+    document = {"success": True, "data": {"week": {"days": days}}}
+    return json.dumps(document).encode("utf-8")
+
+
+FIXTURES = {
+    "Kahvila Epilä": kahvila_epila_page,
+    "Kontukeittiö Nokia": kontukeittio_feed,
+    "Nokian Kartano (FoodCo)": nokian_kartano_feed,
+    "Pizza Buffa ABC Kolmenkulma": pizza_buffa_page,
+    "Ståhlberg Kolmenkulma": stahlberg_kolmenkulma_page,
+}
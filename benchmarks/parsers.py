@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the restaurant parsers and Telegram message rendering.
+
+Each restaurant's scrape_menu parse path runs over synthetic pages (optionally
+enlarged with --scale) and over pages recorded in a response archive
+(--archive). TelegramBot.format_combined_menu_message and split_message run
+over the parsed menus. Every stage reports median wall time, net allocated
+memory blocks and peak traced memory.
+
+    uv run benchmarks/parsers.py --scale 1 10
+    uv run benchmarks/parsers.py --save-baseline benchmarks/baseline.json
+    uv run benchmarks/parsers.py --baseline benchmarks/baseline.json
+
+With --baseline the run fails when a stage is slower or uses more peak memory
+than the baseline by more than --threshold (default 25 %).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import FIXTURES  # noqa: E402
+from restaurants.archive import ResponseArchive  # noqa: E402
+from restaurants.kahvila_epila import KahvilaEpila  # noqa: E402
+from restaurants.kontukeittio import KontukeittioNokia  # noqa: E402
+from restaurants.nokian_kartano import NokianKartano  # noqa: E402
+from restaurants.pizza_buffa import PizzaBuffa  # noqa: E402
+from restaurants.stahlberg_kolmenkulma import StahlbergKolmenkulma  # noqa: E402
+
+RESTAURANT_CLASSES = [
+    KahvilaEpila,
+    KontukeittioNokia,
+    NokianKartano,
+    PizzaBuffa,
+    StahlbergKolmenkulma,
+]
+
+
+def make_response(body: bytes, url: str) -> requests.Response:
+    """Build an in-memory HTTP response for a page body."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.encoding = "utf-8"
+    response.url = url
+    return response
+
+
+def serve_body(restaurant, body: bytes) -> None:
+    """Make the restaurant parse the given body instead of fetching."""
+    restaurant.fetch = lambda url=None: make_response(body, url or restaurant.url)
+
+
+def load_inputs(scales: List[int], archive_dir: Optional[str]) -> Dict[str, dict]:
+    """Collect page bodies per input set and restaurant name."""
+    inputs = {
+        f"synthetic-x{scale}": {
+            name: generate(scale) for name, generate in FIXTURES.items()
+        }
+        for scale in scales
+    }
+
+    if archive_dir:
+        archive = ResponseArchive(archive_dir)
+        recorded = {}
+        for restaurant_class in RESTAURANT_CLASSES:
+            restaurant = restaurant_class()
+            record = archive.lookup(restaurant.url)
+            if record:
+                recorded[restaurant.name] = archive.load_body(record["digest"])
+        if recorded:
+            inputs["recorded"] = recorded
+
+    return inputs
+
+
+def measure(func: Callable, repeat: int) -> dict:
+    """Measure median wall time, then allocations and peak memory of one run."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        blocks_before = sum(
+            s.count for s in tracemalloc.take_snapshot().statistics("filename")
+        )
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        blocks_after = sum(
+            s.count for s in tracemalloc.take_snapshot().statistics("filename")
+        )
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "time_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "net_blocks": blocks_after - blocks_before,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(scales: List[int], archive_dir: Optional[str], repeat: int) -> dict:
+    """Run all parse and render stages and return metrics per stage."""
+    from telegram_bot import TelegramBot
+
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "benchmark")
+    os.environ.setdefault("TELEGRAM_CHANNEL_ID", "benchmark")
+    bot = TelegramBot()
+
+    results = {}
+    for label, bodies in load_inputs(scales, archive_dir).items():
+        formatted_menus = []
+        for restaurant_class in RESTAURANT_CLASSES:
+            restaurant = restaurant_class()
+            if restaurant.name not in bodies:
+                continue
+            serve_body(restaurant, bodies[restaurant.name])
+            results[f"{label}/{restaurant.name}/parse"] = measure(
+                restaurant.scrape_menu, repeat
+            )
+            formatted_menus.append(
+                restaurant.format_current_day_menu(restaurant.scrape_menu())
+            )
+
+        message = bot.format_combined_menu_message(formatted_menus)
+        results[f"{label}/telegram/format"] = measure(
+            lambda: bot.format_combined_menu_message(formatted_menus), repeat
+        )
+        results[f"{label}/telegram/split"] = measure(
+            lambda: bot.split_message(message), repeat
+        )
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """List stages that regressed beyond the threshold against the baseline."""
+    regressions = []
+    for stage, metrics in results.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+        for key in ("time_ms", "peak_kib"):
+            if base[key] > 0 and metrics[key] > base[key] * (1 + threshold):
+                change = (metrics[key] / base[key] - 1) * 100
+                regressions.append(
+                    f"{stage}: {key} {base[key]} -> {metrics[key]} (+{change:.0f} %)"
+                )
+    return regressions
+
+
+def print_report(results: dict) -> None:
+    """Print a table of the stage metrics."""
+    print(
+        f"{'stage':<60} {'time ms':>10} {'min ms':>10} {'blocks':>8} {'peak KiB':>10}"
+    )
+    for stage, metrics in results.items():
+        print(
+            f"{stage:<60} {metrics['time_ms']:>10} {metrics['min_ms']:>10} "
+            f"{metrics['net_blocks']:>8} {metrics['peak_kib']:>10}"
+        )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(description="Benchmark menu parsers.")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--archive", help="Response archive with recorded pages")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--save-baseline", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare the results to this file")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    """Run the benchmarks and check them against a baseline."""
+    args = _build_parser().parse_args(argv)
+    results = run_benchmarks(args.scale, args.archive, args.repeat)
+    print_report(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=2, ensure_ascii=False)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        if regressions:
+            print("❌ Regressions beyond threshold:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return False
+        print("✅ No regressions beyond threshold")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Scale test of the scrape and delivery pipeline over a synthetic registry.
+
+A registry of the requested size is built from copies of every restaurant,
+each parsing its synthetic fixture page in memory. The full pipeline runs in
+dry-run mode for each size: scraping all menus, then rendering and splitting
+the messages of every channel, without posting. Every size reports wall
+time, throughput, peak traced memory and message count, with a chart and the
+scaling exponent against the previous size (1.0 is linear).
+
+    uv run benchmarks/scale.py --sizes 50 100 250 500 --channels 20
+    uv run benchmarks/scale.py --max-exponent 1.3 --json scale.json
+
+With --max-exponent the run fails when time or memory grows faster than that
+power of the registry size, so superlinear behaviour shows up early.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import tracemalloc
+from typing import List, Optional
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import FIXTURES  # noqa: E402
+from parsers import RESTAURANT_CLASSES, serve_body  # noqa: E402
+
+# Dietary filters the synthetic channels cycle through, giving distinct views
+CHANNEL_DIETS = [None, ["gluten-free"], ["lactose-free"], ["vegan"]]
+LOCALES = ["fi", "en"]
+BAR_WIDTH = 40
+
+
+def synthetic_registry(size: int, page_scale: int = 1) -> list:
+    """Create size restaurants cycling through every restaurant type.
+
+    Each copy gets its own name and URL and parses its type's fixture page.
+    """
+    pages = {name: generate(page_scale) for name, generate in FIXTURES.items()}
+    registry = []
+    for i in range(size):
+        restaurant = RESTAURANT_CLASSES[i % len(RESTAURANT_CLASSES)]()
+        body = pages[restaurant.name]
+        restaurant.name = f"{restaurant.name} #{i + 1}"
+        restaurant.url = f"{restaurant.url}#{i + 1}"
+        serve_body(restaurant, body)
+        registry.append(restaurant)
+    return registry
+
+
+def synthetic_channels(count: int, registry: list) -> List[dict]:
+    """Create channels over both locales, diet filters and restaurant subsets."""
+    from channels import make_channel
+
+    channels = []
+    for i in range(count):
+        # Every other pair of channels shows only half of the registry
+        subset = None
+        if i % 4 >= 2:
+            subset = [restaurant.name for restaurant in registry[i % 2 :: 2]]
+        channels.append(
+            make_channel(
+                f"@scale_{i}",
+                LOCALES[i % len(LOCALES)],
+                subset,
+                CHANNEL_DIETS[(i // len(LOCALES)) % len(CHANNEL_DIETS)],
+            )
+        )
+    return channels
+
+
+def run_pipeline(registry: list, channels: List[dict]) -> dict:
+    """Scrape and render for every channel without posting; return the stages."""
+    import scraper
+    from restaurants.instrumentation import reset_instrumentation
+
+    reset_instrumentation()
+
+    start = time.perf_counter()
+    week_menus = scraper.scrape_week_menus(registry)
+    scraped = time.perf_counter()
+    restaurants_by_locale = {locale: registry for locale in LOCALES}
+    menus_by_locale = {locale: week_menus for locale in LOCALES}
+    deliveries = scraper.build_deliveries(
+        channels, restaurants_by_locale, menus_by_locale
+    )
+    rendered = time.perf_counter()
+
+    return {
+        "scrape_ms": (scraped - start) * 1000,
+        "render_ms": (rendered - scraped) * 1000,
+        "messages": sum(len(parts) for _, parts in deliveries),
+        "message_bytes": sum(
+            len(part.encode("utf-8")) for _, parts in deliveries for part in parts
+        ),
+        "failed": sum(1 for menu in week_menus.values() if not menu),
+    }
+
+
+def scaling_exponent(
+    size: float, value: float, prev_size: float, prev_value: float
+) -> Optional[float]:
+    """Power of the size growth that the value grew by, None if undefined."""
+    if min(size, value, prev_size, prev_value) <= 0 or size == prev_size:
+        return None
+    return math.log(value / prev_value) / math.log(size / prev_size)
+
+
+def _round(value: Optional[float], digits: int = 2) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+
+def run_scale(sizes: List[int], channel_count: int, page_scale: int = 1) -> List[dict]:
+    """Run the pipeline at every registry size and collect its metrics."""
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "benchmark")
+    rows: List[dict] = []
+    for size in sorted(sizes):
+        registry = synthetic_registry(size, page_scale)
+        channels = synthetic_channels(channel_count, registry)
+
+        run_pipeline(registry, channels)  # Warm up imports and lazy state
+        stages = run_pipeline(registry, channels)
+        tracemalloc.start()
+        try:
+            run_pipeline(registry, channels)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        total_ms = stages["scrape_ms"] + stages["render_ms"]
+        row = {
+            "restaurants": size,
+            "channels": channel_count,
+            "scrape_ms": round(stages["scrape_ms"], 1),
+            "render_ms": round(stages["render_ms"], 1),
+            "total_ms": round(total_ms, 1),
+            "restaurants_per_s": round(size / (total_ms / 1000), 1),
+            "peak_mib": round(peak / 1024 / 1024, 2),
+            "messages": stages["messages"],
+            "message_bytes": stages["message_bytes"],
+            "failed": stages["failed"],
+        }
+        if rows:
+            previous = rows[-1]
+            for key, value in (("time", "total_ms"), ("memory", "peak_mib")):
+                row[f"{key}_exponent"] = _round(
+                    scaling_exponent(
+                        size, row[value], previous["restaurants"], previous[value]
+                    )
+                )
+        rows.append(row)
+    return rows
+
+
+def superlinear(rows: List[dict], max_exponent: float) -> List[str]:
+    """List the sizes where time or memory grew faster than allowed."""
+    problems = []
+    for row in rows:
+        for key in ("time_exponent", "memory_exponent"):
+            exponent = row.get(key)
+            if exponent is not None and exponent > max_exponent:
+                problems.append(
+                    f"{row['restaurants']} restaurants: {key.split('_')[0]} grows "
+                    f"as size^{exponent} (limit {max_exponent})"
+                )
+    return problems
+
+
+def chart(rows: List[dict], key: str, unit: str) -> List[str]:
+    """Draw a horizontal bar per registry size for one metric."""
+    largest = max((row[key] for row in rows), default=0) or 1
+    lines = []
+    for row in rows:
+        bar = "#" * max(1, round(BAR_WIDTH * row[key] / largest))
+        lines.append(f"{row['restaurants']:>6} | {bar:<{BAR_WIDTH}} {row[key]} {unit}")
+    return lines
+
+
+def print_report(rows: List[dict]) -> None:
+    """Print the metrics table and the throughput and memory charts."""
+    print(
+        f"{'size':>6} {'scrape ms':>10} {'render ms':>10} {'rest/s':>8} "
+        f"{'peak MiB':>9} {'messages':>9} {'time exp':>9} {'mem exp':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['restaurants']:>6} {row['scrape_ms']:>10} {row['render_ms']:>10} "
+            f"{row['restaurants_per_s']:>8} {row['peak_mib']:>9} "
+            f"{row['messages']:>9} {str(row.get('time_exponent', '-')):>9} "
+            f"{str(row.get('memory_exponent', '-')):>8}"
+        )
+    for title, key, unit in (
+        ("Throughput", "restaurants_per_s", "restaurants/s"),
+        ("Peak memory", "peak_mib", "MiB"),
+        ("Messages", "messages", "messages"),
+    ):
+        print(f"\n{title}")
+        for line in chart(rows, key, unit):
+            print(line)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(description="Scale-test the menu pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--page-scale", type=int, default=1)
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument(
+        "--max-exponent", type=float, help="Fail on superlinear growth beyond this"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    """Run the scale test and check the growth of time and memory."""
+    import logging
+
+    args = _build_parser().parse_args(argv)
+    # Scrape logging would dominate the timings
+    logging.disable(logging.WARNING)
+    rows = run_scale(args.sizes, args.channels, args.page_scale)
+    print_report(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as results_file:
+            json.dump(rows, results_file, indent=2)
+        print(f"\nSaved results to {args.json}")
+
+    if args.max_exponent is not None:
+        problems = superlinear(rows, args.max_exponent)
+        if problems:
+            print("\n❌ Superlinear growth:")
+            for problem in problems:
+                print(f"  {problem}")
+            return False
+        print("\n✅ Time and memory grow within the limit")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
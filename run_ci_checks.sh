@@ -34,6 +34,98 @@ echo "----------------------------------------------------------------------"
 echo "🧪 Testing Ståhlberg Kolmenkulma parsing..."
 uv run pytest tests/test_stahlberg_kolmenkulma_parsing.py -v
 
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing menu history..."
+uv run pytest tests/test_history.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing response archive..."
+uv run pytest tests/test_archive.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing benchmark suite..."
+uv run pytest tests/test_benchmarks.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing timing instrumentation..."
+uv run pytest tests/test_instrumentation.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing performance history..."
+uv run pytest tests/test_performance.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing Compass Group provider..."
+uv run pytest tests/test_compass.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing Luncher provider..."
+uv run pytest tests/test_luncher.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing declarative scraper engine..."
+uv run pytest tests/test_declarative.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing multi-locale channels..."
+uv run pytest tests/test_locales.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing multi-channel fan-out..."
+uv run pytest tests/test_channels.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing interactive bot..."
+uv run pytest tests/test_interactive_bot.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing dietary filters and subscriptions..."
+uv run pytest tests/test_diets.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing HTTP API..."
+uv run pytest tests/test_http_api.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing static export..."
+uv run pytest tests/test_static_export.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing delivery sinks..."
+uv run pytest tests/test_sinks.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing publish schedules..."
+uv run pytest tests/test_publish_schedule.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing hedged requests..."
+uv run pytest tests/test_hedging.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing connection pre-warming..."
+uv run pytest tests/test_prewarm.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing delivery change detection..."
+uv run pytest tests/test_delivery_log.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing scrape memory budget..."
+uv run pytest tests/test_memory.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing end to end against fake servers..."
+uv run pytest tests/test_end_to_end.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing history backfill..."
+uv run pytest tests/test_backfill.py -v
+
+echo "----------------------------------------------------------------------"
+echo "🧪 Testing phrase dictionaries..."
+uv run pytest tests/test_phrases.py -v
+
 echo "----------------------------------------------------------------------"
 echo "🔌 Testing scraper imports..."
 uv run python -c "
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Re-parse archived raw pages with the current parsers and backfill the history.
+
+Menus stored in the history keep whatever the parsers extracted when they were
+scraped, so a parser fix does not reach earlier weeks. The backfill walks the
+response archive, re-runs every restaurant's current scraper over each of its
+archived fetches in a process pool (replaying the archive, so nothing is
+fetched) and replaces the stored dishes of every re-parsed restaurant and week
+in batched transactions. A summary lists the dishes added and removed per
+restaurant and week.
+
+    uv run src/backfill.py --archive archive --db menu_history.db --dry-run
+    uv run src/backfill.py --archive archive --db menu_history.db --workers 8
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from history import MenuHistory, Replacement
+from restaurants.archive import REPLAY, ArchiveAdapter, ResponseArchive
+from restaurants.base import get_day_date, get_week_start, upstream_url
+
+# Restaurant and week replacements written per transaction
+DEFAULT_BATCH_SIZE = 50
+
+# Per worker process: the replaying adapter and the restaurants by name
+_worker: dict = {}
+
+
+def _run_end(timestamps: List[str], fetched_at: str, next_fetch: Optional[str]):
+    """The last archive timestamp before a restaurant's next fetch.
+
+    Replaying as of this moment also serves the other pages the scraper
+    fetched in the same run, e.g. fallback URLs.
+    """
+    if next_fetch is None:
+        return timestamps[-1]
+    return max(fetched_at, timestamps[bisect_left(timestamps, next_fetch) - 1])
+
+
+def plan_snapshots(archive: ResponseArchive, restaurants) -> List[dict]:
+    """List the archived fetches of every restaurant to re-parse.
+
+    A page that is unchanged within a week is parsed only once. Snapshots
+    are ordered by restaurant, week and fetch time.
+    """
+    records = list(archive.records())
+    timestamps = sorted({record["fetched_at"] for record in records})
+    by_url: Dict[str, List[dict]] = {}
+    for record in records:
+        by_url.setdefault(record["url"], []).append(record)
+
+    snapshots = []
+    for restaurant in restaurants:
+        fetches = sorted(
+            by_url.get(upstream_url(restaurant.url), []),
+            key=lambda record: record["fetched_at"],
+        )
+        seen: Set[Tuple[date, str]] = set()
+        for index, record in enumerate(fetches):
+            fetched_at = record["fetched_at"]
+            week = get_week_start(datetime.fromisoformat(fetched_at))
+            if (week, record["digest"]) in seen:
+                continue
+            seen.add((week, record["digest"]))
+            next_fetch = (
+                fetches[index + 1]["fetched_at"] if index + 1 < len(fetches) else None
+            )
+            snapshots.append(
+                {
+                    "restaurant": restaurant.name,
+                    "week": week,
+                    "fetched_at": fetched_at,
+                    "as_of": _run_end(timestamps, fetched_at, next_fetch),
+                }
+            )
+    return snapshots
+
+
+def _init_worker(archive_dir: str) -> None:
+    """Create the restaurants of a worker, all replaying from the archive."""
+    from scraper import get_restaurants
+
+    adapter = ArchiveAdapter(ResponseArchive(archive_dir), mode=REPLAY)
+    restaurants = {}
+    for restaurant in get_restaurants():
+        restaurant.session.mount("http://", adapter)
+        restaurant.session.mount("https://", adapter)
+        restaurants[restaurant.name] = restaurant
+    _worker.update(adapter=adapter, restaurants=restaurants)
+
+
+def _reparse(snapshot: dict) -> Tuple[dict, Optional[Dict[str, List[str]]]]:
+    """Scrape one archived snapshot; the menu is None if the scraper failed."""
+    restaurant = _worker["restaurants"][snapshot["restaurant"]]
+    _worker["adapter"].as_of = snapshot["as_of"]
+    provider = getattr(restaurant, "provider", None)
+    if provider is not None:
+        # A cached feed may come from another snapshot
+        provider.clear()
+    try:
+        return snapshot, restaurant.scrape_menu()
+    except Exception as e:
+        logging.error(
+            f"Failed to re-parse {restaurant.name} at {snapshot['as_of']}: {e}"
+        )
+        return snapshot, None
+
+
+def reparse(
+    archive_dir: str, snapshots: List[dict], workers: int
+) -> Iterator[Tuple[dict, Optional[Dict[str, List[str]]]]]:
+    """Re-parse snapshots in a process pool, yielding results in order."""
+    if workers <= 1:
+        _init_worker(archive_dir)
+        yield from map(_reparse, snapshots)
+        return
+
+    chunksize = max(1, len(snapshots) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(archive_dir,)
+    ) as executor:
+        yield from executor.map(_reparse, snapshots, chunksize=chunksize)
+
+
+def group_weeks(
+    results: Iterable[Tuple[dict, Optional[Dict[str, List[str]]]]],
+) -> Iterator[Tuple[str, date, List[Tuple[Dict[str, List[str]], datetime]], int]]:
+    """Group ordered results into (restaurant, week, menus, failed) tuples."""
+    key = None
+    menus: List[Tuple[Dict[str, List[str]], datetime]] = []
+    failed = 0
+    for snapshot, menu in results:
+        if key != (snapshot["restaurant"], snapshot["week"]):
+            if key is not None:
+                yield (*key, menus, failed)
+            key = (snapshot["restaurant"], snapshot["week"])
+            menus, failed = [], 0
+        if menu:
+            menus.append((menu, datetime.fromisoformat(snapshot["fetched_at"])))
+        else:
+            failed += 1
+    if key is not None:
+        yield (*key, menus, failed)
+
+
+def menu_dishes(menus: List[Tuple[Dict[str, List[str]], datetime]]) -> Set[tuple]:
+    """The (menu_date, dish) pairs the history stores for scraped menus."""
+    dishes = set()
+    for menu, scraped_at in menus:
+        for day_name, items in menu.items():
+            menu_date = get_day_date(day_name, scraped_at)
+            if menu_date:
+                dishes.update((menu_date.isoformat(), dish) for dish in items)
+    return dishes
+
+
+def week_change(history: MenuHistory, restaurant: str, week: date, menus) -> dict:
+    """Compare the stored dishes of a restaurant's week with re-parsed menus."""
+    before = set(history.dishes_between(restaurant, week, week + timedelta(days=6)))
+    after = menu_dishes(menus)
+    return {
+        "restaurant": restaurant,
+        "week": week,
+        "before": len(before),
+        "after": len(after),
+        "added": len(after - before),
+        "removed": len(before - after),
+    }
+
+
+def backfill(
+    archive_dir: str,
+    history: MenuHistory,
+    restaurants,
+    workers: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+) -> Tuple[List[dict], dict]:
+    """Re-parse the archive into the history; return week changes and totals."""
+    snapshots = plan_snapshots(ResponseArchive(archive_dir), restaurants)
+    logging.info(f"Re-parsing {len(snapshots)} archived pages with {workers} workers")
+
+    changes = []
+    totals = {"pages": len(snapshots), "weeks": 0, "failed": 0, "stored": 0}
+    batch: List[Replacement] = []
+    for restaurant, week, menus, failed in group_weeks(
+        reparse(archive_dir, snapshots, workers)
+    ):
+        totals["failed"] += failed
+        if not menus:
+            # Keep what was stored if no snapshot of the week parses any more
+            continue
+        totals["weeks"] += 1
+        changes.append(week_change(history, restaurant, week, menus))
+        batch.append((restaurant, week, week + timedelta(days=6), menus))
+        if len(batch) >= batch_size and not dry_run:
+            totals["stored"] += history.replace_menus(batch)
+            batch = []
+    if batch and not dry_run:
+        totals["stored"] += history.replace_menus(batch)
+    return changes, totals
+
+
+def print_summary(changes: List[dict], totals: dict, elapsed: float) -> None:
+    """Print the changed weeks and the totals of a backfill."""
+    changed = [c for c in changes if c["added"] or c["removed"]]
+    if changed:
+        print(f"{'week':<10}  {'before':>6} {'after':>6} {'added':>6} {'removed':>7}")
+    for change in changed:
+        print(
+            f"{change['week'].isoformat():<10}  {change['before']:>6} "
+            f"{change['after']:>6} {change['added']:>6} {change['removed']:>7}  "
+            f"{change['restaurant']}"
+        )
+    print(
+        f"Re-parsed {totals['pages']} pages into {totals['weeks']} restaurant weeks "
+        f"in {elapsed:.1f} s: {len(changed)} changed, "
+        f"+{sum(c['added'] for c in changes)}/"
+        f"-{sum(c['removed'] for c in changes)} dishes, "
+        f"{totals['failed']} failed"
+    )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Re-parse archived pages into the menu history."
+    )
+    parser.add_argument(
+        "--archive",
+        default=os.getenv("MENU_ARCHIVE_DIR"),
+        help="Response archive directory (default: MENU_ARCHIVE_DIR)",
+    )
+    parser.add_argument("--db", help="Path to the history database")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report what would change"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    """Command line interface for backfilling the menu history."""
+    from scraper import get_restaurants
+
+    args = _build_parser().parse_args(argv)
+    if not args.archive:
+        logging.error("No archive given; use --archive or MENU_ARCHIVE_DIR")
+        return False
+
+    history = MenuHistory(args.db)
+    try:
+        start = time.perf_counter()
+        changes, totals = backfill(
+            args.archive,
+            history,
+            get_restaurants(),
+            workers=args.workers,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+        )
+        print_summary(changes, totals, time.perf_counter() - start)
+        return True
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    # Every re-parse logs at INFO level; only show problems
+    logging.basicConfig(
+        level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,107 @@
+"""
+Telegram channel configuration.
+
+By default menus are posted to the single TELEGRAM_CHANNEL_ID channel in the
+TELEGRAM_LOCALE locale (Finnish unless set). TELEGRAM_CHANNELS configures
+several channels at once as a comma-separated list of channel:locale pairs:
+
+    TELEGRAM_CHANNELS=@lounas_nokia:fi,@lunch_nokia:en
+
+TELEGRAM_CHANNELS_FILE points to a TOML file where each channel can also pick
+its restaurants (in the order they are shown) and dietary filters, given as
+flags like "vegan" or "gluten-free" or as diet codes like "G":
+
+    [[channels]]
+    id = "@lounas_tehdas"
+    locale = "fi"
+    restaurants = ["Nokian Kartano (FoodCo)", "Kahvila Epilä"]
+    diets = ["gluten-free"]
+
+Channels with the same locale, restaurants and diets share one view, which
+is rendered once per run.
+"""
+
+import os
+import tomllib
+from typing import List, Optional
+
+from restaurants.diets import parse_filters
+from restaurants.locales import DEFAULT_LOCALE, get_locale
+
+
+def make_channel(
+    channel_id: str,
+    locale: str = DEFAULT_LOCALE,
+    restaurants: Optional[List[str]] = None,
+    diets: Optional[List[str]] = None,
+) -> dict:
+    """Create a validated channel; options left unset are not stored."""
+    if not channel_id:
+        raise ValueError("Channel is missing its id")
+    get_locale(locale)  # Fail early on unknown locales
+    channel = {"channel_id": channel_id, "locale": locale}
+    if restaurants:
+        channel["restaurants"] = list(restaurants)
+    if diets:
+        channel["diets"] = sorted(parse_filters(diets))
+    return channel
+
+
+def parse_channels(value: str) -> List[dict]:
+    """Parse a channel:locale list; a channel without a locale gets the default."""
+    channels = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        channel_id, _, locale = entry.rpartition(":")
+        if not channel_id:
+            channel_id, locale = locale, DEFAULT_LOCALE
+        channels.append(make_channel(channel_id.strip(), locale.strip()))
+    return channels
+
+
+def load_channel_file(path: str) -> List[dict]:
+    """Load channels from a TOML file with a [[channels]] table per channel."""
+    with open(path, "rb") as channel_file:
+        config = tomllib.load(channel_file)
+    return [
+        make_channel(
+            entry.get("id", ""),
+            entry.get("locale", DEFAULT_LOCALE),
+            entry.get("restaurants"),
+            entry.get("diets"),
+        )
+        for entry in config.get("channels", [])
+    ]
+
+
+def load_channels() -> List[dict]:
+    """Get the channels to post to from the environment."""
+    channel_file = os.getenv("TELEGRAM_CHANNELS_FILE")
+    if channel_file:
+        return load_channel_file(channel_file)
+
+    configured = os.getenv("TELEGRAM_CHANNELS")
+    if configured:
+        return parse_channels(configured)
+
+    channel_id = os.getenv("TELEGRAM_CHANNEL_ID")
+    if not channel_id:
+        return []
+    return [make_channel(channel_id, os.getenv("TELEGRAM_LOCALE") or DEFAULT_LOCALE)]
+
+
+def channel_locales(channels: List[dict]) -> List[str]:
+    """Get the distinct locales of the channels, in configuration order."""
+    return list(dict.fromkeys(channel["locale"] for channel in channels))
+
+
+def view_key(channel: dict) -> tuple:
+    """Identify what a channel shows, so channels with equal views share it."""
+    restaurants = channel.get("restaurants")
+    return (
+        channel["locale"],
+        tuple(restaurants) if restaurants else None,
+        tuple(channel.get("diets", ())),
+    )
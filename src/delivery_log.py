@@ -0,0 +1,115 @@
+"""
+Persisted log of the menu messages delivered to each Telegram channel.
+
+For every channel and day the log keeps the digest and Telegram message id
+of each posted message part. A later run for the same day posts nothing to a
+channel whose parts are unchanged, and otherwise edits only the messages
+whose part changed, so reruns cost no API calls or notifications unless the
+menu actually changed.
+
+The log also keeps the fragments and message parts rendered by earlier runs
+under digests of their inputs, so a run only renders what changed.
+"""
+
+import sqlite3
+import hashlib
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+DEFAULT_DB_PATH = "delivery_log.db"
+
+# Days of deliveries kept; older days can no longer be rerun
+KEEP_DAYS = 14
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS delivered_parts (
+    channel TEXT NOT NULL,
+    day TEXT NOT NULL,
+    part INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    message_id INTEGER,
+    PRIMARY KEY (channel, day, part)
+);
+CREATE TABLE IF NOT EXISTS renders (
+    key TEXT PRIMARY KEY,
+    render TEXT NOT NULL,
+    day TEXT NOT NULL
+);
+"""
+
+# (digest, Telegram message id) of a delivered message part
+DeliveredPart = Tuple[str, Optional[int]]
+
+
+def part_digest(part: str) -> str:
+    """Hash a rendered message part."""
+    return hashlib.sha256(part.encode("utf-8")).hexdigest()
+
+
+def unchanged(parts: List[str], delivered: List[DeliveredPart]) -> bool:
+    """Check whether message parts are exactly the ones already delivered."""
+    return len(parts) == len(delivered) and all(
+        part_digest(part) == digest for part, (digest, _) in zip(parts, delivered)
+    )
+
+
+class DeliveryLog:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or DEFAULT_DB_PATH
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def delivered(self, channel: str, day: date) -> List[DeliveredPart]:
+        """Get the parts delivered to a channel for a day, in order."""
+        rows = self.conn.execute(
+            "SELECT digest, message_id FROM delivered_parts "
+            "WHERE channel = ? AND day = ? ORDER BY part",
+            (str(channel), day.isoformat()),
+        )
+        return [(digest, message_id) for digest, message_id in rows]
+
+    def record(self, channel: str, day: date, parts: List[DeliveredPart]) -> None:
+        """Replace the parts delivered to a channel for a day."""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM delivered_parts WHERE channel = ? AND day = ?",
+                (str(channel), day.isoformat()),
+            )
+            self.conn.executemany(
+                "INSERT INTO delivered_parts VALUES (?, ?, ?, ?, ?)",
+                [
+                    (str(channel), day.isoformat(), i, digest, message_id)
+                    for i, (digest, message_id) in enumerate(parts)
+                ],
+            )
+
+    def render(self, key: str) -> Optional[str]:
+        """Get a render stored by an earlier run, None if there is none."""
+        row = self.conn.execute(
+            "SELECT render FROM renders WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def store_render(self, key: str, render: str, day: date) -> None:
+        """Store a render under the digest of its inputs."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO renders VALUES (?, ?, ?)",
+                (key, render, day.isoformat()),
+            )
+
+    def prune(self, today: date, keep_days: int = KEEP_DAYS) -> int:
+        """Forget deliveries and renders older than keep_days.
+
+        Returns the number of delivered parts removed.
+        """
+        cutoff = (today - timedelta(days=keep_days)).isoformat()
+        with self.conn:
+            self.conn.execute("DELETE FROM renders WHERE day < ?", (cutoff,))
+            cursor = self.conn.execute(
+                "DELETE FROM delivered_parts WHERE day < ?", (cutoff,)
+            )
+        return cursor.rowcount
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+SQLite menu history with full-text dish search.
+
+Every scraped dish is appended to a local SQLite database so that past menus
+can be queried later, e.g. "when did Kahvila Epilä last serve lohikeitto".
+"""
+
+import os
+import sys
+import sqlite3
+import logging
+import argparse
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from restaurants.base import get_day_date
+
+DEFAULT_DB_PATH = "menu_history.db"
+
+INSERT_SQL = (
+    "INSERT OR IGNORE INTO menu_items "
+    "(restaurant, menu_date, day_name, position, dish, scraped_at) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# (restaurant, first date, last date, [(week menu, scraped at), ...])
+Replacement = Tuple[str, date, date, List[Tuple[Dict[str, List[str]], datetime]]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS menu_items (
+    id INTEGER PRIMARY KEY,
+    restaurant TEXT NOT NULL,
+    menu_date TEXT NOT NULL,
+    day_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    dish TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    UNIQUE (restaurant, menu_date, dish)
+);
+CREATE INDEX IF NOT EXISTS idx_menu_items_restaurant
+    ON menu_items (restaurant, menu_date);
+CREATE INDEX IF NOT EXISTS idx_menu_items_date
+    ON menu_items (menu_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS menu_items_fts USING fts5 (
+    dish, content='menu_items', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS menu_items_fts_insert
+AFTER INSERT ON menu_items BEGIN
+    INSERT INTO menu_items_fts (rowid, dish) VALUES (new.id, new.dish);
+END;
+CREATE TRIGGER IF NOT EXISTS menu_items_fts_delete
+AFTER DELETE ON menu_items BEGIN
+    INSERT INTO menu_items_fts (menu_items_fts, rowid, dish)
+    VALUES ('delete', old.id, old.dish);
+END;
+"""
+
+
+class MenuHistory:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("MENU_HISTORY_DB", DEFAULT_DB_PATH)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def _build_rows(
+        self, week_menus: Dict[str, Dict[str, List[str]]], now: datetime
+    ) -> List[Tuple]:
+        """Flatten week menus into rows for the menu_items table."""
+        scraped_at = now.isoformat(timespec="seconds")
+        rows = []
+        for restaurant, menu in week_menus.items():
+            for day_name, items in (menu or {}).items():
+                menu_date = get_day_date(day_name, now)
+                if not menu_date:
+                    continue
+                for position, dish in enumerate(items):
+                    rows.append(
+                        (
+                            restaurant,
+                            menu_date.isoformat(),
+                            day_name,
+                            position,
+                            dish,
+                            scraped_at,
+                        )
+                    )
+        return rows
+
+    def record_week_menus(
+        self,
+        week_menus: Dict[str, Dict[str, List[str]]],
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Append scraped week menus in a single transaction.
+
+        Dishes already stored for the same restaurant and date are skipped, so
+        rerunning the scraper does not duplicate history. Returns the number of
+        newly stored dishes.
+        """
+        rows = self._build_rows(week_menus, now or datetime.now())
+        with self.conn:
+            cursor = self.conn.executemany(INSERT_SQL, rows)
+            return cursor.rowcount
+
+    def replace_menus(self, replacements: Iterable[Replacement]) -> int:
+        """Replace the stored dishes of restaurants in date ranges.
+
+        Each range is cleared and refilled from its menus, in the order they
+        were scraped, all in a single transaction. Returns the number of
+        stored dishes.
+        """
+        stored = 0
+        with self.conn:
+            for restaurant, since, until, menus in replacements:
+                self.conn.execute(
+                    "DELETE FROM menu_items WHERE restaurant = ? "
+                    "AND menu_date BETWEEN ? AND ?",
+                    (restaurant, since.isoformat(), until.isoformat()),
+                )
+                for menu, scraped_at in menus:
+                    rows = self._build_rows({restaurant: menu}, scraped_at)
+                    stored += self.conn.executemany(INSERT_SQL, rows).rowcount
+        return stored
+
+    def dishes_between(
+        self, restaurant: str, since: date, until: date
+    ) -> List[Tuple[str, str]]:
+        """Get a restaurant's stored (menu_date, dish) pairs in a date range."""
+        return self.conn.execute(
+            "SELECT menu_date, dish FROM menu_items WHERE restaurant = ? "
+            "AND menu_date BETWEEN ? AND ? ORDER BY menu_date, position",
+            (restaurant, since.isoformat(), until.isoformat()),
+        ).fetchall()
+
+    def search(
+        self,
+        query: str,
+        restaurant: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        limit: int = 100,
+    ) -> List[Tuple[str, str, str, str]]:
+        """Full-text search dishes, newest first.
+
+        The query uses SQLite FTS5 syntax, e.g. "lohikeitto", "lohi*" or
+        "veg OR vegaaninen". Returns (menu_date, day_name, restaurant, dish).
+        """
+        sql = (
+            "SELECT m.menu_date, m.day_name, m.restaurant, m.dish "
+            "FROM menu_items_fts f JOIN menu_items m ON m.id = f.rowid "
+            "WHERE menu_items_fts MATCH ?"
+        )
+        params: list = [query]
+        if restaurant:
+            sql += " AND m.restaurant = ?"
+            params.append(restaurant)
+        if since:
+            sql += " AND m.menu_date >= ?"
+            params.append(since.isoformat())
+        if until:
+            sql += " AND m.menu_date <= ?"
+            params.append(until.isoformat())
+        sql += " ORDER BY m.menu_date DESC, m.restaurant, m.position LIMIT ?"
+        params.append(limit)
+        return self.conn.execute(sql, params).fetchall()
+
+    def last_served(
+        self, query: str, restaurant: Optional[str] = None
+    ) -> Optional[Tuple[str, str, str, str]]:
+        """Get the most recent dish matching the full-text query."""
+        results = self.search(query, restaurant=restaurant, limit=1)
+        return results[0] if results else None
+
+    def menu_for_date(self, menu_date: date) -> Dict[str, List[str]]:
+        """Get all stored dishes for a date, grouped by restaurant."""
+        menu: Dict[str, List[str]] = {}
+        rows = self.conn.execute(
+            "SELECT restaurant, dish FROM menu_items WHERE menu_date = ? "
+            "ORDER BY restaurant, position",
+            (menu_date.isoformat(),),
+        )
+        for restaurant, dish in rows:
+            menu.setdefault(restaurant, []).append(dish)
+        return menu
+
+
+def _parse_date(value: str) -> date:
+    """Parse an ISO date (YYYY-MM-DD) command line argument."""
+    return date.fromisoformat(value)
+
+
+def _month_range(value: str) -> Tuple[date, date]:
+    """Get the first and last date of a YYYY-MM month."""
+    first = date.fromisoformat(f"{value}-01")
+    next_month = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first, next_month - timedelta(days=1)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(description="Query the lunch menu history.")
+    parser.add_argument("--db", help="Path to the history database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    last = commands.add_parser("last", help="When was a dish last served")
+    last.add_argument("query", help="FTS5 query, e.g. lohikeitto")
+    last.add_argument("--restaurant", help="Limit to one restaurant")
+
+    search = commands.add_parser("search", help="Search dishes by text")
+    search.add_argument("query", help="FTS5 query, e.g. 'veg OR vegaaninen'")
+    search.add_argument("--restaurant", help="Limit to one restaurant")
+    search.add_argument("--since", type=_parse_date, help="First date (YYYY-MM-DD)")
+    search.add_argument("--until", type=_parse_date, help="Last date (YYYY-MM-DD)")
+    search.add_argument(
+        "--month", help="Limit to a month (YYYY-MM), e.g. this month's dishes"
+    )
+    search.add_argument("--limit", type=int, default=100)
+    return parser
+
+
+def _format_row(row: Tuple[str, str, str, str]) -> str:
+    """Format a search result row for terminal output."""
+    menu_date, day_name, restaurant, dish = row
+    return f"{menu_date} {day_name:<11} {restaurant}: {dish}"
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    """Command line interface for querying the menu history."""
+    args = _build_parser().parse_args(argv)
+    history = MenuHistory(args.db)
+
+    try:
+        if args.command == "last":
+            row = history.last_served(args.query, restaurant=args.restaurant)
+            if not row:
+                print(f"No dishes matching '{args.query}' found")
+                return False
+            print(_format_row(row))
+            return True
+
+        since, until = args.since, args.until
+        if args.month:
+            since, until = _month_range(args.month)
+        rows = history.search(
+            args.query,
+            restaurant=args.restaurant,
+            since=since,
+            until=until,
+            limit=args.limit,
+        )
+        for row in rows:
+            print(_format_row(row))
+        return bool(rows)
+
+    except sqlite3.OperationalError as e:
+        logging.error(f"Invalid history query '{args.query}': {e}")
+        return False
+
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Read-only HTTP API serving the latest parsed menus as JSON and HTML.
+
+Every response body is precomputed whenever the menu cache refreshes and
+served with a strong ETag, so pollers that send If-None-Match get a 304
+without a body and no request ever triggers a scrape. Bodies hold only menu
+content, so their ETags change only when a menu does.
+
+    /                                  today's menus (HTML)
+    /week.json, /week.html             the whole week of every restaurant
+    /day/<day>.json|html               one day of every restaurant
+    /restaurant/<slug>.json|html       one restaurant's week
+    /restaurant/<slug>/<day>.json|html one restaurant on one day
+
+Days are lowercase Finnish day names (e.g. "maanantai") or "today" and
+"tomorrow" (not found on Fridays); slugs are listed in /week.json.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import logging
+import argparse
+import unicodedata
+from datetime import datetime
+from html import escape as html_escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from menu_cache import DEFAULT_REFRESH_SECONDS, MenuCache, MenuSnapshot, create_cache
+from restaurants.base import DAY_NAMES, get_day_date, get_target_date, get_target_day
+from restaurants.diets import item_flags
+from restaurants.locales import DEFAULT_LOCALE, localize_day
+
+# (body, content type, strong ETag)
+Body = Tuple[bytes, str, str]
+
+JSON_TYPE = "application/json; charset=utf-8"
+HTML_TYPE = "text/html; charset=utf-8"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="{lang}">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+</head>
+<body>
+<h1>{title}</h1>
+{content}
+</body>
+</html>
+"""
+
+
+def slugify(name: str) -> str:
+    """Make a URL path segment of a restaurant name."""
+    ascii_name = (
+        unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    )
+    return re.sub(r"[^a-z0-9]+", "-", ascii_name.lower()).strip("-")
+
+
+def make_body(content: bytes, content_type: str) -> Body:
+    """Wrap a response body with its strong ETag."""
+    return content, content_type, f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def _json_body(data) -> Body:
+    return make_body(
+        json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"), JSON_TYPE
+    )
+
+
+def _items(menu, day: str) -> List[dict]:
+    return [
+        {"name": item, "diets": sorted(item_flags(item))}
+        for item in (menu or {}).get(day, [])
+    ]
+
+
+def _restaurant_day(name: str, menu, day: str) -> dict:
+    day_date = get_day_date(day)
+    return {
+        "name": name,
+        "slug": slugify(name),
+        "day": day,
+        "date": day_date.isoformat() if day_date else None,
+        "available": menu is not None,
+        "items": _items(menu, day),
+    }
+
+
+def _html_items(items: List[dict]) -> str:
+    if not items:
+        return "<p>No menu available</p>"
+    rows = "".join(f"<li>{html_escape(item['name'])}</li>" for item in items)
+    return f"<ul>{rows}</ul>"
+
+
+def html_page(title: str, sections: List[Tuple[str, List[dict]]], locale: str) -> Body:
+    """Render an HTML page of headed item lists."""
+    content = "\n".join(
+        f"<h2>{html_escape(heading)}</h2>\n{_html_items(items)}"
+        for heading, items in sections
+    )
+    page = PAGE_TEMPLATE.format(lang=locale, title=html_escape(title), content=content)
+    return make_body(page.encode("utf-8"), HTML_TYPE)
+
+
+def build_routes(week_menus, locale: str = DEFAULT_LOCALE) -> Dict[str, Body]:
+    """Render every JSON and HTML view of the week menus, keyed by path."""
+    routes: Dict[str, Body] = {}
+    week = []
+    for name, menu in week_menus.items():
+        slug = slugify(name)
+        days = [_restaurant_day(name, menu, day) for day in DAY_NAMES]
+        for day, data in zip(DAY_NAMES, days):
+            path = f"/restaurant/{slug}/{day.lower()}"
+            routes[f"{path}.json"] = _json_body(data)
+            routes[f"{path}.html"] = html_page(
+                f"{name} – {localize_day(day, locale)}",
+                [(name, data["items"])],
+                locale,
+            )
+        restaurant = {"name": name, "slug": slug, "available": menu is not None}
+        restaurant["days"] = {data["day"]: data for data in days}
+        week.append(restaurant)
+        routes[f"/restaurant/{slug}.json"] = _json_body(restaurant)
+        routes[f"/restaurant/{slug}.html"] = html_page(
+            name,
+            [(localize_day(d["day"], locale), d["items"]) for d in days],
+            locale,
+        )
+
+    for day in DAY_NAMES:
+        restaurants = [r["days"][day] for r in week]
+        day_date = get_day_date(day)
+        routes[f"/day/{day.lower()}.json"] = _json_body(
+            {
+                "day": day,
+                "date": day_date.isoformat() if day_date else None,
+                "restaurants": restaurants,
+            }
+        )
+        routes[f"/day/{day.lower()}.html"] = html_page(
+            localize_day(day, locale),
+            [(r["name"], r["items"]) for r in restaurants],
+            locale,
+        )
+
+    routes["/week.json"] = _json_body({"restaurants": week})
+    routes["/week.html"] = html_page(
+        "Week",
+        [
+            (f"{r['name']} – {localize_day(day, locale)}", r["days"][day]["items"])
+            for r in week
+            for day in DAY_NAMES
+        ],
+        locale,
+    )
+    return routes
+
+
+class MenuApi:
+    def __init__(self, cache: MenuCache):
+        self.cache = cache
+        self.locale = cache.locale
+        self.routes: Dict[str, Body] = {}
+        cache.on_refresh.append(self.build)
+        self.build(cache.snapshot)
+
+    def build(self, snapshot: MenuSnapshot) -> None:
+        """Precompute every response body of a snapshot and swap them in."""
+        self.routes = build_routes(snapshot.menus, self.locale)
+        logging.info(f"Precomputed {len(self.routes)} API responses")
+
+    def resolve(self, path: str, now: Optional[datetime] = None) -> Optional[Body]:
+        """Find the precomputed body of a request path."""
+        path = path.split("?", 1)[0].rstrip("/") or "/today.html"
+        if path == "/today.html":
+            path = "/day/today.html"
+        aliases = {"today": get_target_day(now)}
+        tomorrow = get_target_date(now).weekday() + 1
+        if tomorrow < len(DAY_NAMES):
+            # The week's menus end on Friday; next week's are not known yet
+            aliases["tomorrow"] = DAY_NAMES[tomorrow]
+        segments = path.split("/")
+        last, dot, extension = segments[-1].partition(".")
+        if last in aliases:
+            segments[-1] = f"{aliases[last].lower()}{dot}{extension}"
+        return self.routes.get("/".join(segments))
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class MenuRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "LunchMenuAPI/1.0"
+
+    def _send(self, status: int, body: Body, head: bool = False) -> None:
+        content, content_type, etag = body
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        if status == 304:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(content)
+
+    def _serve(self, head: bool) -> None:
+        body = self.server.api.resolve(self.path)
+        if body is None:
+            self._send(404, _json_body({"error": "not found"}), head)
+        elif etag_matches(self.headers.get("If-None-Match"), body[2]):
+            self._send(304, body)
+        else:
+            self._send(200, body, head)
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} {format % args}")
+
+
+def create_server(api: MenuApi, host: str = "127.0.0.1", port: int = 8080):
+    """Create an HTTP server for the API; call serve_forever to run it."""
+    server = ThreadingHTTPServer((host, port), MenuRequestHandler)
+    server.daemon_threads = True
+    server.api = api
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    """Serve the menu API until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve cached lunch menus")
+    parser.add_argument("--host", default=os.getenv("MENU_API_HOST", "127.0.0.1"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("MENU_API_PORT", "8080"))
+    )
+    parser.add_argument("--locale", default=DEFAULT_LOCALE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+    refresh_seconds = float(
+        os.getenv("MENU_REFRESH_SECONDS") or DEFAULT_REFRESH_SECONDS
+    )
+    cache = create_cache(args.locale, refresh_seconds)
+    api = MenuApi(cache)
+    cache.start()
+    server = create_server(api, args.host, args.port)
+    logging.info(f"Serving menus on http://{args.host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Menu API stopped")
+    finally:
+        server.server_close()
+        cache.stop()
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Interactive Telegram bot answering menu queries.
+
+Long-polls the Bot API for messages and answers commands from a warm
+in-memory MenuCache that is refreshed in the background:
+
+    /menu                      today's menus of all restaurants
+    /menu kartano              today's menu of one restaurant
+    /menu huomenna             all menus of a day (name, today or tomorrow)
+    /menu kartano perjantai    one restaurant on one day
+    /search lohikeitto         where a dish is served this week
+    /subscribe vegan           daily menu with only vegan dishes
+    /unsubscribe               stop the daily menu
+
+Subscribed chats also see their filters applied to /menu answers.
+"""
+
+import os
+import sys
+import asyncio
+import logging
+from datetime import datetime
+from html import escape as html_escape
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+
+from telegram import Bot, error
+
+from menu_cache import DEFAULT_REFRESH_SECONDS, NO_FILTERS, MenuCache, create_cache
+from restaurants.diets import FLAGS
+from restaurants.base import DAY_NAMES, get_target_date, get_target_day
+from restaurants.locales import DEFAULT_LOCALE, LOCALES, localize_day
+from subscriptions import SubscriptionStore
+from telegram_bot import MAX_RETRY_AFTER, TelegramBot, create_client, retry_delay
+
+TODAY_WORDS = {"today", "tänään"}
+TOMORROW_WORDS = {"tomorrow", "huomenna"}
+
+HELP_TEXT = (
+    "🍽️ <b>Lounasbotti</b>\n"
+    "/menu – today's menus\n"
+    "/menu &lt;restaurant&gt; – one restaurant, e.g. /menu kartano\n"
+    "/menu &lt;day&gt; – e.g. /menu huomenna or /menu perjantai\n"
+    "/menu &lt;restaurant&gt; &lt;day&gt; – e.g. /menu kartano tomorrow\n"
+    "/search &lt;dish&gt; – e.g. /search lohikeitto\n"
+    "/subscribe [filters] – daily menu, e.g. /subscribe vegan gluten-free\n"
+    "/unsubscribe – stop the daily menu\n"
+    f"Filters: {', '.join(FLAGS)}"
+)
+
+
+def _day_words() -> Dict[str, str]:
+    """Map every locale's day names to the Finnish day keys."""
+    words = {}
+    for strings in LOCALES.values():
+        for day_key, name in zip(DAY_NAMES, strings["day_names"]):
+            words[name.lower()] = day_key
+    return words
+
+
+DAY_WORDS = _day_words()
+
+
+def parse_day(word: str, now: Optional[datetime] = None) -> Optional[str]:
+    """Parse a day word (name, unambiguous prefix, today or tomorrow).
+
+    Tomorrow is None on Fridays: the week's menus end and next week's are
+    not known yet.
+    """
+    word = word.strip().lower()
+    if word in TODAY_WORDS:
+        return get_target_day(now)
+    if word in TOMORROW_WORDS:
+        tomorrow = get_target_date(now).weekday() + 1
+        return DAY_NAMES[tomorrow] if tomorrow < len(DAY_NAMES) else None
+    if word in DAY_WORDS:
+        return DAY_WORDS[word]
+    if len(word) >= 2:
+        days = {day for name, day in DAY_WORDS.items() if name.startswith(word)}
+        if len(days) == 1:
+            return days.pop()
+    return None
+
+
+class MenuCommands:
+    def __init__(
+        self,
+        cache: MenuCache,
+        locale: str = DEFAULT_LOCALE,
+        subscriptions: Optional[SubscriptionStore] = None,
+    ):
+        self.cache = cache
+        self.locale = locale
+        self.subscriptions = subscriptions
+        # Filters of subscribed chats, kept in memory for fast lookups
+        self._filters: Dict[str, FrozenSet[str]] = {}
+        if subscriptions:
+            for subscription in subscriptions.all():
+                self._filters[subscription["chat_id"]] = subscription["filters"]
+
+    def filter_sets(self) -> Set[FrozenSet[str]]:
+        """Get the distinct filter sets of subscribed chats."""
+        return set(self._filters.values())
+
+    def filters_of(self, chat_id) -> FrozenSet[str]:
+        """Get the diet filters of a chat, empty if not subscribed."""
+        return self._filters.get(str(chat_id), NO_FILTERS)
+
+    def _split_command(self, text: str) -> Tuple[str, str]:
+        """Split "/menu@SomeBot args" into ("menu", "args")."""
+        command, _, args = text.strip().partition(" ")
+        return command[1:].split("@", 1)[0].lower(), args.strip()
+
+    def menu(self, args: str, now: Optional[datetime] = None, chat_id=None) -> str:
+        """Answer /menu [restaurant] [day]."""
+        snapshot = self.cache.snapshot
+        words = args.split()
+        day = parse_day(words[-1], now) if words else None
+        if day:
+            words = words[:-1]
+        elif words and words[-1].lower() in TOMORROW_WORDS:
+            return "❌ No menus for tomorrow yet"
+        day = day or get_target_day(now)
+
+        restaurant = None
+        if words:
+            query = " ".join(words)
+            restaurant = snapshot.find_restaurant(query)
+            if not restaurant:
+                names = ", ".join(snapshot.restaurants)
+                return (
+                    f"❌ Unknown restaurant '{html_escape(query)}'. "
+                    f"Restaurants: {html_escape(names)}"
+                )
+        flags = self.filters_of(chat_id)
+        return snapshot.answer(restaurant, day, flags) or "❌ No menus available yet"
+
+    def search(self, args: str) -> str:
+        """Answer /search <dish>."""
+        if not args:
+            return "Usage: /search &lt;dish&gt;"
+        matches = self.cache.snapshot.search(args)
+        if not matches:
+            return f"No dishes matching '{html_escape(args)}' this week"
+        lines = [f"🔎 <b>{html_escape(args)}</b>"]
+        for restaurant, day, dish in matches:
+            day_label = localize_day(day, self.locale)
+            lines.append(
+                f"• {day_label} – {html_escape(restaurant)}: {html_escape(dish)}"
+            )
+        return "\n".join(lines)
+
+    def subscribe(self, args: str, chat_id) -> str:
+        """Answer /subscribe [filters]."""
+        if not self.subscriptions or chat_id is None:
+            return "❌ Subscriptions are not enabled"
+        try:
+            flags = self.subscriptions.subscribe(chat_id, args.split(), self.locale)
+        except ValueError as e:
+            return f"❌ {html_escape(str(e))}"
+        self._filters[str(chat_id)] = flags
+        # Render the new filter set now rather than on the first /menu
+        self.cache.snapshot.answers_for(flags)
+        described = ", ".join(sorted(flags)) or "all dishes"
+        return f"✅ Subscribed to the daily menu: {described}"
+
+    def unsubscribe(self, chat_id) -> str:
+        """Answer /unsubscribe."""
+        if not self.subscriptions or chat_id is None:
+            return "❌ Subscriptions are not enabled"
+        self._filters.pop(str(chat_id), None)
+        if self.subscriptions.unsubscribe(chat_id):
+            return "✅ Unsubscribed from the daily menu"
+        return "You are not subscribed"
+
+    def handle(
+        self, text: str, now: Optional[datetime] = None, chat_id=None
+    ) -> Optional[str]:
+        """Get the reply to a message, or None if it is not a command."""
+        if not text or not text.startswith("/"):
+            return None
+        command, args = self._split_command(text)
+        handlers = {
+            "menu": lambda: self.menu(args, now, chat_id),
+            "search": lambda: self.search(args),
+            "subscribe": lambda: self.subscribe(args, chat_id),
+            "unsubscribe": lambda: self.unsubscribe(chat_id),
+            "start": lambda: HELP_TEXT,
+            "help": lambda: HELP_TEXT,
+        }
+        handler = handlers.get(command)
+        return handler() if handler else None
+
+
+class InteractiveBot:
+    def __init__(self, bot: Bot, commands: MenuCommands, poll_timeout: int = 30):
+        self.bot = bot
+        self.commands = commands
+        self.poll_timeout = poll_timeout
+        self.offset: Optional[int] = None
+
+    async def handle_update(self, update) -> None:
+        """Answer one incoming message, in parts if it is too long."""
+        message = update.effective_message
+        if not message or not message.text:
+            return
+        reply = self.commands.handle(message.text, chat_id=message.chat_id)
+        if reply is None:
+            return
+        try:
+            for part in TelegramBot.split_message(reply):
+                await self.bot.send_message(
+                    chat_id=message.chat_id, text=part, parse_mode="HTML"
+                )
+        except error.TelegramError as e:
+            logging.error(f"Failed to answer {message.chat_id}: {e}")
+
+    async def poll_once(self) -> int:
+        """Fetch and answer one batch of updates; returns how many there were."""
+        try:
+            updates = await self.bot.get_updates(
+                offset=self.offset,
+                timeout=self.poll_timeout,
+                allowed_updates=["message"],
+            )
+        except error.RetryAfter as e:
+            await asyncio.sleep(min(retry_delay(e), MAX_RETRY_AFTER))
+            return 0
+        except error.TimedOut:
+            return 0
+        except error.NetworkError as e:
+            logging.warning(f"Polling failed, retrying: {e}")
+            await asyncio.sleep(5)
+            return 0
+
+        for update in updates:
+            self.offset = update.update_id + 1
+            await self.handle_update(update)
+        return len(updates)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Long-poll for messages until stopped."""
+        await self.bot.initialize()
+        logging.info("Interactive bot is polling for messages")
+        while not (stop and stop.is_set()):
+            await self.poll_once()
+
+
+def main() -> bool:
+    """Run the interactive bot until interrupted."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+    token = os.getenv("TELEGRAM_BOT_TOKEN")
+    if not token:
+        logging.error("TELEGRAM_BOT_TOKEN environment variable is required")
+        return False
+
+    locale = os.getenv("TELEGRAM_LOCALE") or DEFAULT_LOCALE
+    refresh_seconds = float(
+        os.getenv("MENU_REFRESH_SECONDS") or DEFAULT_REFRESH_SECONDS
+    )
+    subscriptions_path = os.getenv("SUBSCRIPTIONS_DB")
+    subscriptions = (
+        SubscriptionStore(subscriptions_path) if subscriptions_path else None
+    )
+    cache = create_cache(locale, refresh_seconds)
+    commands = MenuCommands(cache, locale, subscriptions)
+    cache.filter_sets = commands.filter_sets
+    cache.start()
+    try:
+        bot = InteractiveBot(create_client(token), commands)
+        asyncio.run(bot.run())
+    except KeyboardInterrupt:
+        logging.info("Interactive bot stopped")
+    finally:
+        cache.stop()
+        if subscriptions:
+            subscriptions.close()
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
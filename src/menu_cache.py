@@ -0,0 +1,207 @@
+"""
+In-memory cache of parsed week menus for answering queries.
+
+The cache holds an immutable snapshot of the latest week menus together with
+every answer it can give (each restaurant and day, and all restaurants per
+day) rendered up front, so a lookup is a dictionary access. Answers for a diet
+filter set are rendered once per snapshot and shared by everyone using that
+filter set. A background thread refreshes the snapshot; queries never trigger
+a scrape.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from html import escape as html_escape
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from restaurants.base import DAY_NAMES
+from restaurants.diets import filter_menu
+from restaurants.instrumentation import reset_instrumentation
+from restaurants.locales import DEFAULT_LOCALE, localize_day
+
+WeekMenus = Dict[str, Optional[Dict[str, List[str]]]]
+
+DEFAULT_REFRESH_SECONDS = 30 * 60
+
+
+NO_FILTERS: FrozenSet[str] = frozenset()
+
+
+class MenuSnapshot:
+    def __init__(
+        self,
+        week_menus: WeekMenus,
+        locale: str = DEFAULT_LOCALE,
+        filter_sets: Iterable[FrozenSet[str]] = (),
+    ):
+        self.menus = week_menus
+        self.locale = locale
+        self.updated_at = datetime.now()
+        self.restaurants = list(week_menus)
+        self._names = [(name.lower(), name) for name in self.restaurants]
+        self._answers = {NO_FILTERS: self._render_answers(NO_FILTERS)}
+        for flags in filter_sets:
+            self.answers_for(frozenset(flags))
+        # (lowercase dish, restaurant, day, dish) for substring search
+        self.dishes = [
+            (dish.lower(), name, day, dish)
+            for name, menu in week_menus.items()
+            for day, items in (menu or {}).items()
+            for dish in items
+        ]
+
+    def _render_restaurant_day(self, menu, name: str, day: str) -> str:
+        """Render one restaurant's menu for one day."""
+        items = (menu or {}).get(day)
+        day_label = localize_day(day, self.locale)
+        if not items:
+            return f"❌ {html_escape(name)}: No menu available for {day_label}"
+        lines = [f"🍽️ <b>{html_escape(name)}</b>"]
+        lines += [f"• {html_escape(item)}" for item in items]
+        return "\n".join(lines)
+
+    def _render_answers(
+        self, flags: FrozenSet[str]
+    ) -> Dict[Tuple[Optional[str], str], str]:
+        """Render the answer of every (restaurant or None for all, day)."""
+        menus = {name: filter_menu(menu, flags) for name, menu in self.menus.items()}
+        answers = {}
+        for day in DAY_NAMES:
+            header = f"📅 <b>{localize_day(day, self.locale)}</b>"
+            if flags:
+                header += f" ({', '.join(sorted(flags))})"
+            blocks = []
+            for name in self.restaurants:
+                block = self._render_restaurant_day(menus[name], name, day)
+                answers[(name, day)] = f"{header}\n\n{block}"
+                blocks.append(block)
+            answers[(None, day)] = "\n\n".join([header, *blocks])
+        return answers
+
+    def find_restaurant(self, query: str) -> Optional[str]:
+        """Find a restaurant by case-insensitive name or part of it."""
+        query = query.strip().lower()
+        if not query:
+            return None
+        for lower, name in self._names:
+            if lower == query:
+                return name
+        for lower, name in self._names:
+            if query in lower:
+                return name
+        return None
+
+    def answers_for(
+        self, flags: FrozenSet[str]
+    ) -> Dict[Tuple[Optional[str], str], str]:
+        """Get the answers for a diet filter set, rendering them only once."""
+        if flags not in self._answers:
+            self._answers[flags] = self._render_answers(flags)
+        return self._answers[flags]
+
+    def answer(
+        self,
+        restaurant: Optional[str],
+        day: str,
+        flags: FrozenSet[str] = NO_FILTERS,
+    ) -> Optional[str]:
+        """Get the rendered menu of a restaurant (or all) for a day."""
+        return self.answers_for(flags).get((restaurant, day))
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, str, str]]:
+        """Find (restaurant, day, dish) of dishes containing the query."""
+        query = query.strip().lower()
+        if not query:
+            return []
+        matches = [
+            (name, day, dish)
+            for lower, name, day, dish in self.dishes
+            if query in lower
+        ]
+        return matches[:limit]
+
+
+class MenuCache:
+    def __init__(
+        self,
+        loader: Callable[[], WeekMenus],
+        refresh_seconds: float = DEFAULT_REFRESH_SECONDS,
+        locale: str = DEFAULT_LOCALE,
+    ):
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.locale = locale
+        # Filter sets in use, whose answers are rendered on every refresh
+        self.filter_sets: Callable[[], Iterable[FrozenSet[str]]] = lambda: ()
+        # Called with each new snapshot, e.g. to precompute derived views
+        self.on_refresh: List[Callable[[MenuSnapshot], None]] = []
+        self.snapshot = MenuSnapshot({}, locale)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> bool:
+        """Scrape new week menus and swap them in."""
+        try:
+            week_menus = self.loader()
+        except Exception as e:
+            logging.error(f"Failed to refresh menu cache: {e}")
+            return False
+
+        # Restaurants that failed this time keep their last good menu
+        previous = self.snapshot.menus
+        merged = {
+            name: menu if menu is not None else previous.get(name)
+            for name, menu in week_menus.items()
+        }
+        start = time.perf_counter()
+        # Replacing the attribute is atomic, readers see the old or new snapshot
+        self.snapshot = MenuSnapshot(merged, self.locale, self.filter_sets())
+        for callback in self.on_refresh:
+            try:
+                callback(self.snapshot)
+            except Exception as e:
+                logging.error(f"Menu cache refresh callback failed: {e}")
+        logging.info(
+            f"Menu cache refreshed with {len(merged)} restaurants "
+            f"({(time.perf_counter() - start) * 1000:.1f} ms to render)"
+        )
+        return True
+
+    def _run(self) -> None:
+        """Refresh the cache periodically until stopped."""
+        while not self._stop.wait(self.refresh_seconds):
+            self.refresh()
+
+    def start(self) -> None:
+        """Load the cache now and keep refreshing it in the background."""
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="menu-cache-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+def create_cache(
+    locale: str = DEFAULT_LOCALE, refresh_seconds: float = DEFAULT_REFRESH_SECONDS
+) -> MenuCache:
+    """Create a menu cache that scrapes all restaurants when refreshed."""
+    from scraper import get_localized_restaurants, scrape_week_menus
+
+    restaurants = get_localized_restaurants([locale])[locale]
+
+    def load():
+        # Start fresh timings so a long-running process does not accumulate them
+        reset_instrumentation()
+        return scrape_week_menus(restaurants)
+
+    return MenuCache(load, refresh_seconds=refresh_seconds, locale=locale)
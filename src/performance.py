@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Historical scrape-performance tracking and regression report.
+
+Each run stores per-restaurant fetch latency, parse time, bytes, item counts,
+the parsing strategy used and a success flag in a small SQLite database. The
+report compares the most recent runs against a rolling window of earlier runs
+and flags statistically significant slowdowns, page size growth, parser
+fallbacks and failures.
+"""
+
+import os
+import sys
+import math
+import sqlite3
+import argparse
+import statistics
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_DB_PATH = "scrape_performance.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_stats (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    restaurant TEXT NOT NULL,
+    latency_s REAL NOT NULL,
+    parse_s REAL NOT NULL,
+    bytes INTEGER NOT NULL,
+    days INTEGER NOT NULL,
+    items INTEGER NOT NULL,
+    strategy TEXT,
+    success INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scrape_stats_restaurant
+    ON scrape_stats (restaurant, recorded_at);
+CREATE TABLE IF NOT EXISTS host_fetch (
+    id INTEGER PRIMARY KEY,
+    recorded_at TEXT NOT NULL,
+    host TEXT NOT NULL,
+    fetch_s REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_host_fetch_host ON host_fetch (host, recorded_at);
+CREATE TABLE IF NOT EXISTS scrape_memory (
+    id INTEGER PRIMARY KEY,
+    recorded_at TEXT NOT NULL,
+    restaurant TEXT NOT NULL,
+    peak_bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scrape_memory_restaurant
+    ON scrape_memory (restaurant, recorded_at);
+"""
+
+# Numeric metrics checked for regressions and how they are described
+TRACKED_METRICS = {
+    "latency_s": "fetch latency",
+    "parse_s": "parse time",
+    "bytes": "page size",
+}
+
+
+def welch_statistic(baseline: List[float], recent: List[float]) -> float:
+    """Welch's t statistic of recent values against baseline values."""
+    if len(baseline) < 2 or not recent:
+        return 0.0
+    variance = statistics.variance(baseline) / len(baseline)
+    if len(recent) > 1:
+        variance += statistics.variance(recent) / len(recent)
+    difference = statistics.mean(recent) - statistics.mean(baseline)
+    if variance == 0:
+        return math.inf if difference > 0 else 0.0
+    return difference / math.sqrt(variance)
+
+
+class PerformanceHistory:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("PERF_HISTORY_DB", DEFAULT_DB_PATH)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def record_run(
+        self,
+        restaurants,
+        week_menus: Dict[str, Optional[Dict[str, List[str]]]],
+        instrumentation,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """Store one row per restaurant for a finished run."""
+        recorded_at = (now or datetime.now()).isoformat(timespec="seconds")
+        rows = []
+        for restaurant in restaurants:
+            menu = week_menus.get(restaurant.name)
+            fetches = [
+                e
+                for e in instrumentation.events
+                if e["restaurant"] == restaurant.name and e["stage"] == "fetch"
+            ]
+            rows.append(
+                (
+                    instrumentation.run_id,
+                    recorded_at,
+                    restaurant.name,
+                    sum(e["duration_s"] for e in fetches),
+                    instrumentation.total(restaurant.name, "parse"),
+                    sum(e.get("bytes", 0) for e in fetches),
+                    len(menu or {}),
+                    sum(len(items) for items in (menu or {}).values()),
+                    restaurant.strategy,
+                    int(bool(menu)),
+                )
+            )
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO scrape_stats (run_id, recorded_at, restaurant, "
+                "latency_s, parse_s, bytes, days, items, strategy, success) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.executemany(
+                "INSERT INTO host_fetch (recorded_at, host, fetch_s) VALUES (?, ?, ?)",
+                [
+                    (recorded_at, e["host"], e["duration_s"])
+                    for e in instrumentation.events
+                    if e["stage"] == "fetch" and e.get("host")
+                ],
+            )
+            self.conn.executemany(
+                "INSERT INTO scrape_memory (recorded_at, restaurant, peak_bytes) "
+                "VALUES (?, ?, ?)",
+                [
+                    (recorded_at, e["restaurant"], e["bytes"])
+                    for e in instrumentation.events
+                    if e["stage"] == "peak_memory" and "bytes" in e
+                ],
+            )
+
+    def host_fetch_times(self, host: str, limit: int = 50) -> List[float]:
+        """Get the latest unhedged fetch durations of a host, in seconds."""
+        rows = self.conn.execute(
+            "SELECT fetch_s FROM host_fetch WHERE host = ? "
+            "ORDER BY recorded_at DESC, id DESC LIMIT ?",
+            (host, limit),
+        )
+        return [row[0] for row in rows]
+
+    def peak_memory(self, restaurant: str, limit: int = 10) -> List[int]:
+        """Get the latest peak memory use of a restaurant's scrapes, in bytes."""
+        rows = self.conn.execute(
+            "SELECT peak_bytes FROM scrape_memory WHERE restaurant = ? "
+            "ORDER BY recorded_at DESC, id DESC LIMIT ?",
+            (restaurant, limit),
+        )
+        return [row[0] for row in rows]
+
+    def restaurants(self) -> List[str]:
+        """List all restaurants with recorded runs."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT restaurant FROM scrape_stats ORDER BY restaurant"
+        )
+        return [row[0] for row in rows]
+
+    def runs(self, restaurant: str, limit: int) -> List[sqlite3.Row]:
+        """Get the latest runs of a restaurant, oldest first."""
+        rows = self.conn.execute(
+            "SELECT * FROM scrape_stats WHERE restaurant = ? "
+            "ORDER BY recorded_at DESC, id DESC LIMIT ?",
+            (restaurant, limit),
+        ).fetchall()
+        return list(reversed(rows))
+
+    def find_regressions(
+        self,
+        restaurant: str,
+        window: int = 14,
+        recent: int = 3,
+        threshold: float = 3.0,
+        min_change: float = 0.2,
+    ) -> List[str]:
+        """Compare the latest runs of a restaurant against the window before.
+
+        A numeric metric is flagged when Welch's t statistic exceeds the
+        threshold and the mean grew by at least min_change. Parser fallbacks,
+        failures and empty menus are flagged when they are new in recent runs.
+        """
+        runs = self.runs(restaurant, window + recent)
+        if len(runs) <= recent:
+            return []
+        baseline, latest = runs[:-recent], runs[-recent:]
+
+        findings = []
+        for metric, description in TRACKED_METRICS.items():
+            base_values = [row[metric] for row in baseline]
+            recent_values = [row[metric] for row in latest]
+            base_mean = statistics.mean(base_values)
+            recent_mean = statistics.mean(recent_values)
+            if base_mean <= 0 or recent_mean < base_mean * (1 + min_change):
+                continue
+            if welch_statistic(base_values, recent_values) >= threshold:
+                findings.append(
+                    f"{description} {base_mean:.3g} -> {recent_mean:.3g} "
+                    f"(+{(recent_mean / base_mean - 1) * 100:.0f} %)"
+                )
+
+        findings.extend(self._find_behaviour_changes(baseline, latest))
+        return findings
+
+    def _find_behaviour_changes(self, baseline, latest) -> List[str]:
+        """Flag new parser fallbacks, failures and item count drops."""
+        findings = []
+        usual = statistics.mode(row["strategy"] for row in baseline)
+        changed = sorted({r["strategy"] for r in latest if r["strategy"] != usual})
+        if changed:
+            findings.append(f"strategy changed from {usual} to {', '.join(changed)}")
+
+        base_success = sum(row["success"] for row in baseline) / len(baseline)
+        recent_success = sum(row["success"] for row in latest) / len(latest)
+        if recent_success < base_success:
+            findings.append(f"success rate {base_success:.0%} -> {recent_success:.0%}")
+
+        base_items = statistics.mean(row["items"] for row in baseline)
+        recent_items = statistics.mean(row["items"] for row in latest)
+        if base_items > 0 and recent_items < base_items / 2:
+            findings.append(f"item count {base_items:.1f} -> {recent_items:.1f}")
+        return findings
+
+    def report(self, window: int = 14, recent: int = 3) -> Dict[str, List[str]]:
+        """Find regressions for every restaurant."""
+        return {
+            restaurant: self.find_regressions(restaurant, window, recent)
+            for restaurant in self.restaurants()
+        }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(description="Scrape performance report.")
+    parser.add_argument("--db", help="Path to the performance database")
+    parser.add_argument(
+        "--window", type=int, default=14, help="Earlier runs used as the baseline"
+    )
+    parser.add_argument(
+        "--recent", type=int, default=3, help="Latest runs compared to the baseline"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    """Print the regression report; fails when any regression is found."""
+    args = _build_parser().parse_args(argv)
+    history = PerformanceHistory(args.db)
+    try:
+        report = history.report(args.window, args.recent)
+    finally:
+        history.close()
+
+    regressed = False
+    for restaurant, findings in report.items():
+        if findings:
+            regressed = True
+            print(f"❌ {restaurant}")
+            for finding in findings:
+                print(f"   • {finding}")
+        else:
+            print(f"✅ {restaurant}")
+
+    return not regressed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
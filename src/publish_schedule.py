@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Learned publish times and fetch schedules per restaurant.
+
+Every scrape records a hash of each restaurant's week menu; the first time
+new content is seen in a week marks when the restaurant published it. Last
+week's menu still online at the start of a week is not a publish. From the
+publish times of recent weeks each restaurant gets a schedule: when in the
+week to fetch it first, how often to poll while its menu is missing and when
+to stop polling. Scheduled runs skip restaurants that are not expected to
+have published yet and run again only when a late restaurant is due.
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from restaurants.base import get_target_date, get_week_start
+
+DEFAULT_DB_PATH = "publish_schedule.db"
+
+# Weeks of publish times a schedule is learned from
+LEARNING_WEEKS = 8
+# Fetch this much before the earliest publish time seen
+FIRST_FETCH_MARGIN = timedelta(hours=1)
+# Keep polling this long after the latest publish time seen
+STOP_MARGIN = timedelta(hours=3)
+MIN_POLL_INTERVAL = timedelta(minutes=30)
+MAX_POLL_INTERVAL = timedelta(hours=2)
+
+# Until a restaurant has published once: fetch from the start of the week
+# and poll hourly until Monday noon
+DEFAULT_SCHEDULE = {
+    "first_fetch": timedelta(0),
+    "poll_interval": timedelta(hours=1),
+    "stop": timedelta(hours=12),
+}
+
+# Fetch decisions
+READY = "ready"  # This week's menu is known, fetch on the daily run
+EARLY = "early"  # Not expected to be published yet, do not fetch
+DUE = "due"  # Missing and polled for now
+WAITING = "waiting"  # Missing, polled recently
+MISSED = "missed"  # Missing past the stop time, fetch on the daily run
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publish_observations (
+    restaurant TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    PRIMARY KEY (restaurant, week_start, content_hash)
+);
+CREATE TABLE IF NOT EXISTS publish_fetches (
+    restaurant TEXT PRIMARY KEY,
+    last_fetch TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS publish_posts (
+    day TEXT PRIMARY KEY,
+    posted_at TEXT NOT NULL
+);
+"""
+
+
+def menu_hash(menu: Optional[Dict[str, List[str]]]) -> Optional[str]:
+    """Hash a week menu's content, None when it has no dishes."""
+    if not menu or not any(menu.values()):
+        return None
+    content = json.dumps(menu, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def week_start_of(now: datetime) -> datetime:
+    """Get midnight of the Monday starting the target week."""
+    return datetime.combine(get_week_start(now), datetime.min.time())
+
+
+def learn_schedule(offsets: List[timedelta]) -> Dict[str, timedelta]:
+    """Build a fetch schedule from publish times relative to week start."""
+    if not offsets:
+        return dict(DEFAULT_SCHEDULE)
+    earliest, latest = min(offsets), max(offsets)
+    poll_interval = min(
+        max((latest - earliest) / 4, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL
+    )
+    return {
+        "first_fetch": max(earliest - FIRST_FETCH_MARGIN, timedelta(0)),
+        "poll_interval": poll_interval,
+        "stop": latest + STOP_MARGIN,
+    }
+
+
+class PublishTracker:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("PUBLISH_SCHEDULE_DB", DEFAULT_DB_PATH)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def record_fetches(self, week_menus, now: Optional[datetime] = None) -> List[str]:
+        """Store fetched menus' hashes; return restaurants new content appeared for.
+
+        A restaurant is returned when this is the first content of the week
+        seen for it, i.e. when its menu was published since the last fetch.
+        Content unchanged from the previous week is not recorded.
+        """
+        now = now or datetime.now()
+        week_start = week_start_of(now).isoformat()
+        seen_at = now.isoformat(timespec="seconds")
+        published = []
+        with self.conn:
+            for restaurant, menu in week_menus.items():
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO publish_fetches VALUES (?, ?)",
+                    (restaurant, seen_at),
+                )
+                digest = menu_hash(menu)
+                if digest is None:
+                    continue
+                if not self._has_content(restaurant, week_start):
+                    if digest == self._previous_hash(restaurant, week_start):
+                        continue
+                    published.append(restaurant)
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO publish_observations VALUES (?, ?, ?, ?)",
+                    (restaurant, week_start, digest, seen_at),
+                )
+        return published
+
+    def _has_content(self, restaurant: str, week_start: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM publish_observations "
+            "WHERE restaurant = ? AND week_start = ?",
+            (restaurant, week_start),
+        ).fetchone()
+        return row is not None
+
+    def _previous_hash(self, restaurant: str, week_start: str) -> Optional[str]:
+        """Get the hash of the latest content seen before a week."""
+        row = self.conn.execute(
+            "SELECT content_hash FROM publish_observations "
+            "WHERE restaurant = ? AND week_start < ? "
+            "ORDER BY first_seen DESC LIMIT 1",
+            (restaurant, week_start),
+        ).fetchone()
+        return row[0] if row else None
+
+    def publish_offsets(
+        self, restaurant: str, weeks: int = LEARNING_WEEKS
+    ) -> List[timedelta]:
+        """Get when each recent week's content first appeared, from week start."""
+        rows = self.conn.execute(
+            "SELECT week_start, MIN(first_seen) FROM publish_observations "
+            "WHERE restaurant = ? GROUP BY week_start "
+            "ORDER BY week_start DESC LIMIT ?",
+            (restaurant, weeks),
+        ).fetchall()
+        return [
+            datetime.fromisoformat(first_seen) - datetime.fromisoformat(week_start)
+            for week_start, first_seen in rows
+        ]
+
+    def schedule(self, restaurant: str) -> Dict[str, timedelta]:
+        """Get the learned fetch schedule of a restaurant."""
+        return learn_schedule(self.publish_offsets(restaurant))
+
+    def _last_fetch(self, restaurant: str) -> Optional[datetime]:
+        row = self.conn.execute(
+            "SELECT last_fetch FROM publish_fetches WHERE restaurant = ?",
+            (restaurant,),
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def decide(self, restaurant: str, now: Optional[datetime] = None) -> str:
+        """Decide whether a restaurant should be fetched now."""
+        now = now or datetime.now()
+        week_start = week_start_of(now)
+        if self._has_content(restaurant, week_start.isoformat()):
+            return READY
+        schedule = self.schedule(restaurant)
+        offset = now - week_start
+        if offset < schedule["first_fetch"]:
+            return EARLY
+        if offset > schedule["stop"]:
+            return MISSED
+        last_fetch = self._last_fetch(restaurant)
+        if last_fetch is None or now - last_fetch >= schedule["poll_interval"]:
+            return DUE
+        return WAITING
+
+    def plan(
+        self, restaurants: Iterable[str], now: Optional[datetime] = None
+    ) -> Dict[str, str]:
+        """Decide for each restaurant whether it should be fetched now."""
+        return {restaurant: self.decide(restaurant, now) for restaurant in restaurants}
+
+    def mark_posted(self, now: Optional[datetime] = None) -> None:
+        """Remember that the menu of the target day was posted."""
+        now = now or datetime.now()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO publish_posts VALUES (?, ?)",
+                (get_target_date(now).isoformat(), now.isoformat(timespec="seconds")),
+            )
+
+    def posted(self, now: Optional[datetime] = None) -> bool:
+        """Check whether the menu of the target day was already posted."""
+        day = get_target_date(now or datetime.now()).isoformat()
+        row = self.conn.execute(
+            "SELECT 1 FROM publish_posts WHERE day = ?", (day,)
+        ).fetchone()
+        return row is not None
+
+
+def _format_offset(offset: timedelta) -> str:
+    """Format a week offset as weekday and time, e.g. 'Mon 09:30'."""
+    moment = datetime(2024, 1, 1) + offset  # A Monday
+    return moment.strftime("%a %H:%M")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(description="Learned publish schedules.")
+    parser.add_argument("--db", help="Path to the publish schedule database")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print the learned fetch schedule of every restaurant."""
+    args = _build_parser().parse_args(argv)
+    tracker = PublishTracker(args.db)
+    try:
+        rows = tracker.conn.execute(
+            "SELECT DISTINCT restaurant FROM publish_fetches ORDER BY restaurant"
+        ).fetchall()
+        for (restaurant,) in rows:
+            offsets = tracker.publish_offsets(restaurant)
+            schedule = learn_schedule(offsets)
+            print(
+                f"{restaurant}: first fetch {_format_offset(schedule['first_fetch'])}, "
+                f"poll every {schedule['poll_interval'].total_seconds() / 60:.0f} min, "
+                f"stop {_format_offset(schedule['stop'])} "
+                f"({len(offsets)} weeks observed)"
+            )
+    finally:
+        tracker.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
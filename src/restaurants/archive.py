@@ -0,0 +1,179 @@
+"""
+Raw response archive for recording and offline replay of restaurant pages.
+
+Response bodies are stored gzip-compressed under their SHA-256 digest, so a
+page that did not change between runs is stored only once. Every fetch
+appends a record (URL, status, headers, digest, fetch time) to index.jsonl.
+
+Set MENU_ARCHIVE_DIR to enable the archive. MENU_ARCHIVE_MODE selects
+between "record" (default, fetch live and store) and "replay" (serve from the
+archive without any network access).
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .instrumentation import TimedAdapter
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class ResponseArchive:
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.jsonl")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, List[dict]]] = None
+
+    def _object_path(self, digest: str) -> str:
+        """Get the file path of a stored body."""
+        return os.path.join(self.objects_dir, digest[:2], f"{digest[2:]}.gz")
+
+    def _load_index(self) -> Dict[str, List[dict]]:
+        """Load index records grouped by URL, oldest first."""
+        with self._lock:
+            if self._index is None:
+                # Other threads only see the index once it is complete
+                index: Dict[str, List[dict]] = {}
+                for record in self.records():
+                    index.setdefault(record["url"], []).append(record)
+                self._index = index
+            return self._index
+
+    def records(self) -> Iterator[dict]:
+        """Iterate over all index records in the order they were stored."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, encoding="utf-8") as index_file:
+            for line in index_file:
+                if line.strip():
+                    yield json.loads(line)
+
+    def store_body(self, body: bytes) -> str:
+        """Store a response body under its content digest."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb") as body_file:
+                body_file.write(body)
+            os.replace(tmp_path, path)
+        return digest
+
+    def load_body(self, digest: str) -> bytes:
+        """Load a stored response body by its digest."""
+        with gzip.open(self._object_path(digest), "rb") as body_file:
+            return body_file.read()
+
+    def store(self, response: requests.Response) -> dict:
+        """Store a fetched response and append its index record."""
+        record = {
+            "url": response.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "digest": self.store_body(response.content),
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            with open(self.index_path, "a", encoding="utf-8") as index_file:
+                index_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if self._index is not None:
+                self._index.setdefault(record["url"], []).append(record)
+        return record
+
+    def lookup(self, url: str, as_of: Optional[str] = None) -> Optional[dict]:
+        """Find the latest record for a URL, optionally at or before as_of."""
+        records = self._load_index().get(url, [])
+        if as_of:
+            records = [r for r in records if r["fetched_at"] <= as_of]
+        return records[-1] if records else None
+
+
+class ArchiveAdapter(TimedAdapter):
+    """Transport adapter that records responses or replays them offline."""
+
+    def __init__(
+        self,
+        archive: ResponseArchive,
+        mode: str = RECORD,
+        as_of: Optional[str] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.archive = archive
+        self.mode = mode
+        self.as_of = as_of
+
+    def send(self, request, **kwargs):
+        if self.mode == REPLAY:
+            return self._replay(request)
+
+        response = super().send(request, **kwargs)
+        try:
+            self.archive.store(response)
+        except OSError as e:
+            logging.error(f"Failed to archive response from {request.url}: {e}")
+        return response
+
+    def _replay(self, request) -> requests.Response:
+        """Build a response from the archive without touching the network."""
+        record = self.archive.lookup(request.url, self.as_of)
+        if not record:
+            raise requests.ConnectionError(
+                f"No archived response for {request.url}", request=request
+            )
+
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.reason = record.get("reason")
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.archive.load_body(record["digest"])
+        response.url = request.url
+        response.request = request
+        return response
+
+
+_archives: Dict[str, ResponseArchive] = {}
+
+
+def get_archive(root: str) -> ResponseArchive:
+    """Get a shared archive instance for a directory."""
+    if root not in _archives:
+        _archives[root] = ResponseArchive(root)
+    return _archives[root]
+
+
+def mount_archive(session: requests.Session, pool_maxsize: int = 10) -> None:
+    """Mount the archive adapter on a session if MENU_ARCHIVE_DIR is set."""
+    root = os.getenv("MENU_ARCHIVE_DIR")
+    if not root:
+        return
+
+    mode = os.getenv("MENU_ARCHIVE_MODE", RECORD).lower()
+    if mode not in (RECORD, REPLAY):
+        raise ValueError(f"Unknown MENU_ARCHIVE_MODE '{mode}'")
+
+    adapter = ArchiveAdapter(
+        get_archive(root),
+        mode=mode,
+        as_of=os.getenv("MENU_ARCHIVE_AS_OF"),
+        pool_maxsize=pool_maxsize,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
@@ -3,37 +3,130 @@ Base restaurant class for lunch menu scraping.
 All restaurant scrapers should inherit from this class.
 """
 
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
 import requests
 from bs4 import BeautifulSoup
 import logging
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from urllib.parse import urlsplit
+
+from .archive import mount_archive
+from .hedging import get_hedge_policy
+from .instrumentation import TimedAdapter, get_instrumentation
+from .locales import DEFAULT_LOCALE, LOCALES, localize_day
+
+DAY_NAMES = LOCALES[DEFAULT_LOCALE]["day_names"]
+
+
+def get_target_date(now: Optional[datetime] = None) -> date:
+    """Get the date whose menu is posted: today, or next Monday on weekends."""
+    current_date = (now or datetime.now()).date()
+    weekday = current_date.weekday()  # 0=Monday, 6=Sunday
+    if weekday >= 5:  # Saturday or Sunday
+        return current_date + timedelta(days=7 - weekday)
+    return current_date
+
+
+def get_target_day(now: Optional[datetime] = None) -> str:
+    """Get the Finnish day name of the target date."""
+    return DAY_NAMES[get_target_date(now).weekday()]
+
+
+def get_week_start(now: Optional[datetime] = None) -> date:
+    """Get the Monday of the week the target date belongs to."""
+    target_date = get_target_date(now)
+    return target_date - timedelta(days=target_date.weekday())
+
+
+def get_day_date(day_name: str, now: Optional[datetime] = None) -> Optional[date]:
+    """Map a Finnish day name to its date in the target week."""
+    if day_name not in DAY_NAMES:
+        return None
+    return get_week_start(now) + timedelta(days=DAY_NAMES.index(day_name))
+
+
+def upstream_url(url: str) -> str:
+    """Point a URL at MENU_UPSTREAM_URL if it is set, e.g. a local fake server.
+
+    The original host becomes the first path segment, so one server can
+    stand in for every restaurant site and feed.
+    """
+    base = os.getenv("MENU_UPSTREAM_URL")
+    if not base:
+        return url
+    parts = urlsplit(url)
+    rebased = f"{base.rstrip('/')}/{parts.netloc}{parts.path or '/'}"
+    return f"{rebased}?{parts.query}" if parts.query else rebased
+
+
+def create_session(pool_maxsize: int = 10) -> requests.Session:
+    """Create an HTTP session with the scraper's headers and transport."""
+    session = requests.Session()
+    session.headers.update(
+        {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/91.0.4472.124 Safari/537.36"
+        }
+    )
+    session.mount("http://", TimedAdapter(pool_maxsize=pool_maxsize))
+    session.mount("https://", TimedAdapter(pool_maxsize=pool_maxsize))
+    mount_archive(session, pool_maxsize=pool_maxsize)
+    return session
 
 
 class BaseRestaurant(ABC):
-    def __init__(self, name: str, url: str):
+    def __init__(self, name: str, url: str, session: Optional[requests.Session] = None):
         self.name = name
         self.url = url
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/91.0.4472.124 Safari/537.36"
-            }
-        )
+        # Which parsing strategy produced the last menu, e.g. a fallback
+        self.strategy = "default"
+        # Restaurants of the same provider share one pooled session
+        self.session = session or create_session()
+
+    def fetch(self, url: Optional[str] = None) -> requests.Response:
+        """Fetch a URL (the restaurant's own by default) and check the status.
+
+        All page and API requests go through here so that the response archive
+        and other transport features apply to every restaurant.
+        """
+        policy = get_hedge_policy()
+        url = upstream_url(url or self.url)
+        with get_instrumentation().fetch(self.name) as timing:
+            if policy is None:
+                response = self.session.get(url, timeout=10)
+            else:
+                response = policy.get(self.session, url, timeout=10)
+            timing["response"] = response
+        response.raise_for_status()
+        return response
 
     def get_page_content(self) -> Optional[BeautifulSoup]:
         """Fetch and parse the restaurant's webpage."""
         try:
-            response = self.session.get(self.url, timeout=10)
-            response.raise_for_status()
+            response = self.fetch()
             return BeautifulSoup(response.content, "html.parser")
         except Exception as e:
             logging.error(f"Failed to fetch {self.name}: {e}")
             return None
 
+    @contextmanager
+    def parsed_page(self) -> Iterator[Optional[BeautifulSoup]]:
+        """Fetch and parse the webpage, releasing the parse tree afterwards.
+
+        The tree is decomposed as soon as the block ends, so a scrape holds
+        it only while the menu is being extracted.
+        """
+        soup = self.get_page_content()
+        try:
+            yield soup
+        finally:
+            if soup is not None:
+                soup.decompose()
+
     @abstractmethod
     def scrape_menu(self) -> Dict[str, List[str]]:
         """Scrape the lunch menu from the restaurant's website."""
@@ -41,31 +134,28 @@ class BaseRestaurant(ABC):
 
     def get_current_day_menu(self) -> str:
         """Get only the current day's menu, or Monday's if it's the weekend."""
-        menu = self.scrape_menu()
+        return self.format_current_day_menu(self.scrape_menu())
+
+    def format_current_day_menu(
+        self, menu: Dict[str, List[str]], locale: str = DEFAULT_LOCALE
+    ) -> str:
+        """Format an already scraped week menu for the current day."""
         if not menu:
             return f"❌ {self.name}: Unable to fetch menu"
 
-        # Get current day name in Finnish
-        current_date = datetime.now()
-        weekday = current_date.weekday()  # 0=Monday, 6=Sunday
-
-        # If it's weekend (Saturday=5, Sunday=6), use Monday
-        if weekday >= 5:  # Saturday or Sunday
-            target_day = "Maanantai"
-        else:
-            # Map weekday to Finnish day names
-            day_names = ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai"]
-            target_day = day_names[weekday]
+        # If it's weekend, the target day is Monday
+        target_day = get_target_day()
+        day_label = localize_day(target_day, locale)
 
         # Get the menu for the target day
         if target_day in menu and menu[target_day]:
             formatted = f"🍽️ **{self.name}**\n"
-            formatted += f"📅 **{target_day}**\n"
+            formatted += f"📅 **{day_label}**\n"
             for item in menu[target_day]:
                 formatted += f"• {item}\n"
             return formatted
         else:
-            return f"❌ {self.name}: No menu available for {target_day}"
+            return f"❌ {self.name}: No menu available for {day_label}"
 
     def get_formatted_menu(self) -> str:
         """Get a formatted string representation of the lunch menu."""
@@ -0,0 +1,162 @@
+"""
+Compass Group restaurants.
+API: https://www.compass-group.fi/menuapi/feed/json?costNumber=<cost number>
+
+Every Compass Group restaurant is identified by a cost number. All of them are
+fetched through one CompassGroupProvider so their feeds are downloaded
+concurrently over a single pooled connection to compass-group.fi.
+"""
+
+import re
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .base import BaseRestaurant
+from .provider import FeedProvider
+
+FEED_URL = "https://www.compass-group.fi/menuapi/feed/json"
+
+
+class CompassGroupProvider(FeedProvider):
+    def __init__(
+        self,
+        cost_numbers: Optional[Dict[str, str]] = None,
+        feed_url: str = FEED_URL,
+        **kwargs,
+    ):
+        """Create a provider for restaurants given as {cost number: name}."""
+        super().__init__(**kwargs)
+        self.cost_numbers = dict(cost_numbers or {})
+        self.base_url = feed_url
+
+    def feed_url(self, cost_number: str, language: str = "fi") -> str:
+        """Get the menu feed URL of a restaurant."""
+        return f"{self.base_url}?costNumber={cost_number}&language={language}"
+
+    def restaurants(self, language: str = "fi") -> List["CompassGroupRestaurant"]:
+        """Create a restaurant for every configured cost number."""
+        return [
+            CompassGroupRestaurant(name, cost_number, provider=self, language=language)
+            for cost_number, name in self.cost_numbers.items()
+        ]
+
+
+class CompassGroupRestaurant(BaseRestaurant):
+    def __init__(
+        self,
+        name: str,
+        cost_number: str,
+        provider: Optional[CompassGroupProvider] = None,
+        language: str = "fi",
+    ):
+        self.provider = provider or CompassGroupProvider({cost_number: name})
+        self.cost_number = cost_number
+        self.language = language
+        super().__init__(
+            name=name,
+            url=self.provider.feed_url(cost_number, language),
+            session=self.provider.session,
+        )
+
+    def get_page_content(self):
+        """Get the JSON feed, prefetched by the provider when possible."""
+        return self.provider.get_feed(self)
+
+    def _parse_date(self, date_str: str):
+        """Parse date string and return datetime object."""
+        if date_str.endswith("+00:00"):
+            return datetime.fromisoformat(date_str)
+        else:
+            return datetime.fromisoformat(date_str.replace("Z", ""))
+
+    def _get_day_mapping(self) -> Dict[int, str]:
+        """Get mapping from weekday number to Finnish day name."""
+        return {
+            0: "Maanantai",  # Monday
+            1: "Tiistai",  # Tuesday
+            2: "Keskiviikko",  # Wednesday
+            3: "Torstai",  # Thursday
+            4: "Perjantai",  # Friday
+        }
+
+    def _extract_menu_items(self, day: dict) -> List[str]:
+        """Extract menu items from a day's data."""
+        menu_items = []
+        for set_menu in day["SetMenus"]:
+            menu_name = set_menu.get("Name")
+            if menu_name:
+                cleaned_name = menu_name.strip().replace(" ", "").lower()
+                if cleaned_name in ("buffetlounas", "lounas", "buffet"):
+                    components = set_menu.get("Components", [])
+                    for component in components:
+                        if component:
+                            # Normalize internal whitespaces/newlines
+                            cleaned_comp = re.sub(r"\s+", " ", component).strip()
+                            if cleaned_comp:
+                                menu_items.append(cleaned_comp)
+        return menu_items
+
+    def _process_day(self, day: dict, day_mapping: Dict[int, str]) -> tuple:
+        """Process a single day's data and return (day_name, menu_items)."""
+        if not day.get("SetMenus"):
+            return None, None
+
+        date_str = day.get("Date", "")
+        if not date_str:
+            return None, None
+
+        try:
+            date_obj = self._parse_date(date_str)
+            weekday = date_obj.weekday()
+
+            if weekday >= 5:  # Skip weekends
+                logging.info(f"Skipping weekend day: {date_obj.strftime('%A')}")
+                return None, None
+
+            standard_day = day_mapping[weekday]
+            menu_items = self._extract_menu_items(day)
+
+            if menu_items:
+                logging.info(f"Added {len(menu_items)} items for {standard_day}")
+            else:
+                logging.info(f"No menu items found for {standard_day}")
+
+            return standard_day, menu_items
+
+        except (ValueError, KeyError) as e:
+            logging.error(f"Error parsing date '{date_str}' for {self.name}: {e}")
+            return None, None
+
+    def scrape_menu(self) -> Dict[str, List[str]]:
+        """Scrape the lunch menu from the Compass Group JSON API."""
+        json_data = self.get_page_content()
+        if not json_data:
+            return {}
+
+        try:
+            if not json_data.get("MenusForDays"):
+                logging.error(
+                    f"Invalid JSON structure from {self.name} - no MenusForDays found"
+                )
+                return {}
+
+            days = json_data["MenusForDays"]
+            menu = {}
+            day_mapping = self._get_day_mapping()
+
+            logging.info(f"Processing {len(days)} days from {self.name} JSON API")
+
+            for day in days:
+                day_name, menu_items = self._process_day(day, day_mapping)
+                if day_name and menu_items:
+                    menu[day_name] = menu_items
+
+            logging.info(
+                f"Successfully extracted menu for {len(menu)} days from {self.name}"
+            )
+            return menu
+
+        except Exception as e:
+            logging.error(f"Error parsing {self.name} JSON: {e}")
+            return {}
@@ -0,0 +1,166 @@
+"""
+Declarative scraper engine for "heading names a day" HTML restaurants.
+
+A restaurant is described by a TOML spec in restaurants/specs/ (or in the
+directory given by MENU_SPECS_DIR) with:
+
+- [days]: heading tags and the lowercase text that maps a heading to a day
+- [items]: how dishes are collected after a day heading, either sibling
+  elements ("siblings") or cells of the first matching container ("table")
+- cleanup rules: minimum length, whitespace collapsing and exclusion phrases
+
+Specs are compiled once into HtmlMenuExtractor objects with precompiled CSS
+selectors and patterns, and cached by path.
+"""
+
+import os
+import glob
+import tomllib
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+
+import soupsieve
+from bs4 import Tag
+
+from .base import BaseRestaurant
+from .phrases import ANYWHERE, PhraseMatcher
+
+SPECS_DIR = os.path.join(os.path.dirname(__file__), "specs")
+
+ITEM_MODES = ("siblings", "table")
+
+
+class HtmlMenuExtractor:
+    def __init__(self, spec: dict, source: str = "<spec>"):
+        try:
+            self.name = spec["name"]
+            self.url = spec["url"]
+            days = spec["days"]
+            items = spec["items"]
+            self.day_names = [
+                (text.lower(), day) for text, day in days["names"].items()
+            ]
+        except (KeyError, AttributeError) as e:
+            raise ValueError(f"Invalid restaurant spec {source}: missing {e}") from e
+
+        self.headings = frozenset(days.get("headings", ["h1", "h2", "h3"]))
+        self.mode = items.get("mode", "siblings")
+        if self.mode not in ITEM_MODES:
+            raise ValueError(f"Invalid restaurant spec {source}: mode '{self.mode}'")
+
+        self.selector = soupsieve.compile(items.get("selector", "p, li, div"))
+        self.container = (
+            soupsieve.compile(items["container"]) if "container" in items else None
+        )
+        if self.mode == "table" and self.container is None:
+            raise ValueError(f"Invalid restaurant spec {source}: missing container")
+
+        self.min_length = items.get("min_length", 1)
+        self.collapse_whitespace = items.get("collapse_whitespace", True)
+        exclude = items.get("exclude", [])
+        self.exclude = (
+            PhraseMatcher({ANYWHERE: exclude}, source=source) if exclude else None
+        )
+
+    def match_day(self, text: str) -> Optional[str]:
+        """Get the day a heading text names, or None."""
+        text_lower = text.lower()
+        for pattern, day in self.day_names:
+            if pattern in text_lower:
+                return day
+        return None
+
+    def _is_day_heading(self, element) -> bool:
+        """Check if an element is a heading naming a day."""
+        return element.name in self.headings and bool(
+            self.match_day(element.get_text(strip=True))
+        )
+
+    def _clean(self, text: str) -> Optional[str]:
+        """Apply the cleanup rules to an item text."""
+        if not text or len(text) < self.min_length:
+            return None
+        if self.collapse_whitespace:
+            text = " ".join(text.split())
+        if self.exclude and self.exclude.matches(text):
+            return None
+        return text
+
+    def _sibling_elements(self, heading) -> Iterator[Tag]:
+        """Sibling elements after a heading, up to the next day heading."""
+        for element in heading.next_siblings:
+            if not isinstance(element, Tag):
+                continue
+            if self._is_day_heading(element):
+                return
+            yield element
+
+    def _find_container(self, heading) -> Optional[Tag]:
+        """First container after a heading, before the next day heading."""
+        for element in heading.next_elements:
+            if not isinstance(element, Tag):
+                continue
+            if self._is_day_heading(element):
+                return None
+            if self.container.match(element):
+                return element
+        return None
+
+    def _item_elements(self, heading) -> List[Tag]:
+        """Elements holding the dishes of the day a heading names."""
+        if self.mode == "table":
+            container = self._find_container(heading)
+            return self.selector.select(container) if container else []
+        return [e for e in self._sibling_elements(heading) if self.selector.match(e)]
+
+    def extract(self, soup) -> Dict[str, List[str]]:
+        """Extract the week menu from a parsed page."""
+        menu = {}
+        for heading in soup.find_all(list(self.headings)):
+            day = self.match_day(heading.get_text(strip=True))
+            if not day:
+                continue
+            items = []
+            for element in self._item_elements(heading):
+                text = self._clean(element.get_text(strip=True))
+                if text:
+                    items.append(text)
+            if items:
+                menu[day] = items
+        return menu
+
+
+def spec_path(spec: str) -> str:
+    """Resolve a spec name (e.g. "kahvila_epila") or path to a file path."""
+    if os.path.sep in spec or spec.endswith(".toml"):
+        return spec
+    return os.path.join(SPECS_DIR, f"{spec}.toml")
+
+
+@lru_cache(maxsize=None)
+def load_extractor(path: str) -> HtmlMenuExtractor:
+    """Load and compile a spec file, once per path."""
+    with open(path, "rb") as spec_file:
+        return HtmlMenuExtractor(tomllib.load(spec_file), source=path)
+
+
+class DeclarativeRestaurant(BaseRestaurant):
+    def __init__(self, spec: str, **kwargs):
+        self.extractor = load_extractor(spec_path(spec))
+        super().__init__(name=self.extractor.name, url=self.extractor.url, **kwargs)
+
+    def scrape_menu(self) -> Dict[str, List[str]]:
+        """Scrape the lunch menu as described by the restaurant's spec."""
+        with self.parsed_page() as soup:
+            if not soup:
+                return {}
+            return self.extractor.extract(soup)
+
+
+def spec_restaurants(specs: List[str]) -> List[DeclarativeRestaurant]:
+    """Create restaurants for spec names plus every spec in MENU_SPECS_DIR."""
+    paths = [spec_path(spec) for spec in specs]
+    extra_dir = os.getenv("MENU_SPECS_DIR")
+    if extra_dir:
+        paths += sorted(glob.glob(os.path.join(extra_dir, "*.toml")))
+    return [DeclarativeRestaurant(path) for path in paths]
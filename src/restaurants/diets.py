@@ -0,0 +1,101 @@
+"""
+Diet and allergen flags of menu items.
+
+Every provider lists diet codes in parentheses after a dish, e.g.
+"Lohikeitto (L, G)" from Compass Group feeds, Luncher allergens and HTML
+pages alike. The codes are normalized here into flag sets such as
+{"lactose-free", "gluten-free"} that menus can be filtered on.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+LACTOSE_FREE = "lactose-free"
+LOW_LACTOSE = "low-lactose"
+MILK_FREE = "milk-free"
+GLUTEN_FREE = "gluten-free"
+VEGETARIAN = "vegetarian"
+VEGAN = "vegan"
+
+FLAGS = (LACTOSE_FREE, LOW_LACTOSE, MILK_FREE, GLUTEN_FREE, VEGETARIAN, VEGAN)
+
+# Diet code -> flags it grants, including the flags it implies
+CODE_FLAGS: Dict[str, FrozenSet[str]] = {
+    "L": frozenset({LACTOSE_FREE, LOW_LACTOSE}),
+    "VL": frozenset({LOW_LACTOSE}),
+    "M": frozenset({MILK_FREE, LACTOSE_FREE, LOW_LACTOSE}),
+    "G": frozenset({GLUTEN_FREE}),
+    "K": frozenset({VEGETARIAN}),
+    "KAS": frozenset({VEGETARIAN}),
+    "VEG": frozenset({VEGAN, VEGETARIAN, MILK_FREE, LACTOSE_FREE, LOW_LACTOSE}),
+    "VE": frozenset({VEGAN, VEGETARIAN, MILK_FREE, LACTOSE_FREE, LOW_LACTOSE}),
+}
+
+# Words accepted in subscriptions and channel configuration -> flag
+FILTER_ALIASES = {
+    **{flag: flag for flag in FLAGS},
+    "l": LACTOSE_FREE,
+    "laktoositon": LACTOSE_FREE,
+    "vl": LOW_LACTOSE,
+    "vähälaktoosinen": LOW_LACTOSE,
+    "m": MILK_FREE,
+    "maidoton": MILK_FREE,
+    "dairy-free": MILK_FREE,
+    "g": GLUTEN_FREE,
+    "gluteeniton": GLUTEN_FREE,
+    "k": VEGETARIAN,
+    "kasvis": VEGETARIAN,
+    "veg": VEGAN,
+    "vegaani": VEGAN,
+    "vegaaninen": VEGAN,
+}
+
+CODE_GROUP_PATTERN = re.compile(r"\(([^()]*)\)")
+CODE_SEPARATOR_PATTERN = re.compile(r"[,\s/]+")
+
+
+def diet_codes(item: str) -> set:
+    """Get the diet codes listed in a menu item, e.g. {"L", "G"}."""
+    codes = set()
+    for group in CODE_GROUP_PATTERN.findall(item):
+        codes.update(code.upper() for code in CODE_SEPARATOR_PATTERN.split(group))
+    codes.discard("")
+    return codes
+
+
+@lru_cache(maxsize=4096)
+def item_flags(item: str) -> FrozenSet[str]:
+    """Get the normalized diet flags of a menu item."""
+    flags = set()
+    for code in diet_codes(item):
+        flags.update(CODE_FLAGS.get(code, ()))
+    return frozenset(flags)
+
+
+def parse_filters(names: Iterable[str]) -> FrozenSet[str]:
+    """Normalize filter names or codes like "vegan" or "G" into flags."""
+    flags = set()
+    for name in names:
+        key = name.strip().lower()
+        if not key:
+            continue
+        if key not in FILTER_ALIASES:
+            raise ValueError(
+                f"Unknown diet filter '{name}', expected one of: {', '.join(FLAGS)}"
+            )
+        flags.add(FILTER_ALIASES[key])
+    return frozenset(flags)
+
+
+def filter_menu(
+    menu: Optional[Dict[str, List[str]]], flags: Iterable[str]
+) -> Optional[Dict[str, List[str]]]:
+    """Keep only the items of a week menu that have all the flags."""
+    wanted = frozenset(flags)
+    if not menu or not wanted:
+        return menu
+    return {
+        day: [item for item in items if wanted <= item_flags(item)]
+        for day, items in menu.items()
+    }
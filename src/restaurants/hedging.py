@@ -0,0 +1,112 @@
+"""
+Hedged requests for hosts with a slow tail.
+
+A request to an opted-in host that has not completed within the host's hedge
+delay (its historical p95 fetch duration, measured like the wait here from
+sending the request to having the whole response) is sent a second time, and
+whichever copy completes first wins. Hedged fetches are left out of the
+learned durations, as they only show how fast the quickest copy was. Hedges
+are capped to a fraction of the hedge-eligible requests, so a slow host cannot
+double the request volume.
+"""
+
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures import wait
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .instrumentation import carry_timings, mark_hedged
+
+# Hedges allowed per hedge-eligible request, on top of a small burst
+DEFAULT_MAX_HEDGE_RATIO = 0.1
+DEFAULT_HEDGE_BURST = 2
+
+
+class HedgePolicy:
+    def __init__(
+        self,
+        delays: Dict[str, float],
+        max_ratio: float = DEFAULT_MAX_HEDGE_RATIO,
+        burst: int = DEFAULT_HEDGE_BURST,
+    ):
+        # Host -> seconds to wait for an answer before hedging
+        self.delays = delays
+        self.max_ratio = max_ratio
+        self.burst = burst
+        self.requests = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def delay(self, url: str) -> Optional[float]:
+        """Get the hedge delay of a URL's host, None if it is not hedged."""
+        return self.delays.get(urlparse(url).hostname or "")
+
+    def _submit(self, session: requests.Session, url: str, **kwargs):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="hedge")
+        return self._executor.submit(carry_timings(session.get), url, **kwargs)
+
+    def _acquire(self) -> bool:
+        """Take a hedge from the budget, False when it is used up."""
+        with self._lock:
+            if self.hedges >= self.burst + self.max_ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def get(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """GET a URL, hedging it if its host is slow to answer."""
+        delay = self.delay(url)
+        if delay is None:
+            return session.get(url, **kwargs)
+
+        with self._lock:
+            self.requests += 1
+        first = self._submit(session, url, **kwargs)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeout:
+            pass
+        if not self._acquire():
+            return first.result()
+
+        logging.info(f"Hedging request to {urlparse(url).hostname} after {delay:.2f} s")
+        mark_hedged()
+        pending = {first, self._submit(session, url, **kwargs)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def close(self) -> None:
+        """Stop the hedge threads, letting running requests finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+_policy: Optional[HedgePolicy] = None
+
+
+def get_hedge_policy() -> Optional[HedgePolicy]:
+    """Get the hedging policy of the current run, None if hedging is off."""
+    return _policy
+
+
+def set_hedge_policy(policy: Optional[HedgePolicy]) -> None:
+    """Set the hedging policy used by all restaurant fetches."""
+    global _policy
+    if _policy is not None and _policy is not policy:
+        _policy.close()
+    _policy = policy
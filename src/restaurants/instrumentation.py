@@ -0,0 +1,358 @@
+"""
+Per-stage timing instrumentation for the scrape and post pipeline.
+
+Every fetch is broken down into DNS resolution, TCP connect, TLS handshake,
+time to first byte and body download. The scraper adds parse, render and post
+stages. Events can be exported as JSON lines, as a Prometheus textfile
+collector file and as a run summary with p50/p95 durations per stage.
+"""
+
+import os
+import json
+import time
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+_local = threading.local()
+
+CONNECTION_PHASES = ("dns", "connect", "tls")
+
+
+def _connection_timings() -> Optional[dict]:
+    """Get the connection timings of the fetch running in this thread."""
+    return getattr(_local, "timings", None)
+
+
+def carry_timings(func: Callable) -> Callable:
+    """Wrap a function so it reports connection timings to the calling fetch.
+
+    For handing a request of a timed fetch over to another thread.
+    """
+    timings = _connection_timings()
+
+    def wrapper(*args, **kwargs):
+        _local.timings = timings
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.timings = None
+
+    return wrapper
+
+
+def mark_hedged() -> None:
+    """Note that the fetch running in this thread sent a hedged request."""
+    timings = _connection_timings()
+    if timings is not None:
+        timings["hedged"] = True
+
+
+class _TimedConnectionMixin:
+    """Time DNS resolution and TCP connect separately for new connections."""
+
+    def _new_conn(self):
+        timings = _connection_timings()
+        if timings is None:
+            return super()._new_conn()
+
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(
+                self._dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM
+            )
+        except socket.gaierror:
+            # Let urllib3 resolve again and raise its own error
+            return super()._new_conn()
+        resolved = time.perf_counter()
+
+        # Connect to the addresses resolved above so DNS is not looked up
+        # twice, trying each in turn like urllib3 does; the original host is
+        # restored before TLS reads it for SNI.
+        host = self._dns_host
+        error = None
+        try:
+            for address in addresses:
+                self._dns_host = address[4][0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (ConnectTimeoutError, NewConnectionError) as e:
+                    error = e
+            else:
+                raise error
+        finally:
+            self._dns_host = host
+
+        timings["dns"] = timings.get("dns", 0.0) + resolved - start
+        timings["connect"] = timings.get("connect", 0.0) + (
+            time.perf_counter() - resolved
+        )
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        timings = _connection_timings()
+        start = time.perf_counter()
+        super().connect()
+        if timings is not None:
+            socket_time = timings.get("dns", 0.0) + timings.get("connect", 0.0)
+            timings["tls"] = max(0.0, time.perf_counter() - start - socket_time)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedAdapter(HTTPAdapter):
+    """Transport adapter whose new connections report DNS/connect/TLS time."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _prometheus_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Instrumentation:
+    def __init__(self):
+        self.run_id = datetime.now().isoformat(timespec="seconds")
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        restaurant: str,
+        stage: str,
+        duration: float,
+        size: Optional[int] = None,
+        host: Optional[str] = None,
+    ) -> None:
+        """Record the duration (seconds) and optional byte count of a stage."""
+        event = {
+            "run_id": self.run_id,
+            "restaurant": restaurant,
+            "stage": stage,
+            "duration_s": round(duration, 6),
+        }
+        if size is not None:
+            event["bytes"] = size
+        if host is not None:
+            event["host"] = host
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def stage(self, restaurant: str, stage: str) -> Iterator[dict]:
+        """Time a block; set "bytes" in the yielded dict to record a size."""
+        info: dict = {}
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.record(
+                restaurant, stage, time.perf_counter() - start, info.get("bytes")
+            )
+
+    def total(self, restaurant: str, stage: str) -> float:
+        """Total recorded duration of a stage for one restaurant."""
+        with self._lock:
+            return sum(
+                e["duration_s"]
+                for e in self.events
+                if e["restaurant"] == restaurant and e["stage"] == stage
+            )
+
+    @contextmanager
+    def fetch(self, restaurant: str) -> Iterator[dict]:
+        """Time an HTTP fetch; set "response" in the yielded dict when done.
+
+        Records the total fetch time and bytes plus the DNS, connect, TLS,
+        time to first byte and download phases. Connection phases are only
+        present when a new connection had to be opened.
+        """
+        info: dict = {}
+        _local.timings = timings = {}
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            _local.timings = None
+            self._record_fetch(restaurant, time.perf_counter() - start, timings, info)
+
+    def _record_fetch(
+        self, restaurant: str, duration: float, timings: dict, info: dict
+    ) -> None:
+        """Record the phases of a finished fetch.
+
+        The fetch is recorded with its host, as a sample for learning hedge
+        delays, unless it was hedged.
+        """
+        response = info.get("response")
+        size = len(response.content) if response is not None else None
+        host = None
+        if response is not None and not timings.get("hedged"):
+            host = urlparse(response.url).hostname
+        self.record(restaurant, "fetch", duration, size, host=host)
+        for phase in CONNECTION_PHASES:
+            if phase in timings:
+                self.record(restaurant, f"fetch.{phase}", timings[phase])
+        if response is None:
+            return
+
+        headers_received = response.elapsed.total_seconds()
+        setup = sum(timings.get(phase, 0.0) for phase in CONNECTION_PHASES)
+        self.record(restaurant, "fetch.ttfb", max(0.0, headers_received - setup))
+        self.record(
+            restaurant, "fetch.download", max(0.0, duration - headers_received), size
+        )
+
+    @contextmanager
+    def parse(self, restaurant: str) -> Iterator[None]:
+        """Time a scrape and record it as parse time, excluding its fetches."""
+        fetched_before = self.total(restaurant, "fetch")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            fetched = self.total(restaurant, "fetch") - fetched_before
+            duration = time.perf_counter() - start - fetched
+            self.record(restaurant, "parse", max(0.0, duration))
+
+    def summary(self) -> dict:
+        """Summarize p50/p95 durations and byte totals per stage."""
+        stages: Dict[str, dict] = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            stage = stages.setdefault(
+                event["stage"], {"durations": [], "bytes": 0, "count": 0}
+            )
+            stage["durations"].append(event["duration_s"])
+            stage["bytes"] += event.get("bytes", 0)
+            stage["count"] += 1
+
+        return {
+            "run_id": self.run_id,
+            "stages": {
+                name: {
+                    "count": stage["count"],
+                    "p50_s": percentile(stage["durations"], 0.50),
+                    "p95_s": percentile(stage["durations"], 0.95),
+                    "total_s": round(sum(stage["durations"]), 6),
+                    "bytes": stage["bytes"],
+                }
+                for name, stage in sorted(stages.items())
+            },
+        }
+
+    def write_jsonl(self, path: str) -> None:
+        """Append all events to a JSON lines file."""
+        with self._lock:
+            events = list(self.events)
+        with open(path, "a", encoding="utf-8") as jsonl_file:
+            for event in events:
+                jsonl_file.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    def write_summary(self, path: str) -> None:
+        """Write the run summary as JSON."""
+        with open(path, "w", encoding="utf-8") as summary_file:
+            json.dump(self.summary(), summary_file, indent=2, ensure_ascii=False)
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically write a Prometheus textfile collector file."""
+        durations: Dict[tuple, float] = {}
+        sizes: Dict[tuple, int] = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            key = (event["restaurant"], event["stage"])
+            durations[key] = durations.get(key, 0.0) + event["duration_s"]
+            if "bytes" in event:
+                sizes[key] = sizes.get(key, 0) + event["bytes"]
+
+        lines = [
+            "# HELP lunch_menu_stage_duration_seconds Stage duration in the last run.",
+            "# TYPE lunch_menu_stage_duration_seconds gauge",
+        ]
+        lines += [
+            f'lunch_menu_stage_duration_seconds{{restaurant="{_prometheus_label(r)}"'
+            f',stage="{s}"}} {value:.6f}'
+            for (r, s), value in sorted(durations.items())
+        ]
+        lines += [
+            "# HELP lunch_menu_stage_bytes Bytes transferred in the last run.",
+            "# TYPE lunch_menu_stage_bytes gauge",
+        ]
+        lines += [
+            f'lunch_menu_stage_bytes{{restaurant="{_prometheus_label(r)}"'
+            f',stage="{s}"}} {value}'
+            for (r, s), value in sorted(sizes.items())
+        ]
+        lines += [
+            "# HELP lunch_menu_last_run_timestamp_seconds Time of the last run.",
+            "# TYPE lunch_menu_last_run_timestamp_seconds gauge",
+            f"lunch_menu_last_run_timestamp_seconds {time.time():.0f}",
+        ]
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as prom_file:
+            prom_file.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def export(self) -> None:
+        """Write the outputs configured with METRICS_* environment variables."""
+        if os.getenv("METRICS_JSONL"):
+            self.write_jsonl(os.environ["METRICS_JSONL"])
+        if os.getenv("METRICS_PROM_FILE"):
+            self.write_prometheus(os.environ["METRICS_PROM_FILE"])
+        if os.getenv("METRICS_SUMMARY"):
+            self.write_summary(os.environ["METRICS_SUMMARY"])
+
+
+_instrumentation = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Get the instrumentation of the current run."""
+    return _instrumentation
+
+
+def reset_instrumentation() -> Instrumentation:
+    """Start a new run with empty instrumentation."""
+    global _instrumentation
+    _instrumentation = Instrumentation()
+    return _instrumentation
@@ -0,0 +1,43 @@
+"""
+Locales for rendering menus.
+
+Week menus are always keyed by the Finnish day names in base.DAY_NAMES; a
+locale only changes how days, headers and footers are shown, and which
+language is requested from feed providers that serve several languages.
+"""
+
+from typing import Dict
+
+DEFAULT_LOCALE = "fi"
+
+LOCALES: Dict[str, dict] = {
+    "fi": {
+        "day_names": ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai"],
+        "next_week": "{day} (seuraavana viikkona)",
+        "title": "Lounaslista",
+        "footer": "🕐 Päivitetty automaattisesti",
+    },
+    "en": {
+        "day_names": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+        "next_week": "{day} (next week)",
+        "title": "Lunch menu",
+        "footer": "🕐 Updated automatically",
+    },
+}
+
+
+def get_locale(code: str) -> dict:
+    """Get the strings of a locale."""
+    if code not in LOCALES:
+        raise ValueError(
+            f"Unknown locale '{code}', expected one of: {', '.join(LOCALES)}"
+        )
+    return LOCALES[code]
+
+
+def localize_day(day_name: str, locale: str = DEFAULT_LOCALE) -> str:
+    """Translate a Finnish day name into a locale's day name."""
+    finnish = LOCALES[DEFAULT_LOCALE]["day_names"]
+    if day_name not in finnish:
+        return day_name
+    return get_locale(locale)["day_names"][finnish.index(day_name)]
@@ -0,0 +1,182 @@
+"""
+Luncher restaurants.
+API: https://europe-west1-luncher-7cf76.cloudfunctions.net/api/v1/week/
+<restaurant id>/active?language=fi
+
+All Luncher restaurants are fetched through one LuncherProvider, which
+downloads the active week documents concurrently over a shared connection and
+keeps each document until its week ends.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from .base import BaseRestaurant
+from .phrases import load_dictionary
+from .provider import FeedProvider
+
+API_URL = "https://europe-west1-luncher-7cf76.cloudfunctions.net/api/v1/week"
+
+
+def _parse_day(value) -> Optional[date]:
+    """Parse the date part of an ISO date or datetime string."""
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+class LuncherProvider(FeedProvider):
+    def __init__(
+        self,
+        restaurant_ids: Optional[Dict[str, str]] = None,
+        api_url: str = API_URL,
+        **kwargs,
+    ):
+        """Create a provider for restaurants given as {restaurant id: name}."""
+        super().__init__(**kwargs)
+        self.restaurant_ids = dict(restaurant_ids or {})
+        self.api_url = api_url
+
+    def feed_url(self, restaurant_id: str, language: str = "fi") -> str:
+        """Get the active week document URL of a restaurant."""
+        return f"{self.api_url}/{restaurant_id}/active?language={language}"
+
+    def restaurants(self, language: str = "fi") -> List["LuncherRestaurant"]:
+        """Create a restaurant for every configured restaurant id."""
+        return [
+            LuncherRestaurant(name, restaurant_id, provider=self, language=language)
+            for restaurant_id, name in self.restaurant_ids.items()
+        ]
+
+    def _expiry(self, feed: dict) -> Optional[datetime]:
+        """Keep a week document until the end of the week it describes."""
+        week = (feed.get("data") or {}).get("week") or {}
+        last_day = _parse_day(week.get("endDate", ""))
+        if not last_day:
+            days = [_parse_day(day.get("date", "")) for day in week.get("days", [])]
+            last_day = max((d for d in days if d), default=None)
+        if not last_day:
+            # No dates in the document: assume it is the current week
+            today = date.today()
+            last_day = today + timedelta(days=6 - today.weekday())
+        return datetime.combine(last_day + timedelta(days=1), time.min)
+
+
+class LuncherRestaurant(BaseRestaurant):
+    def __init__(
+        self,
+        name: str,
+        restaurant_id: str,
+        provider: Optional[LuncherProvider] = None,
+        language: str = "fi",
+    ):
+        self.provider = provider or LuncherProvider({restaurant_id: name})
+        self.restaurant_id = restaurant_id
+        self.language = language
+        super().__init__(
+            name=name,
+            url=self.provider.feed_url(restaurant_id, language),
+            session=self.provider.session,
+        )
+
+    def get_page_content(self):
+        """Get the week document, cached by the provider until the week ends."""
+        return self.provider.get_feed(self)
+
+    def _is_valid_day(self, day: dict) -> bool:
+        """Check if a day is valid for processing."""
+        return not (day.get("isHidden") or day.get("isClosed"))
+
+    def _get_day_name(self, day: dict) -> str:
+        """Extract and validate day name from day data."""
+        # Week menus are keyed by Finnish day names whatever the language
+        return day.get("dayName", {}).get("fi", "")
+
+    def _localized(self, field: Optional[dict]) -> str:
+        """Get a translated text in the restaurant's language, or Finnish."""
+        field = field or {}
+        return field.get(self.language) or field.get("fi", "")
+
+    def _format_allergens(self, allergens: list) -> str:
+        """Format allergens list into a string."""
+        if not allergens:
+            return ""
+        return (
+            " ("
+            + ", ".join(self._localized(a.get("abbreviation")) for a in allergens)
+            + ")"
+        )
+
+    def _is_boilerplate(self, text: str) -> bool:
+        """Detect common boilerplate/empty descriptions that should be ignored."""
+        if not text:
+            return True
+        # Common boilerplate phrases seen in menus, in dictionaries/luncher.toml
+        return load_dictionary("luncher")["boilerplate"].matches(text)
+
+    def _extract_menu_items(self, day: dict) -> List[str]:
+        """Extract menu items from a day's data."""
+        menu_items = []
+        for lunch in day.get("lunches", []):
+            title = self._localized(lunch.get("title")).strip()
+            if not title:
+                continue
+
+            # Skip items that are purely boilerplate (e.g. "Salaattipöytä")
+            description = self._localized(lunch.get("description"))
+            if self._is_boilerplate(title) and self._is_boilerplate(description):
+                continue
+
+            allergens = self._format_allergens(lunch.get("allergens", []))
+            price = ""
+            if "normalPrice" in lunch and "price" in lunch["normalPrice"]:
+                price = f" {lunch['normalPrice']['price']}€"
+
+            # Clean title from trailing boilerplate fragments (e.g. " - Salaattipöytä")
+            cleaned_title = title
+            for phrase in ["-", "—", ":"]:
+                if phrase in cleaned_title:
+                    parts = [p.strip() for p in cleaned_title.split(phrase)]
+                    # keep leading part if trailing fragment is boilerplate
+                    if len(parts) > 1 and self._is_boilerplate(parts[-1]):
+                        cleaned_title = " ".join(parts[:-1]).strip()
+
+            menu_item = f"{cleaned_title}{allergens}{price}"
+            if menu_item and not menu_item.isspace():
+                menu_items.append(menu_item)
+
+        return menu_items
+
+    def scrape_menu(self) -> Dict[str, List[str]]:
+        """Scrape the lunch menu from the Luncher JSON API."""
+        json_data = self.get_page_content()
+        if not json_data:
+            return {}
+
+        try:
+            # Check JSON structure
+            if not isinstance(json_data, dict) or not json_data.get("success"):
+                logging.warning(f"Unexpected JSON structure from {self.name}")
+                return {}
+
+            week_data = json_data.get("data", {}).get("week", {})
+            days = week_data.get("days", [])
+
+            menu = {}
+            for day in days:
+                if not self._is_valid_day(day):
+                    continue
+                day_name = self._get_day_name(day)
+                if not day_name or day_name in ["Lauantai", "Sunnuntai"]:
+                    continue
+                menu_items = self._extract_menu_items(day)
+                if menu_items:
+                    menu[day_name] = menu_items
+
+            return menu
+
+        except Exception as e:
+            logging.error(f"Error parsing {self.name} menu: {e}")
+            return {}
@@ -0,0 +1,103 @@
+"""
+Peak memory tracking and a memory budget for concurrent scrapes.
+
+Scrapes run concurrently, and each one holds its page and parse tree until it
+has extracted the menu. The peak memory of every scrape is measured with
+tracemalloc. With a budget, a scrape only starts when its expected peak (the
+largest peak of its recent runs) fits next to the scrapes already running,
+so heavy parsers run one after another instead of together. A scrape without
+a recorded peak runs alone, so that its peak is measured exactly.
+"""
+
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+
+class PeakMonitor:
+    """Measures the traced memory peak of possibly overlapping scrapes.
+
+    The peak is only reset when no other scrape is running, so a peak is
+    exact for a scrape that ran alone and an upper bound otherwise. Each
+    block's "exact" tells which of the two it is.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._active: List[dict] = []
+        self._started = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self) -> Iterator[dict]:
+        """Track a block; the yielded dict gets its "peak" in bytes and "exact"."""
+        info: dict = {}
+        if not self.enabled:
+            yield info
+            return
+
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started = True
+            if self._active:
+                # Every block running now includes the other's allocations
+                for other in self._active:
+                    other["exact"] = False
+                info["exact"] = False
+            else:
+                tracemalloc.reset_peak()
+                info["exact"] = True
+            self._active.append(info)
+            baseline = tracemalloc.get_traced_memory()[0]
+        try:
+            yield info
+        finally:
+            with self._lock:
+                info["peak"] = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+                self._active = [block for block in self._active if block is not info]
+
+    def close(self) -> None:
+        """Stop tracing if this monitor started it."""
+        with self._lock:
+            if self._started and not self._active:
+                tracemalloc.stop()
+                self._started = False
+
+
+class MemoryBudget:
+    """Admits scrapes while their expected peaks fit in a byte budget.
+
+    A scrape expected to need more than the whole budget, or without an
+    estimate, runs alone. Without a limit every scrape is admitted at once.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.in_use = 0
+        self.running = 0
+        self._condition = threading.Condition()
+
+    def _fits(self, estimate: int) -> bool:
+        if self.limit is None or self.running == 0:
+            return True
+        return self.in_use + estimate <= self.limit
+
+    @contextmanager
+    def reserve(self, estimate: Optional[int] = None) -> Iterator[None]:
+        """Wait until a scrape of the expected peak fits, and hold its share."""
+        if estimate is None:
+            # Holding the whole budget keeps other scrapes from starting
+            estimate = self.limit or 0
+        with self._condition:
+            self._condition.wait_for(lambda: self._fits(estimate))
+            self.running += 1
+            self.in_use += estimate
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.running -= 1
+                self.in_use -= estimate
+                self._condition.notify_all()
@@ -0,0 +1,123 @@
+"""
+Phrase dictionaries matched in one pass with an Aho-Corasick automaton.
+
+Parsers skip boilerplate and unwanted items by looking for known phrases.
+Rather than trying the phrases one by one, every phrase of a dictionary is
+compiled once into an automaton that finds all of them in a single pass over
+the text, so matching costs the same however many phrases there are.
+
+Dictionaries are TOML files in restaurants/dictionaries/, one per provider.
+Each table is a named dictionary whose keys tell where a phrase must occur:
+
+- start: the text begins with the phrase
+- words: the text is the phrase, or begins with it followed by a space
+- anywhere: the phrase occurs anywhere in the text
+
+Matching ignores case and surrounding whitespace.
+"""
+
+import os
+import tomllib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DICTIONARIES_DIR = os.path.join(os.path.dirname(__file__), "dictionaries")
+
+START = "start"
+WORDS = "words"
+ANYWHERE = "anywhere"
+ANCHORS = (START, WORDS, ANYWHERE)
+
+
+class PhraseMatcher:
+    def __init__(self, phrases: Dict[str, Iterable[str]], source: str = "<phrases>"):
+        """Compile phrases given as {anchor: [phrase, ...]} into an automaton."""
+        # Per state: transitions, failure link and (phrase, anchor) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, str]]] = [[]]
+        self._anywhere = False
+        # Past this position only phrases matching anywhere can still match
+        self._anchored_length = 0
+
+        for anchor, entries in phrases.items():
+            if anchor not in ANCHORS:
+                raise ValueError(f"Invalid phrase dictionary {source}: '{anchor}'")
+            for phrase in entries:
+                self._add(phrase.strip().lower(), anchor)
+        self._link()
+
+    def _add(self, phrase: str, anchor: str) -> None:
+        """Add a phrase to the trie."""
+        if not phrase:
+            return
+        state = 0
+        for char in phrase:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._out[state].append((phrase, anchor))
+        if anchor == ANYWHERE:
+            self._anywhere = True
+        else:
+            self._anchored_length = max(self._anchored_length, len(phrase))
+
+    def _link(self) -> None:
+        """Set the failure links breadth first and merge their outputs."""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[child] = link if link != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+
+    @staticmethod
+    def _accepts(text: str, start: int, end: int, anchor: str) -> bool:
+        """Check whether a phrase found at text[start:end] matches its anchor."""
+        if anchor == ANYWHERE:
+            return True
+        if start:
+            return False
+        return anchor == START or end == len(text) or text[end] == " "
+
+    def find(self, text: str) -> Optional[str]:
+        """Get the first phrase that matches the text, or None."""
+        text = text.strip().lower()
+        state = 0
+        for index, char in enumerate(text):
+            if not self._anywhere and index >= self._anchored_length:
+                return None
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for phrase, anchor in self._out[state]:
+                if self._accepts(text, index + 1 - len(phrase), index + 1, anchor):
+                    return phrase
+        return None
+
+    def matches(self, text: str) -> bool:
+        """Check whether any phrase matches the text."""
+        return bool(text) and self.find(text) is not None
+
+
+def dictionary_path(provider: str) -> str:
+    """Get the dictionary file of a provider, e.g. "luncher"."""
+    return os.path.join(DICTIONARIES_DIR, f"{provider}.toml")
+
+
+@lru_cache(maxsize=None)
+def load_dictionary(provider: str) -> Dict[str, PhraseMatcher]:
+    """Load and compile a provider's dictionaries by name, once per provider."""
+    path = dictionary_path(provider)
+    with open(path, "rb") as dictionary_file:
+        tables = tomllib.load(dictionary_file)
+    return {
+        name: PhraseMatcher(phrases, source=path) for name, phrases in tables.items()
+    }
@@ -6,6 +6,9 @@ Scrapes lunch menu from Raflaamo.fi website.
 import re
 from typing import Dict, List
 from .base import BaseRestaurant
+from .phrases import load_dictionary
+
+PRICE_PATTERN = re.compile(r"^\d+[,.]?\d*\s*€")
 
 
 class PizzaBuffa(BaseRestaurant):
@@ -36,18 +39,10 @@ class PizzaBuffa(BaseRestaurant):
         if len(dish) < 8:
             return False
 
-        # Exclude unwanted items
-        exclude_patterns = [
-            r"^\d+[,.]?\d*\s*€",  # Prices
-            r"^(Buffantai|Lasten|Alle|Lounas:|Pizzavalikoima)",
-            r"(salaatti- ja leipäpöytä|ruokajuomat ja kahvi)",
-        ]
-
-        for pattern in exclude_patterns:
-            if re.search(pattern, dish, re.IGNORECASE):
-                return False
-
-        return True
+        # Exclude prices and the unwanted items of dictionaries/pizza_buffa.toml
+        if PRICE_PATTERN.search(dish):
+            return False
+        return not load_dictionary("pizza_buffa")["exclude"].matches(dish)
 
     def _deduplicate_dishes(self, dishes: List[str]) -> List[str]:
         """Remove duplicate dishes using similarity checking."""
@@ -143,11 +138,11 @@ class PizzaBuffa(BaseRestaurant):
         ]
 
         soup = None
-        for candidate in candidates:
+        for index, candidate in enumerate(candidates):
             try:
-                resp = self.session.get(candidate, timeout=10)
-                resp.raise_for_status()
+                resp = self.fetch(candidate)
                 soup = __import__("bs4").BeautifulSoup(resp.content, "html.parser")
+                self.strategy = f"candidate-{index}"
                 logging.info(f"Fetched {candidate} for {self.name}")
                 break
             except Exception as e:
@@ -160,6 +155,8 @@ class PizzaBuffa(BaseRestaurant):
 
         try:
             full_text = soup.get_text()
+            # Only the text is needed from here on
+            soup.decompose()
             menu = {}
             weekdays = ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai"]
 
@@ -0,0 +1,88 @@
+"""
+Connection pre-warming for restaurant fetches.
+
+A fetch on a cold connection pays for DNS resolution, the TCP handshake and,
+for HTTPS, the TLS handshake. Pre-warming opens keep-alive connections to
+every restaurant host concurrently ahead of the fetches and leaves them in the
+sessions' connection pools, where the fetches pick them up.
+"""
+
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+
+import requests
+
+from .archive import REPLAY
+from .base import upstream_url
+
+PREWARM_TIMEOUT = 5.0
+
+
+def _connection_pool(session: requests.Session, url: str):
+    """Get the urllib3 pool the session would send a request to url from."""
+    adapter = session.get_adapter(url)
+    if getattr(adapter, "mode", None) == REPLAY:
+        return None  # Replayed responses never touch the network
+    # The pool key includes the CA bundle and proxies, resolved like requests do
+    settings = session.merge_environment_settings(url, {}, None, None, None)
+    request = requests.Request("GET", url).prepare()
+    return adapter.get_connection_with_tls_context(
+        request, settings["verify"], settings["proxies"], settings["cert"]
+    )
+
+
+def _warm(pool, count: int) -> int:
+    """Open up to count connections in a pool and return them to it."""
+    connections = []
+    try:
+        for _ in range(min(count, pool.pool.maxsize)):
+            connection = pool._get_conn()
+            connections.append(connection)
+            if not connection.is_connected:
+                connection.timeout = PREWARM_TIMEOUT
+                connection.connect()
+    finally:
+        for connection in connections:
+            pool._put_conn(connection)
+    return len(connections)
+
+
+def prewarm_connections(restaurants: Iterable) -> int:
+    """Open keep-alive connections to the hosts of the restaurants.
+
+    Each host gets as many connections as restaurants fetch from it, so that
+    concurrent feed fetches all find a warm connection. Returns the number of
+    connections opened or reused; hosts that fail are left cold.
+    """
+    pools = {}
+    wanted: Counter = Counter()
+    for restaurant in restaurants:
+        session, url = restaurant.session, restaurant.url
+        if not isinstance(session, requests.Session) or not isinstance(url, str):
+            continue
+        url = upstream_url(url)
+        try:
+            pool = _connection_pool(session, url)
+        except Exception as e:
+            logging.debug(f"Not pre-warming {url}: {e}")
+            continue
+        if pool is not None:
+            pools[id(pool)] = pool
+            wanted[id(pool)] += 1
+
+    def warm(key) -> int:
+        pool = pools[key]
+        try:
+            return _warm(pool, wanted[key])
+        except Exception as e:
+            logging.warning(f"Failed to pre-warm {pool.host}: {e}")
+            return 0
+
+    if not pools:
+        return 0
+    with ThreadPoolExecutor(max_workers=len(pools)) as executor:
+        counts: List[int] = list(executor.map(warm, pools))
+    logging.info(f"Pre-warmed {sum(counts)} connections to {len(pools)} hosts")
+    return sum(counts)
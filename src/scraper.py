@@ -1,18 +1,43 @@
 #!/usr/bin/env python3
 import os
 import sys
+import time
 import logging
-from typing import List
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
 # Import restaurant scrapers
 from restaurants.kahvila_epila import KahvilaEpila
-from restaurants.kontukeittio import KontukeittioNokia
-from restaurants.nokian_kartano import NokianKartano
+from restaurants.compass import CompassGroupProvider
+from restaurants.luncher import LuncherProvider
 from restaurants.pizza_buffa import PizzaBuffa
-from restaurants.stahlberg_kolmenkulma import StahlbergKolmenkulma
+from restaurants.declarative import spec_restaurants
+from restaurants.instrumentation import (
+    get_instrumentation,
+    percentile,
+    reset_instrumentation,
+)
+from restaurants.prewarm import prewarm_connections
+from restaurants.memory import MemoryBudget, PeakMonitor
+from restaurants.hedging import DEFAULT_MAX_HEDGE_RATIO, HedgePolicy, set_hedge_policy
+from restaurants.provider import prefetch_feeds
+from restaurants.base import get_target_day
+from restaurants.locales import DEFAULT_LOCALE
+from restaurants.diets import filter_menu
 
 # Import Telegram bot
-from telegram_bot import TelegramBot
+from telegram import Bot
+from telegram_bot import TelegramBot, prewarm_client
+from sinks import DayMenu, TelegramSink, dispatch_sync, load_sinks
+from channels import channel_locales, load_channels, view_key
+from history import MenuHistory
+from subscriptions import SubscriptionStore
+from performance import PerformanceHistory
+from static_export import StaticExporter
+from publish_schedule import DUE, EARLY, PublishTracker
+from delivery_log import DeliveryLog
 
 
 def setup_logging():
@@ -24,72 +49,724 @@ def setup_logging():
     )
 
 
+# Compass Group restaurants, one line each: cost number -> display name
+COMPASS_RESTAURANTS = {
+    "3443": "Nokian Kartano (FoodCo)",
+}
+
+# Luncher restaurants, one line each: restaurant id -> display name
+LUNCHER_RESTAURANTS = {
+    "1baa89be-11dc-4447-abb3-bbaef16cc6d1": "Kontukeittiö Nokia",
+}
+
+# Declarative HTML restaurants: spec names in src/restaurants/specs/. Specs in
+# the MENU_SPECS_DIR directory are added automatically.
+HTML_RESTAURANT_SPECS = ["stahlberg_kolmenkulma"]
+
+# Seconds before a --post-at time to start and pre-warm connections
+DEFAULT_PREWARM_LEAD = 15.0
+
+# Fewest fetch duration samples a host's hedge delay is learned from
+MIN_HEDGE_SAMPLES = 10
+
+# Restaurants scraped at the same time within a memory budget; without a
+# budget or SCRAPE_WORKERS they are scraped one at a time
+SCRAPE_WORKERS = 4
+
+
+def get_localized_restaurants(locales: List[str]) -> Dict[str, list]:
+    """Get the restaurant scrapers of each locale.
+
+    Feed providers serve every language from its own URL, so their restaurants
+    are created per locale on one shared provider. HTML pages come in a single
+    language and their scrapers are shared by all locales.
+    """
+    compass = CompassGroupProvider(COMPASS_RESTAURANTS)
+    luncher = LuncherProvider(LUNCHER_RESTAURANTS)
+    kahvila_epila = KahvilaEpila()
+    pizza_buffa = PizzaBuffa()
+    html_restaurants = spec_restaurants(HTML_RESTAURANT_SPECS)
+    return {
+        locale: [
+            kahvila_epila,
+            *luncher.restaurants(locale),
+            *compass.restaurants(locale),
+            pizza_buffa,
+            *html_restaurants,
+        ]
+        for locale in locales
+    }
+
+
 def get_restaurants():
     """Get list of restaurant scrapers."""
-    return [
-        KahvilaEpila(),
-        KontukeittioNokia(),
-        NokianKartano(),
-        PizzaBuffa(),
-        StahlbergKolmenkulma(),
-    ]
+    return get_localized_restaurants([DEFAULT_LOCALE])[DEFAULT_LOCALE]
 
 
-def scrape_all_menus(restaurants) -> List[str]:
-    """Scrape menus from all restaurants and return formatted strings."""
+def _scrape_menu(restaurant):
+    """Scrape one restaurant's week menu, None if its scraper failed."""
+    try:
+        logging.info(f"Scraping menu from {restaurant.name}")
+        with get_instrumentation().parse(restaurant.name):
+            menu = restaurant.scrape_menu()
+        logging.info(f"Successfully scraped {restaurant.name}")
+        return menu
+    except Exception as e:
+        logging.error(f"Failed to scrape {restaurant.name}: {e}")
+        return None
+
+
+def _scrape_one(restaurant, budget: MemoryBudget, monitor: PeakMonitor, estimate):
+    """Scrape a restaurant once it fits in the memory budget, tracking its peak."""
+    with budget.reserve(estimate), monitor.track() as memory:
+        start = time.perf_counter()
+        menu = _scrape_menu(restaurant)
+    if "peak" not in memory:
+        return menu
+    if memory["exact"]:
+        # Only the peak of a scrape that ran alone is its own
+        get_instrumentation().record(
+            restaurant.name,
+            "peak_memory",
+            time.perf_counter() - start,
+            memory["peak"],
+        )
+        logging.info(f"{restaurant.name} peaked at {memory['peak'] / 1024:.0f} KiB")
+    else:
+        logging.info(
+            f"{restaurant.name} peaked at most at {memory['peak'] / 1024:.0f} KiB "
+            "next to other scrapes"
+        )
+    return menu
+
+
+def _scrape_each(restaurants) -> list:
+    """Scrape the week menu of each restaurant, None for failed ones.
+
+    Restaurants are scraped concurrently within the memory budget if one is
+    configured, and one at a time otherwise unless SCRAPE_WORKERS is set.
+    """
+    # Fetch the feeds of provider-backed restaurants concurrently up front
+    prefetch_feeds(restaurants)
+    if not restaurants:
+        return []
+
+    budget, monitor = load_memory_budget()
+    estimates = learn_peak_estimates(restaurants) if budget.limit else {}
+    workers = min(scrape_workers(budget), len(restaurants))
+    try:
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            return list(
+                executor.map(
+                    lambda r: _scrape_one(
+                        r,
+                        budget,
+                        monitor,
+                        estimates.get(r.name),
+                    ),
+                    restaurants,
+                )
+            )
+    finally:
+        monitor.close()
+
+
+def scrape_week_menus(restaurants) -> Dict[str, Dict[str, List[str]]]:
+    """Scrape week menus from all restaurants, keyed by restaurant name.
+
+    A restaurant whose scraper raised an exception is mapped to None.
+    """
+    return {
+        restaurant.name: menu
+        for restaurant, menu in zip(restaurants, _scrape_each(restaurants))
+    }
+
+
+def scrape_localized_menus(restaurants_by_locale) -> Dict[str, dict]:
+    """Scrape the week menus of every locale, keyed by locale and name.
+
+    All languages are fetched in one concurrent batch and scrapers shared by
+    several locales are scraped only once.
+    """
+    unique = list(
+        {
+            id(restaurant): restaurant
+            for restaurants in restaurants_by_locale.values()
+            for restaurant in restaurants
+        }.values()
+    )
+    menus = dict(zip(map(id, unique), _scrape_each(unique)))
+    return {
+        locale: {restaurant.name: menus[id(restaurant)] for restaurant in restaurants}
+        for locale, restaurants in restaurants_by_locale.items()
+    }
+
+
+def format_current_day_menus(
+    restaurants, week_menus, locale: str = DEFAULT_LOCALE
+) -> List[str]:
+    """Format the current day's menu of each restaurant."""
     formatted_menus = []
 
     for restaurant in restaurants:
-        try:
-            logging.info(f"Scraping menu from {restaurant.name}")
-            formatted_menu = restaurant.get_current_day_menu()
-            formatted_menus.append(formatted_menu)
-            logging.info(f"Successfully scraped {restaurant.name}")
-        except Exception as e:
-            logging.error(f"Failed to scrape {restaurant.name}: {e}")
-            # Add error message to maintain consistent output
-            formatted_menus.append(f"❌ {restaurant.name}: Error scraping menu")
+        menu = week_menus.get(restaurant.name)
+        with get_instrumentation().stage(restaurant.name, "render") as timing:
+            if menu is None:
+                # Add error message to maintain consistent output
+                formatted = f"❌ {restaurant.name}: Error scraping menu"
+            else:
+                formatted = restaurant.format_current_day_menu(menu, locale)
+            timing["bytes"] = len(formatted.encode("utf-8"))
+        formatted_menus.append(formatted)
 
     return formatted_menus
 
 
-def main():
-    """Main function to orchestrate the scraping and posting process."""
-    setup_logging()
+def render_locale_menus(
+    restaurants_by_locale, menus_by_locale, locale: str, cache: dict
+) -> List[str]:
+    """Format a locale's current day menus once per (locale, day)."""
+    key = (locale, get_target_day())
+    if key not in cache:
+        cache[key] = format_current_day_menus(
+            restaurants_by_locale[locale], menus_by_locale[locale], locale
+        )
+    return cache[key]
 
-    # Check environment variables
-    if not os.getenv("TELEGRAM_BOT_TOKEN"):
-        logging.error("TELEGRAM_BOT_TOKEN environment variable is required")
-        return False
 
-    if not os.getenv("TELEGRAM_CHANNEL_ID"):
-        logging.error("TELEGRAM_CHANNEL_ID environment variable is required")
-        return False
+def render_channel_menus(
+    channel, restaurants_by_locale, menus_by_locale, cache: dict
+) -> List[str]:
+    """Format the current day menus of a channel's view, once per view.
+
+    Channels without diet filters pick their restaurants from the locale's
+    render; filtered views are formatted from the filtered week menus.
+    """
+    key = (view_key(channel), get_target_day())
+    if key in cache:
+        return cache[key]
+
+    locale = channel["locale"]
+    restaurants = restaurants_by_locale[locale]
+    names = channel.get("restaurants")
+    if names:
+        by_name = {restaurant.name: restaurant for restaurant in restaurants}
+        for name in names:
+            if name not in by_name:
+                logging.warning(
+                    f"Unknown restaurant '{name}' for {channel['channel_id']}"
+                )
+        restaurants = [by_name[name] for name in names if name in by_name]
+
+    diets = channel.get("diets")
+    if diets:
+        week_menus = {
+            restaurant.name: filter_menu(
+                menus_by_locale[locale][restaurant.name], diets
+            )
+            for restaurant in restaurants
+        }
+        formatted = format_current_day_menus(restaurants, week_menus, locale)
+    else:
+        locale_menus = render_locale_menus(
+            restaurants_by_locale, menus_by_locale, locale, cache
+        )
+        by_name = dict(
+            zip((r.name for r in restaurants_by_locale[locale]), locale_menus)
+        )
+        formatted = [by_name[restaurant.name] for restaurant in restaurants]
+
+    cache[key] = formatted
+    return formatted
+
+
+def build_deliveries(
+    channels, restaurants_by_locale, menus_by_locale, client=None, renders=None
+) -> list:
+    """Render the message parts of every channel, once per distinct view.
+
+    All channels share one Telegram client, the given one if any. Renders of
+    earlier runs are reused from the delivery log given as renders.
+    """
+    menus_cache = {}
+    parts_by_view = {}
+    deliveries = []
+    for channel in channels:
+        bot = TelegramBot(channel["channel_id"], channel["locale"], bot=client)
+        client = bot.bot
+        key = view_key(channel)
+        if key not in parts_by_view:
+            formatted_menus = render_channel_menus(
+                channel, restaurants_by_locale, menus_by_locale, menus_cache
+            )
+            parts_by_view[key] = bot.render_current_day_messages(
+                formatted_menus, renders
+            )
+        deliveries.append((bot, parts_by_view[key]))
+    logging.info(f"Rendered {len(parts_by_view)} views for {len(channels)} channels")
+    return deliveries
+
+
+def scrape_all_menus(restaurants) -> List[str]:
+    """Scrape menus from all restaurants and return formatted strings."""
+    return format_current_day_menus(restaurants, scrape_week_menus(restaurants))
+
+
+def record_history(week_menus) -> None:
+    """Append scraped menus to the history database if one is configured."""
+    history_path = os.getenv("MENU_HISTORY_DB")
+    if not history_path:
+        return
+
+    try:
+        history = MenuHistory(history_path)
+        try:
+            stored = history.record_week_menus(week_menus)
+        finally:
+            history.close()
+        logging.info(f"Stored {stored} new dishes in menu history")
+    except Exception as e:
+        # History is best effort and must never block posting
+        logging.error(f"Failed to record menu history: {e}")
+
+
+def record_performance(restaurants, week_menus, instrumentation) -> None:
+    """Store per-restaurant scrape statistics if a database is configured."""
+    perf_path = os.getenv("PERF_HISTORY_DB")
+    if not perf_path:
+        return
+
+    try:
+        history = PerformanceHistory(perf_path)
+        try:
+            history.record_run(restaurants, week_menus, instrumentation)
+        finally:
+            history.close()
+    except Exception as e:
+        logging.error(f"Failed to record scrape performance: {e}")
+
+
+def export_static_site(week_menus, locale: str, instrumentation) -> None:
+    """Write the static menu bundle if an export directory is configured."""
+    export_dir = os.getenv("MENU_EXPORT_DIR")
+    if not export_dir:
+        return
+
+    try:
+        exporter = StaticExporter(
+            export_dir, locale, os.getenv("MENU_EXPORT_BASE_URL", "")
+        )
+        with instrumentation.stage("static", "export") as info:
+            info["bytes"] = exporter.export(week_menus)["bytes"]
+    except Exception as e:
+        # The export is best effort and must never block posting
+        logging.error(f"Failed to export static menus: {e}")
+
+
+def scrape_workers(budget: MemoryBudget) -> int:
+    """Get the number of restaurants to scrape at the same time."""
+    configured = os.getenv("SCRAPE_WORKERS")
+    if configured:
+        return int(configured)
+    return SCRAPE_WORKERS if budget.limit else 1
+
+
+def load_memory_budget() -> Tuple[MemoryBudget, PeakMonitor]:
+    """Get the scrape memory budget and peak monitor from the environment.
+
+    SCRAPE_MEMORY_BUDGET_MB bounds the expected peak memory of concurrent
+    scrapes; peaks are tracked with tracemalloc when a budget is set or
+    TRACK_SCRAPE_MEMORY is on.
+    """
+    budget_mb = os.getenv("SCRAPE_MEMORY_BUDGET_MB")
+    limit = int(float(budget_mb) * 1024 * 1024) if budget_mb else None
+    tracking = os.getenv("TRACK_SCRAPE_MEMORY", "").lower() in ("1", "true", "yes")
+    return MemoryBudget(limit), PeakMonitor(enabled=tracking or limit is not None)
+
+
+def learn_peak_estimates(restaurants) -> Dict[str, int]:
+    """Get the largest recent peak memory of each restaurant's scrapes."""
+    perf_path = os.getenv("PERF_HISTORY_DB")
+    if not perf_path:
+        return {}
+
+    try:
+        history = PerformanceHistory(perf_path)
+    except Exception as e:
+        logging.error(f"Failed to read scrape memory peaks: {e}")
+        return {}
+    try:
+        estimates = {}
+        for restaurant in restaurants:
+            peaks = history.peak_memory(restaurant.name)
+            if peaks:
+                estimates[restaurant.name] = max(peaks)
+        return estimates
+    finally:
+        history.close()
+
+
+def learn_hedge_delays(hosts: List[str]) -> Dict[str, float]:
+    """Get the p95 fetch duration of hosts from the performance history."""
+    perf_path = os.getenv("PERF_HISTORY_DB")
+    if not perf_path:
+        logging.warning("Learning hedge delays needs PERF_HISTORY_DB")
+        return {}
 
     try:
-        # Get restaurant scrapers
-        restaurants = get_restaurants()
-        logging.info(f"Initialized {len(restaurants)} restaurant scrapers")
+        history = PerformanceHistory(perf_path)
+    except Exception as e:
+        logging.error(f"Failed to read hedge delays: {e}")
+        return {}
+    try:
+        delays = {}
+        for host in hosts:
+            samples = history.host_fetch_times(host)
+            if len(samples) < MIN_HEDGE_SAMPLES:
+                logging.info(f"Not hedging {host} yet, {len(samples)} fetch samples")
+                continue
+            delays[host] = percentile(samples, 0.95)
+        return delays
+    except Exception as e:
+        logging.error(f"Failed to read hedge delays: {e}")
+        return {}
+    finally:
+        history.close()
 
-        # Scrape all menus
-        formatted_menus = scrape_all_menus(restaurants)
-        logging.info(f"Scraped {len(formatted_menus)} menus")
 
-        # Post to Telegram
-        telegram_bot = TelegramBot()
-        success = telegram_bot.post_current_day_menus_sync(formatted_menus)
+def parse_hedge_hosts(configured: str) -> Tuple[Dict[str, float], List[str]]:
+    """Split HEDGE_HOSTS into fixed delays and hosts whose delay is learned.
 
-        if success:
-            logging.info("Successfully posted all current day menus to Telegram")
+    Invalid entries are logged and skipped, so the others still apply.
+    """
+    delays: Dict[str, float] = {}
+    learned = []
+    for entry in configured.split(","):
+        host, _, seconds = entry.strip().partition("=")
+        if not host:
+            continue
+        if not seconds:
+            learned.append(host)
+            continue
+        try:
+            delay = float(seconds)
+        except ValueError:
+            delay = 0.0
+        if delay > 0:
+            delays[host] = delay
         else:
-            logging.error("Failed to post some current day menus to Telegram")
+            logging.warning(f"Ignoring invalid HEDGE_HOSTS entry '{entry.strip()}'")
+    return delays, learned
+
+
+def _hedge_max_ratio() -> float:
+    """Get HEDGE_MAX_RATIO, or the default if it is unset or invalid."""
+    configured = os.getenv("HEDGE_MAX_RATIO")
+    if not configured:
+        return DEFAULT_MAX_HEDGE_RATIO
+    try:
+        return float(configured)
+    except ValueError:
+        logging.warning(f"Ignoring invalid HEDGE_MAX_RATIO '{configured}'")
+        return DEFAULT_MAX_HEDGE_RATIO
+
+
+def configure_hedging() -> None:
+    """Turn on request hedging for the hosts listed in HEDGE_HOSTS.
+
+    Entries are hosts, hedged after their historical p95 fetch duration,
+    or host=seconds for a fixed hedge delay. Hedging is an optimization, so
+    any problem with it is logged and the run goes on without it.
+    """
+    configured = os.getenv("HEDGE_HOSTS")
+    if not configured:
+        set_hedge_policy(None)
+        return
+
+    try:
+        delays, learned = parse_hedge_hosts(configured)
+        delays.update(learn_hedge_delays(learned) if learned else {})
+        set_hedge_policy(HedgePolicy(delays, max_ratio=_hedge_max_ratio()))
+    except Exception as e:
+        logging.error(f"Failed to configure hedging, running without it: {e}")
+        set_hedge_policy(None)
+        return
+    for host, delay in delays.items():
+        logging.info(f"Hedging requests to {host} after {delay:.2f} s")
+
+
+def load_subscriber_channels() -> list:
+    """Get the chats subscribed to the daily menu as delivery channels."""
+    subscriptions_path = os.getenv("SUBSCRIPTIONS_DB")
+    if not subscriptions_path:
+        return []
+
+    try:
+        subscriptions = SubscriptionStore(subscriptions_path)
+        try:
+            return subscriptions.channels()
+        finally:
+            subscriptions.close()
+    except Exception as e:
+        # Subscribers must never block posting to the configured channels
+        logging.error(f"Failed to load subscriptions: {e}")
+        return []
+
+
+def export_metrics(instrumentation) -> None:
+    """Write the run's stage timings to the configured metrics outputs."""
+    try:
+        instrumentation.export()
+    except OSError as e:
+        logging.error(f"Failed to export metrics: {e}")
+
+
+def load_outputs():
+    """Get the Telegram channels and the other sinks to deliver to."""
+    sinks = load_sinks()
+    channels = load_channels() + load_subscriber_channels()
+    if (channels or not sinks) and not os.getenv("TELEGRAM_BOT_TOKEN"):
+        raise ValueError("TELEGRAM_BOT_TOKEN environment variable is required")
+    if not channels and not sinks:
+        raise ValueError("TELEGRAM_CHANNEL_ID environment variable is required")
+    return channels, sinks
+
+
+def open_publish_tracker() -> Optional[PublishTracker]:
+    """Open the publish schedule database if one is configured."""
+    tracker_path = os.getenv("PUBLISH_SCHEDULE_DB")
+    if not tracker_path:
+        return None
+    try:
+        return PublishTracker(tracker_path)
+    except Exception as e:
+        # The database comes from a cache; a bad copy must not stop the run
+        logging.error(f"Failed to open publish schedules, not using them: {e}")
+        return None
+
+
+def open_delivery_log() -> Optional[DeliveryLog]:
+    """Open the log of delivered Telegram messages if one is configured."""
+    log_path = os.getenv("DELIVERY_LOG_DB")
+    if not log_path:
+        return None
+    log = None
+    try:
+        log = DeliveryLog(log_path)
+        log.prune(datetime.now().date())
+        return log
+    except Exception as e:
+        # The database comes from a cache; a bad copy must not stop the run
+        logging.error(f"Failed to open delivery log, posting without it: {e}")
+        if log:
+            log.close()
+        return None
+
+
+def plan_fetches(tracker, restaurants, scheduled: bool) -> Optional[set]:
+    """Get the restaurants a run should not fetch yet, None if nothing is due.
+
+    Only scheduled runs follow the learned schedules: they scrape when the
+    day's menu has not been posted yet or when a restaurant whose week menu
+    is still missing is due to be polled, and skip restaurants that are not
+    expected to have published yet.
+    """
+    if not scheduled or tracker is None:
+        return set()
+    plan = tracker.plan(restaurant.name for restaurant in restaurants)
+    if tracker.posted() and DUE not in plan.values():
+        return None
+    skipped = {name for name, decision in plan.items() if decision == EARLY}
+    if skipped:
+        logging.info(f"Not fetching before their publish time: {', '.join(skipped)}")
+    return skipped
 
-        return success
+
+def scrape_planned_menus(restaurants_by_locale, skipped: set) -> Dict[str, dict]:
+    """Scrape all but the skipped restaurants, which get an empty menu."""
+    menus_by_locale = scrape_localized_menus(
+        {
+            locale: [r for r in restaurants if r.name not in skipped]
+            for locale, restaurants in restaurants_by_locale.items()
+        }
+    )
+    return {
+        locale: {r.name: menus_by_locale[locale].get(r.name, {}) for r in restaurants}
+        for locale, restaurants in restaurants_by_locale.items()
+    }
+
+
+def deliver(
+    channels,
+    sinks,
+    restaurants_by_locale,
+    menus_by_locale,
+    locale,
+    client=None,
+    delivery_log=None,
+) -> bool:
+    """Deliver the current day menus to every channel and sink concurrently."""
+    # Render each distinct channel view once; Telegram is one of the sinks
+    if channels:
+        deliveries = build_deliveries(
+            channels, restaurants_by_locale, menus_by_locale, client, delivery_log
+        )
+        sinks = [TelegramSink(deliveries, log=delivery_log)] + sinks
+    day_menu = DayMenu.from_week_menus(menus_by_locale[locale], locale)
+    results = dispatch_sync(sinks, day_menu)
+    success = all(results)
+
+    if success:
+        logging.info(f"Successfully delivered current day menus to {len(sinks)} sinks")
+    else:
+        failed = [sink.name for sink, ok in zip(sinks, results) if not ok]
+        logging.error(f"Failed to deliver current day menus to: {', '.join(failed)}")
+    return success
+
+
+def post_time(value: str) -> datetime:
+    """Parse a HH:MM post time as today's datetime."""
+    try:
+        moment = datetime.strptime(value, "%H:%M").time()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time '{value}', use HH:MM")
+    return datetime.combine(datetime.now().date(), moment)
+
+
+def wait_until(moment: datetime) -> None:
+    """Sleep until a moment, returning at once if it has passed."""
+    remaining = (moment - datetime.now()).total_seconds()
+    if remaining > 0:
+        logging.info(f"Waiting {remaining:.0f} s until {moment:%H:%M:%S}")
+        time.sleep(remaining)
+
+
+def prewarm(restaurants, channels) -> Optional[Bot]:
+    """Open connections to every restaurant host and to Telegram in parallel.
+
+    Returns the Telegram client holding the warm connection, for posting.
+    """
+    with get_instrumentation().stage("run", "prewarm"):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            warming = executor.submit(prewarm_connections, restaurants)
+            client = prewarm_client() if channels else None
+            warming.result()
+    return client
+
+
+def run(args, channels, sinks, tracker, instrumentation, delivery_log=None) -> bool:
+    """Scrape the menus and deliver them; True if nothing failed."""
+    if args.post_at:
+        wait_until(args.post_at - timedelta(seconds=args.prewarm_lead))
+
+    # Get restaurant scrapers for every locale a channel uses
+    locales = channel_locales(channels) or [DEFAULT_LOCALE]
+    restaurants_by_locale = get_localized_restaurants(locales)
+    restaurants = restaurants_by_locale[locales[0]]
+    logging.info(
+        f"Initialized {len(restaurants)} restaurant scrapers "
+        f"for locales: {', '.join(locales)}"
+    )
+
+    skipped = plan_fetches(tracker, restaurants, args.scheduled)
+    if skipped is None:
+        logging.info("Menu already posted and no restaurant is due, nothing to do")
+        return True
+
+    to_fetch = {
+        id(r): r
+        for rs in restaurants_by_locale.values()
+        for r in rs
+        if r.name not in skipped
+    }
+    client = prewarm(to_fetch.values(), channels)
+    if args.post_at:
+        wait_until(args.post_at)
+
+    # Scrape all menus; history and statistics follow the first locale
+    menus_by_locale = scrape_planned_menus(restaurants_by_locale, skipped)
+    week_menus = menus_by_locale[locales[0]]
+    fetched = [r for r in restaurants if r.name not in skipped]
+    record_history(week_menus)
+    record_performance(fetched, week_menus, instrumentation)
+    export_static_site(week_menus, locales[0], instrumentation)
+
+    if tracker:
+        published = tracker.record_fetches(
+            {r.name: week_menus[r.name] for r in fetched}
+        )
+        if published:
+            logging.info(f"New week menus published: {', '.join(published)}")
+        if args.scheduled and tracker.posted() and not published:
+            logging.info("No new menus since the last post, not posting")
+            return True
+
+    success = deliver(
+        channels,
+        sinks,
+        restaurants_by_locale,
+        menus_by_locale,
+        locales[0],
+        client,
+        delivery_log,
+    )
+    if success and tracker:
+        tracker.mark_posted()
+    if args.post_at:
+        elapsed = (datetime.now() - args.post_at).total_seconds()
+        instrumentation.record("run", "time_to_post", elapsed)
+        logging.info(f"Posted {elapsed:.2f} s after the scheduled time")
+    return success
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to orchestrate the scraping and posting process."""
+    parser = argparse.ArgumentParser(description="Scrape and post lunch menus")
+    parser.add_argument(
+        "--scheduled",
+        action="store_true",
+        help="Follow the learned publish schedules (needs PUBLISH_SCHEDULE_DB)",
+    )
+    parser.add_argument(
+        "--post-at",
+        type=post_time,
+        help="Pre-warm connections ahead of this time (HH:MM) and post then",
+    )
+    parser.add_argument(
+        "--prewarm-lead",
+        type=float,
+        default=DEFAULT_PREWARM_LEAD,
+        help="Seconds before --post-at to start",
+    )
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    try:
+        channels, sinks = load_outputs()
+    except ValueError as e:
+        logging.error(f"Invalid delivery configuration: {e}")
+        return False
+
+    instrumentation = reset_instrumentation()
+    tracker = open_publish_tracker()
+    delivery_log = open_delivery_log()
+
+    try:
+        configure_hedging()
+        return run(args, channels, sinks, tracker, instrumentation, delivery_log)
 
     except Exception as e:
         logging.error(f"Unexpected error in main: {e}")
         return False
 
+    finally:
+        if tracker:
+            tracker.close()
+        if delivery_log:
+            delivery_log.close()
+        set_hedge_policy(None)
+        export_metrics(instrumentation)
+
 
 if __name__ == "__main__":
     success = main()
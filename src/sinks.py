@@ -0,0 +1,350 @@
+"""
+Output sinks the daily menu is delivered to.
+
+Telegram is one sink among webhooks (Slack, Teams or plain JSON), SMTP email
+and files. Each sink renders its payload once from the structured day menu
+and all sinks are dispatched concurrently with their own timeout, so a slow
+or failing sink never delays or breaks the others.
+"""
+
+import os
+import json
+import asyncio
+import logging
+import smtplib
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from email.message import EmailMessage
+from functools import cached_property
+from html import escape as html_escape
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from delivery_log import DeliveryLog
+from restaurants.base import get_target_date, get_target_day
+from restaurants.instrumentation import get_instrumentation
+from restaurants.locales import DEFAULT_LOCALE, get_locale, localize_day
+from static_export import write_atomic
+from telegram_bot import TelegramBot, broadcast
+
+DEFAULT_SINK_TIMEOUT = 30.0
+DEFAULT_TELEGRAM_TIMEOUT = 120.0
+
+
+class DayMenu:
+    """The current day's menu of every restaurant, shared by all sinks.
+
+    Each restaurant maps to its items of the day, an empty list when it has
+    no menu that day and None when scraping it failed.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        day_date: date,
+        restaurants: List[Tuple[str, Optional[List[str]]]],
+        locale: str = DEFAULT_LOCALE,
+    ):
+        self.title = title
+        self.date = day_date
+        self.restaurants = restaurants
+        self.locale = locale
+
+    @classmethod
+    def from_week_menus(
+        cls, week_menus, locale: str = DEFAULT_LOCALE, now: Optional[datetime] = None
+    ) -> "DayMenu":
+        """Pick the target day's menus out of the week menus."""
+        now = now or datetime.now()
+        strings = get_locale(locale)
+        day = get_target_day(now)
+        target_date = get_target_date(now)
+        day_label = localize_day(day, locale)
+        if target_date != now.date():  # Weekend
+            day_label = strings["next_week"].format(day=day_label)
+        restaurants = [
+            (name, None if menu is None else menu.get(day, []))
+            for name, menu in week_menus.items()
+        ]
+        return cls(
+            f"{strings['title']} - {day_label}", target_date, restaurants, locale
+        )
+
+    def _status(self, items: Optional[List[str]]) -> str:
+        return "Error scraping menu" if items is None else "No menu available"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the menu as a JSON-serializable dict."""
+        return {
+            "title": self.title,
+            "date": self.date.isoformat(),
+            "locale": self.locale,
+            "restaurants": [
+                {"name": name, "available": items is not None, "items": items or []}
+                for name, items in self.restaurants
+            ],
+        }
+
+    @cached_property
+    def text(self) -> str:
+        """Plain text rendering, also valid Slack and Teams markdown."""
+        lines = [self.title, self.date.strftime("%d.%m.%Y"), ""]
+        for name, items in self.restaurants:
+            if not items:
+                lines += [f"{name}: {self._status(items)}", ""]
+                continue
+            lines.append(name)
+            lines += [f"• {item}" for item in items]
+            lines.append("")
+        return "\n".join(lines).rstrip() + "\n"
+
+    @cached_property
+    def html(self) -> str:
+        """HTML rendering for email."""
+        parts = [
+            f"<h1>{html_escape(self.title)}</h1>",
+            f"<p>{self.date.strftime('%d.%m.%Y')}</p>",
+        ]
+        for name, items in self.restaurants:
+            parts.append(f"<h2>{html_escape(name)}</h2>")
+            if items:
+                rows = "".join(f"<li>{html_escape(item)}</li>" for item in items)
+                parts.append(f"<ul>{rows}</ul>")
+            else:
+                parts.append(f"<p>{self._status(items)}</p>")
+        return "\n".join(parts)
+
+
+class Sink(ABC):
+    """Base class of output sinks.
+
+    render builds the payload from the day menu; send delivers it and raises
+    on failure. Blocking I/O in send belongs in asyncio.to_thread.
+    """
+
+    name = "sink"
+
+    def __init__(self, timeout: float = DEFAULT_SINK_TIMEOUT):
+        self.timeout = timeout
+
+    @abstractmethod
+    def render(self, day_menu: DayMenu) -> Any:
+        """Build the payload to send from the day menu."""
+        pass
+
+    @abstractmethod
+    async def send(self, payload: Any) -> None:
+        """Deliver a rendered payload, raising on failure."""
+        pass
+
+
+class TelegramSink(Sink):
+    """Posts channel views already rendered by scraper.build_deliveries."""
+
+    name = "telegram"
+
+    def __init__(
+        self,
+        deliveries: List[Tuple[TelegramBot, List[str]]],
+        timeout: float = DEFAULT_TELEGRAM_TIMEOUT,
+        log: Optional[DeliveryLog] = None,
+    ):
+        super().__init__(timeout)
+        self.deliveries = deliveries
+        # Skips channels already up to date with the day's menu
+        self.log = log
+        self.day: Optional[date] = None
+
+    def render(self, day_menu: DayMenu):
+        self.day = day_menu.date
+        return self.deliveries
+
+    async def send(self, deliveries) -> None:
+        results = await broadcast(deliveries, self.log, self.day)
+        failed = [bot.channel_id for (bot, _), ok in zip(deliveries, results) if not ok]
+        if failed:
+            raise RuntimeError(f"failed to post to {', '.join(map(str, failed))}")
+
+
+def webhook_format(url: str) -> str:
+    """Guess the payload format of a webhook from its host."""
+    host = urlparse(url).hostname or ""
+    if host == "hooks.slack.com":
+        return "slack"
+    if host.endswith("webhook.office.com") or host == "outlook.office.com":
+        return "teams"
+    return "json"
+
+
+class WebhookSink(Sink):
+    """Posts the menu as JSON: Slack and Teams messages or the raw menu."""
+
+    def __init__(
+        self,
+        url: str,
+        payload_format: Optional[str] = None,
+        timeout: float = DEFAULT_SINK_TIMEOUT,
+    ):
+        super().__init__(timeout)
+        self.url = url
+        self.payload_format = payload_format or webhook_format(url)
+        self.name = f"webhook:{urlparse(url).hostname}"
+
+    def render(self, day_menu: DayMenu) -> dict:
+        if self.payload_format == "slack":
+            return {"text": day_menu.text}
+        if self.payload_format == "teams":
+            return {
+                "@type": "MessageCard",
+                "@context": "https://schema.org/extensions",
+                "summary": day_menu.title,
+                "title": day_menu.title,
+                "text": day_menu.text.replace("\n", "\n\n"),
+            }
+        return day_menu.to_dict()
+
+    def _post(self, payload: dict) -> None:
+        response = requests.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+
+    async def send(self, payload: dict) -> None:
+        await asyncio.to_thread(self._post, payload)
+
+
+class EmailSink(Sink):
+    """Sends the menu as a plain text and HTML email over SMTP."""
+
+    name = "email"
+
+    def __init__(
+        self,
+        host: str,
+        sender: str,
+        recipients: List[str],
+        port: int = 25,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        timeout: float = DEFAULT_SINK_TIMEOUT,
+    ):
+        super().__init__(timeout)
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+
+    def render(self, day_menu: DayMenu) -> EmailMessage:
+        message = EmailMessage()
+        message["Subject"] = day_menu.title
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        message.set_content(day_menu.text)
+        message.add_alternative(day_menu.html, subtype="html")
+        return message
+
+    def _send(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(message)
+
+    async def send(self, message: EmailMessage) -> None:
+        await asyncio.to_thread(self._send, message)
+
+
+class FileSink(Sink):
+    """Writes the menu to a file: JSON for *.json paths, plain text otherwise."""
+
+    def __init__(self, path: str, timeout: float = DEFAULT_SINK_TIMEOUT):
+        super().__init__(timeout)
+        self.path = os.path.abspath(path)
+        self.name = f"file:{os.path.basename(path)}"
+
+    def render(self, day_menu: DayMenu) -> bytes:
+        if self.path.endswith(".json"):
+            text = json.dumps(day_menu.to_dict(), ensure_ascii=False, indent=2)
+        else:
+            text = day_menu.text
+        return text.encode("utf-8")
+
+    async def send(self, content: bytes) -> None:
+        await asyncio.to_thread(write_atomic, self.path, content)
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def load_sinks() -> List[Sink]:
+    """Get the sinks besides Telegram configured in the environment."""
+    timeout = float(os.getenv("MENU_SINK_TIMEOUT") or DEFAULT_SINK_TIMEOUT)
+    sinks: List[Sink] = [
+        WebhookSink(url, timeout=timeout)
+        for url in _split(os.getenv("MENU_WEBHOOK_URLS"))
+    ]
+
+    smtp_host = os.getenv("MENU_SMTP_HOST")
+    if smtp_host:
+        recipients = _split(os.getenv("MENU_EMAIL_TO"))
+        sender = os.getenv("MENU_EMAIL_FROM")
+        if not recipients or not sender:
+            raise ValueError("MENU_EMAIL_FROM and MENU_EMAIL_TO are required for email")
+        sinks.append(
+            EmailSink(
+                smtp_host,
+                sender,
+                recipients,
+                port=int(os.getenv("MENU_SMTP_PORT") or 25),
+                username=os.getenv("MENU_SMTP_USER"),
+                password=os.getenv("MENU_SMTP_PASSWORD"),
+                starttls=os.getenv("MENU_SMTP_STARTTLS", "").lower() == "true",
+                timeout=timeout,
+            )
+        )
+
+    sinks += [
+        FileSink(path, timeout=timeout)
+        for path in _split(os.getenv("MENU_OUTPUT_FILES"))
+    ]
+    return sinks
+
+
+async def dispatch(sinks: List[Sink], day_menu: DayMenu) -> List[bool]:
+    """Render and send to every sink concurrently, each within its timeout.
+
+    The result tells for each sink whether it delivered successfully.
+    """
+
+    async def deliver(sink: Sink) -> bool:
+        try:
+            with get_instrumentation().stage(sink.name, "post"):
+                payload = sink.render(day_menu)
+                await asyncio.wait_for(sink.send(payload), sink.timeout)
+        except asyncio.TimeoutError:
+            logging.error(f"Sink {sink.name} timed out after {sink.timeout:g} s")
+            return False
+        except Exception as e:
+            logging.error(f"Sink {sink.name} failed: {e}")
+            return False
+        logging.info(f"Delivered menu to {sink.name}")
+        return True
+
+    return list(await asyncio.gather(*(deliver(sink) for sink in sinks)))
+
+
+def dispatch_sync(sinks: List[Sink], day_menu: DayMenu) -> List[bool]:
+    """Synchronous wrapper for dispatch."""
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(dispatch(sinks, day_menu))
@@ -0,0 +1,196 @@
+"""
+Static export of the week menus for any static host.
+
+After each scrape the views the HTTP API serves (week.json, per-day and
+per-restaurant JSON and HTML) are written to a directory together with an
+Atom feed (feed.xml) and index.html with today's menus. The export is
+incremental: a manifest of content hashes is kept next to the files and only
+files whose content changed are rewritten, so unchanged files keep their
+modification time and never need to be re-uploaded or purged from a CDN.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from datetime import datetime, timezone
+from html import escape as html_escape
+from typing import Dict, Optional
+from xml.sax.saxutils import escape as xml_escape
+
+from http_api import build_routes
+from restaurants.base import DAY_NAMES, get_day_date, get_target_day
+from restaurants.locales import DEFAULT_LOCALE, get_locale, localize_day
+
+MANIFEST_NAME = ".manifest.json"
+
+# Exported files get the mode open() would give them; reading the umask sets
+# it, so it is read once at import rather than from concurrent writers
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+ATOM_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="{lang}">
+<id>{id}</id>
+<title>{title}</title>
+<updated>{updated}</updated>
+<link rel="self" href="{link}"/>
+{entries}</feed>
+"""
+
+ENTRY_TEMPLATE = """<entry>
+<id>{id}</id>
+<title>{title}</title>
+<updated>{updated}</updated>
+<link rel="alternate" type="text/html" href="{link}"/>
+<content type="html">{content}</content>
+</entry>
+"""
+
+
+def content_hash(content: bytes) -> str:
+    """Hash file content for change detection."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def write_atomic(path: str, content: bytes) -> None:
+    """Write a file so readers never see it half written."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp_path, FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class StaticExporter:
+    def __init__(self, out_dir: str, locale: str = DEFAULT_LOCALE, base_url: str = ""):
+        self.out_dir = out_dir
+        self.locale = locale
+        self.strings = get_locale(locale)
+        self.base_url = base_url.rstrip("/")
+        self.manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+
+    def _load_manifest(self) -> bytes:
+        try:
+            with open(self.manifest_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return b""
+
+    def _day_content(self, week_menus, day: str) -> str:
+        """Render one day of every restaurant as feed entry HTML."""
+        sections = []
+        for name, menu in week_menus.items():
+            items = (menu or {}).get(day)
+            if items:
+                rows = "".join(f"<li>{html_escape(item)}</li>" for item in items)
+                sections.append(f"<h2>{html_escape(name)}</h2><ul>{rows}</ul>")
+        return "".join(sections)
+
+    def render_feed(self, week_menus, manifest: dict, now: datetime) -> bytes:
+        """
+        Render the Atom feed with one entry per day that has menus.
+
+        An entry's updated time changes only when its content does, tracked
+        through the content hashes stored in the manifest.
+        """
+        now_iso = now.astimezone(timezone.utc).isoformat(timespec="seconds")
+        previous = manifest.get("entries", {})
+        entries: Dict[str, dict] = {}
+        rendered = []
+        for day in DAY_NAMES:
+            content = self._day_content(week_menus, day)
+            if not content:
+                continue
+            day_date = get_day_date(day, now)
+            entry_id = f"urn:lunch-menu:{self.locale}:{day_date.isoformat()}"
+            digest = content_hash(content.encode("utf-8"))
+            known = previous.get(entry_id, {})
+            updated = known["updated"] if known.get("hash") == digest else now_iso
+            entries[entry_id] = {"hash": digest, "updated": updated}
+            rendered.append(
+                ENTRY_TEMPLATE.format(
+                    id=entry_id,
+                    title=xml_escape(
+                        f"{localize_day(day, self.locale)} {day_date.isoformat()}"
+                    ),
+                    updated=updated,
+                    link=xml_escape(f"{self.base_url}/day/{day.lower()}.html"),
+                    content=xml_escape(content),
+                )
+            )
+
+        feed_updated = max(
+            (entry["updated"] for entry in entries.values()),
+            default=manifest.get("feed_updated") or now_iso,
+        )
+        manifest["entries"] = entries
+        manifest["feed_updated"] = feed_updated
+        feed = ATOM_TEMPLATE.format(
+            lang=self.locale,
+            id=f"urn:lunch-menu:{self.locale}",
+            title=xml_escape(self.strings["title"]),
+            updated=feed_updated,
+            link=xml_escape(f"{self.base_url}/feed.xml"),
+            entries="".join(rendered),
+        )
+        return feed.encode("utf-8")
+
+    def render(
+        self, week_menus, manifest: dict, now: Optional[datetime] = None
+    ) -> Dict[str, bytes]:
+        """Render every file of the bundle, keyed by relative path."""
+        now = now or datetime.now()
+        routes = build_routes(week_menus, self.locale)
+        files = {path.lstrip("/"): body[0] for path, body in routes.items()}
+        files["index.html"] = files[f"day/{get_target_day(now).lower()}.html"]
+        files["feed.xml"] = self.render_feed(week_menus, manifest, now)
+        return files
+
+    def export(self, week_menus, now: Optional[datetime] = None) -> dict:
+        """Write the changed files of the bundle and remove stale ones."""
+        old_manifest = self._load_manifest()
+        try:
+            manifest = json.loads(old_manifest) if old_manifest else {}
+        except ValueError:
+            manifest = {}
+        old_hashes: Dict[str, str] = manifest.get("files", {})
+        files = self.render(week_menus, manifest, now)
+
+        stats = {"written": 0, "unchanged": 0, "removed": 0, "bytes": 0}
+        hashes = {}
+        for path, content in files.items():
+            digest = content_hash(content)
+            hashes[path] = digest
+            full_path = os.path.join(self.out_dir, path)
+            if old_hashes.get(path) == digest and os.path.exists(full_path):
+                stats["unchanged"] += 1
+                continue
+            write_atomic(full_path, content)
+            stats["written"] += 1
+            stats["bytes"] += len(content)
+
+        for path in set(old_hashes) - set(hashes):
+            try:
+                os.remove(os.path.join(self.out_dir, path))
+                stats["removed"] += 1
+            except FileNotFoundError:
+                pass
+
+        manifest["files"] = hashes
+        new_manifest = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        if new_manifest != old_manifest:
+            write_atomic(self.manifest_path, new_manifest)
+        logging.info(
+            f"Exported static menus to {self.out_dir}: {stats['written']} written, "
+            f"{stats['unchanged']} unchanged, {stats['removed']} removed"
+        )
+        return stats
@@ -0,0 +1,103 @@
+"""
+Dietary filter subscriptions of Telegram chats.
+
+Users subscribe through the interactive bot (/subscribe vegan gluten-free).
+Each subscribed chat gets the daily menu with its filters applied, and is
+delivered to like a channel: chats with the same filters share one render.
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from typing import FrozenSet, Iterable, List, Optional, Set
+
+from restaurants.diets import parse_filters
+from restaurants.locales import DEFAULT_LOCALE, get_locale
+
+DEFAULT_DB_PATH = "subscriptions.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscriptions (
+    chat_id TEXT PRIMARY KEY,
+    filters TEXT NOT NULL,
+    locale TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def _decode(filters: str) -> FrozenSet[str]:
+    """Turn a stored comma-separated flag list into a flag set."""
+    return frozenset(flag for flag in filters.split(",") if flag)
+
+
+class SubscriptionStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("SUBSCRIPTIONS_DB", DEFAULT_DB_PATH)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def subscribe(
+        self, chat_id, filters: Iterable[str], locale: str = DEFAULT_LOCALE
+    ) -> FrozenSet[str]:
+        """Subscribe a chat to the daily menu with diet filters."""
+        flags = parse_filters(filters)
+        get_locale(locale)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO subscriptions "
+                "(chat_id, filters, locale, updated_at) VALUES (?, ?, ?, ?)",
+                (
+                    str(chat_id),
+                    ",".join(sorted(flags)),
+                    locale,
+                    datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+        return flags
+
+    def unsubscribe(self, chat_id) -> bool:
+        """Remove a chat's subscription; False if it had none."""
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM subscriptions WHERE chat_id = ?", (str(chat_id),)
+            )
+        return cursor.rowcount > 0
+
+    def get(self, chat_id) -> Optional[FrozenSet[str]]:
+        """Get the filters of a subscribed chat, None if not subscribed."""
+        row = self.conn.execute(
+            "SELECT filters FROM subscriptions WHERE chat_id = ?", (str(chat_id),)
+        ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def all(self) -> List[dict]:
+        """Get every subscription as {chat_id, locale, filters}."""
+        rows = self.conn.execute(
+            "SELECT chat_id, locale, filters FROM subscriptions ORDER BY chat_id"
+        ).fetchall()
+        return [
+            {"chat_id": chat_id, "locale": locale, "filters": _decode(filters)}
+            for chat_id, locale, filters in rows
+        ]
+
+    def filter_sets(self) -> Set[FrozenSet[str]]:
+        """Get the distinct filter sets subscribed to."""
+        return {subscription["filters"] for subscription in self.all()}
+
+    def channels(self) -> List[dict]:
+        """Get the subscribed chats as delivery channels."""
+        channels = []
+        for subscription in self.all():
+            channel = {
+                "channel_id": subscription["chat_id"],
+                "locale": subscription["locale"],
+            }
+            if subscription["filters"]:
+                channel["diets"] = sorted(subscription["filters"])
+            channels.append(channel)
+        return channels
@@ -5,15 +5,43 @@ Telegram bot integration for posting lunch menus.
 import os
 import logging
 import asyncio
-from typing import List
+import json
+import hashlib
+import warnings
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Tuple
 from html import escape as html_escape
 from telegram import Bot, error
 
+from delivery_log import DeliveredPart, DeliveryLog, part_digest, unchanged
+from restaurants.base import get_target_date, get_target_day
+from restaurants.locales import DEFAULT_LOCALE, get_locale, localize_day
+
+# Bump when the message layout changes, so that no stale render is reused
+TEMPLATE_VERSION = 1
+
+# Flood control (HTTP 429) waits per Bot API call, and the longest wait
+FLOOD_RETRIES = 3
+MAX_RETRY_AFTER = 60
+
+
+def render_key(kind: str, *inputs: str) -> str:
+    """Digest the inputs of a render together with the template version."""
+    content = json.dumps([kind, TEMPLATE_VERSION, *inputs], ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
 
 class TelegramBot:
-    def __init__(self):
+    def __init__(
+        self,
+        channel_id: Optional[str] = None,
+        locale: str = DEFAULT_LOCALE,
+        bot: Optional[Bot] = None,
+    ):
         self.bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
-        self.channel_id = os.getenv("TELEGRAM_CHANNEL_ID")
+        self.channel_id = channel_id or os.getenv("TELEGRAM_CHANNEL_ID")
+        self.locale = locale
+        self.strings = get_locale(locale)
 
         if not self.bot_token:
             raise ValueError("TELEGRAM_BOT_TOKEN environment variable is required")
@@ -21,20 +49,18 @@ class TelegramBot:
         if not self.channel_id:
             raise ValueError("TELEGRAM_CHANNEL_ID environment variable is required")
 
-        self.bot = Bot(token=self.bot_token)
+        # Bots of several channels can share one python-telegram-bot client
+        self.bot = bot or create_client(self.bot_token)
 
     def _get_target_day(self) -> str:
         """Get the target day name for the menu header."""
-        from datetime import datetime
-
         current_date = datetime.now()
-        weekday = current_date.weekday()
-        day_names = ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai"]
+        day_name = localize_day(get_target_day(current_date), self.locale)
 
-        if weekday >= 5:  # Weekend
-            return "Maanantai (seuraavana viikkona)"
+        if get_target_date(current_date) != current_date.date():  # Weekend
+            return self.strings["next_week"].format(day=day_name)
         else:
-            return day_names[weekday]
+            return day_name
 
     def _clean_restaurant_name(self, restaurant_line: str) -> str:
         """Clean and format restaurant name from menu line."""
@@ -71,46 +97,131 @@ class TelegramBot:
         else:
             return f"{html_escape(menu)}\n\n"
 
+    def _render_header(self) -> str:
+        title = f"{self.strings['title']} - {self._get_target_day()}"
+        return (
+            f"🍽️ <b>{html_escape(title)}</b>\n"
+            f"📅 {datetime.now().strftime('%d.%m.%Y')}\n" + "=" * 40 + "\n\n"
+        )
+
+    def _render_footer(self) -> str:
+        return "=" * 40 + "\n" + html_escape(self.strings["footer"])
+
     def format_combined_menu_message(self, menus: List[str]) -> str:
         """Format all restaurant menus into a single, well-formatted HTML message."""
         if not menus:
             return html_escape("❌ No menus available today")
 
-        from datetime import datetime
-
-        target_day = self._get_target_day()
-        current_date = datetime.now()
-
-        # Create the header
-        message = f"🍽️ <b>{html_escape('Lounaslista - ' + target_day)}</b>\n"
-        message += f"📅 {current_date.strftime('%d.%m.%Y')}\n"
-        message += "=" * 40 + "\n\n"
-
-        # Add each restaurant's menu
-        for menu in menus:
-            message += self._format_single_menu(menu)
-
-        # Add footer
-        message += "=" * 40 + "\n"
-        message += html_escape("🕐 Päivitetty automaattisesti")
+        fragments = [self._format_single_menu(menu) for menu in menus]
+        return self._render_header() + "".join(fragments) + self._render_footer()
+
+    async def _call(self, method: str, **kwargs):
+        """Call a Bot API method, waiting out flood control a few times."""
+        for attempt in range(FLOOD_RETRIES + 1):
+            try:
+                return await getattr(self.bot, method)(**kwargs)
+            except error.RetryAfter as e:
+                delay = retry_delay(e)
+                if attempt == FLOOD_RETRIES or delay > MAX_RETRY_AFTER:
+                    raise
+                logging.warning(
+                    f"Flood control on {self.channel_id}, retrying in {delay:.0f} s"
+                )
+                await asyncio.sleep(delay)
 
-        return message
+    async def send_part(self, message: str) -> Optional[int]:
+        """Post a message to the channel and return its message id, None on error."""
+        try:
+            sent = await self._call(
+                "send_message", chat_id=self.channel_id, text=message, parse_mode="HTML"
+            )
+            logging.info("Successfully posted message to Telegram channel")
+            return getattr(sent, "message_id", None) or 0
+        except error.TelegramError as e:
+            logging.error(f"Telegram API error: {e}")
+            return None
+        except Exception as e:
+            logging.error(f"Unexpected error posting to Telegram: {e}")
+            return None
 
     async def post_message(self, message: str) -> bool:
         """Post a message to the configured Telegram channel."""
+        return await self.send_part(message) is not None
+
+    async def edit_message(self, message_id: int, message: str) -> bool:
+        """Replace the text of a message posted earlier."""
         try:
-            await self.bot.send_message(
-                chat_id=self.channel_id, text=message, parse_mode="HTML"
+            await self._call(
+                "edit_message_text",
+                text=message,
+                chat_id=self.channel_id,
+                message_id=message_id,
+                parse_mode="HTML",
             )
-            logging.info("Successfully posted message to Telegram channel")
             return True
-        except error.TelegramError as e:
-            logging.error(f"Telegram API error: {e}")
+        except error.BadRequest as e:
+            if "not modified" in str(e).lower():
+                return True
+            logging.warning(f"Could not edit message {message_id}: {e}")
             return False
         except Exception as e:
-            logging.error(f"Unexpected error posting to Telegram: {e}")
+            logging.warning(f"Could not edit message {message_id}: {e}")
+            return False
+
+    async def delete_message(self, message_id: int) -> bool:
+        """Delete a message posted earlier."""
+        try:
+            await self._call(
+                "delete_message", chat_id=self.channel_id, message_id=message_id
+            )
+            return True
+        except Exception as e:
+            logging.warning(f"Could not delete message {message_id}: {e}")
             return False
 
+    async def _update_part(
+        self, message: str, message_id: Optional[int]
+    ) -> Optional[int]:
+        """Edit a changed part in place, posting it anew if it cannot be edited."""
+        if message_id and await self.edit_message(message_id, message):
+            logging.info(f"Updated message {message_id} in {self.channel_id}")
+            return message_id
+        return await self.send_part(message)
+
+    async def update_message_parts(
+        self,
+        message_parts: List[str],
+        delivered: List[DeliveredPart],
+        on_change: Optional[Callable[[List[DeliveredPart]], None]] = None,
+    ) -> Tuple[bool, List[DeliveredPart]]:
+        """Bring the parts delivered earlier up to date with message_parts.
+
+        Unchanged parts are left alone, changed ones edited and missing ones
+        posted; parts no longer needed are deleted. Returns whether all parts
+        are up to date and the parts now delivered. on_change gets the parts
+        delivered so far after every post or edit, so they are known even if
+        the update is cancelled before it completes.
+        """
+        now_delivered: List[DeliveredPart] = []
+        for i, part in enumerate(message_parts):
+            digest = part_digest(part)
+            previous = delivered[i] if i < len(delivered) else (None, None)
+            if previous[0] == digest:
+                now_delivered.append(previous)
+                continue
+            message_id = await self._update_part(part, previous[1])
+            if message_id is None:
+                # Keep what is still posted so the next run can fix it up
+                return False, now_delivered + delivered[i:]
+            now_delivered.append((digest, message_id))
+            if on_change:
+                on_change(now_delivered + delivered[i + 1 :])
+
+        for _, message_id in delivered[len(message_parts) :]:
+            if message_id:
+                await self.delete_message(message_id)
+        return True, now_delivered
+
     def post_message_sync(self, message: str) -> bool:
         """Synchronous wrapper for post_message."""
         try:
@@ -121,26 +232,29 @@ class TelegramBot:
 
         return loop.run_until_complete(self.post_message(message))
 
-    def _find_break_point(self, text: str, max_length: int) -> int:
+    @staticmethod
+    def _find_break_point(text: str, max_length: int) -> int:
         """Find optimal break point for splitting text."""
         break_point = max_length
         while break_point > 0 and text[break_point] != " ":
             break_point -= 1
         return max_length if break_point == 0 else break_point
 
-    def _split_long_line(self, line: str, max_length: int) -> List[str]:
+    @staticmethod
+    def _split_long_line(line: str, max_length: int) -> List[str]:
         """Split a single long line into multiple parts."""
         parts = []
         remaining = line
         while len(remaining) > max_length:
-            break_point = self._find_break_point(remaining, max_length)
+            break_point = TelegramBot._find_break_point(remaining, max_length)
             parts.append(remaining[:break_point].rstrip())
             remaining = remaining[break_point:].lstrip()
         if remaining.strip():
             parts.append(remaining)
         return parts
 
-    def split_message(self, message: str, max_length: int = 4000) -> List[str]:
+    @staticmethod
+    def split_message(message: str, max_length: int = 4000) -> List[str]:
         """Split a long message into smaller chunks that fit Telegram's limits."""
         if len(message) <= max_length:
             return [message]
@@ -160,7 +274,9 @@ class TelegramBot:
 
             # Handle very long single lines
             if len(current_part) > max_length:
-                line_parts = self._split_long_line(current_part.rstrip(), max_length)
+                line_parts = TelegramBot._split_long_line(
+                    current_part.rstrip(), max_length
+                )
                 parts.extend(line_parts[:-1])
                 current_part = line_parts[-1] + "\n" if line_parts else ""
 
@@ -169,6 +285,55 @@ class TelegramBot:
 
         return parts
 
+    def _render_fragment(self, menu: str, renders: DeliveryLog) -> str:
+        """Format a restaurant's menu, reusing the render of an earlier run."""
+        key = render_key("fragment", menu)
+        fragment = renders.render(key)
+        if fragment is None:
+            fragment = self._format_single_menu(menu)
+            renders.store_render(key, fragment, get_target_date())
+        return fragment
+
+    def render_current_day_messages(
+        self, menus: List[str], renders: Optional[DeliveryLog] = None
+    ) -> List[str]:
+        """Format the current day's menus into message parts ready to post.
+
+        With a delivery log, the message parts and each restaurant's fragment
+        are kept between runs, keyed by the menus, the header (locale, day
+        and date) and the template version. When one restaurant's menu
+        changed, only its fragment is rendered again before the message is
+        reassembled and split.
+        """
+        if not menus:
+            return []
+        if renders is None:
+            return self.split_message(self.format_combined_menu_message(menus))
+
+        header, footer = self._render_header(), self._render_footer()
+        key = render_key("message", header, footer, *menus)
+        stored = renders.render(key)
+        if stored is not None:
+            return json.loads(stored)
+        fragments = [self._render_fragment(menu, renders) for menu in menus]
+        parts = self.split_message(header + "".join(fragments) + footer)
+        renders.store_render(key, json.dumps(parts), get_target_date())
+        return parts
+
+    async def post_message_parts(self, message_parts: List[str]) -> bool:
+        """Post already rendered message parts in order."""
+        all_success = True
+        for i, part in enumerate(message_parts):
+            success = await self.post_message(part)
+            if success:
+                logging.info(
+                    f"Successfully posted message part {i+1}/{len(message_parts)}"
+                )
+            else:
+                logging.error(f"Failed to post message part {i+1}/{len(message_parts)}")
+                all_success = False
+        return all_success
+
     async def post_current_day_menus(self, menus: List[str]) -> bool:
         """Post current day's lunch menus, splitting into multiple messages."""
         if not menus:
@@ -176,25 +341,10 @@ class TelegramBot:
             return True
 
         try:
-            # Format all menus into one message
-            combined_message = self.format_combined_menu_message(menus)
-
-            # Split message if it's too long
-            message_parts = self.split_message(combined_message)
-
-            # Post all message parts
-            all_success = True
-            for i, part in enumerate(message_parts):
-                success = await self.post_message(part)
-                if success:
-                    logging.info(
-                        f"Successfully posted message part {i+1}/{len(message_parts)}"
-                    )
-                else:
-                    logging.error(
-                        f"Failed to post message part {i+1}/{len(message_parts)}"
-                    )
-                    all_success = False
+            # Format all menus into one message, split if it's too long
+            message_parts = self.render_current_day_messages(menus)
+
+            all_success = await self.post_message_parts(message_parts)
 
             if all_success:
                 logging.info(
@@ -219,3 +369,108 @@ class TelegramBot:
             asyncio.set_event_loop(loop)
 
         return loop.run_until_complete(self.post_current_day_menus(menus))
+
+
+def create_client(token: Optional[str] = None) -> Bot:
+    """Create a Telegram client, talking to TELEGRAM_API_URL if it is set."""
+    token = token or os.getenv("TELEGRAM_BOT_TOKEN")
+    api_url = os.getenv("TELEGRAM_API_URL")
+    if not api_url:
+        return Bot(token=token)
+    api_url = api_url.rstrip("/")
+    return Bot(
+        token=token, base_url=f"{api_url}/bot", base_file_url=f"{api_url}/file/bot"
+    )
+
+
+def retry_delay(exc: error.RetryAfter) -> float:
+    """Seconds to wait after a flood control error."""
+    with warnings.catch_warnings():
+        # Reading an int retry_after warns that it becomes a timedelta
+        warnings.simplefilter("ignore", DeprecationWarning)
+        delay = exc.retry_after
+    return delay.total_seconds() if isinstance(delay, timedelta) else float(delay)
+
+
+def prewarm_client(token: Optional[str] = None) -> Bot:
+    """Create a Telegram client and connect it to the API ahead of posting.
+
+    initialize() calls getMe, which resolves DNS and opens the keep-alive
+    connection that posting on the same event loop reuses.
+    """
+    client = create_client(token)
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    try:
+        loop.run_until_complete(client.initialize())
+    except Exception as e:
+        logging.warning(f"Failed to pre-warm the Telegram connection: {e}")
+    return client
+
+
+async def broadcast(
+    deliveries: List[Tuple[TelegramBot, List[str]]],
+    log: Optional[DeliveryLog] = None,
+    day: Optional[date] = None,
+) -> List[bool]:
+    """Post rendered message parts to several channels concurrently.
+
+    Each delivery is a (bot, message parts) pair; the result tells for each
+    delivery whether all of its parts were posted. With a delivery log,
+    channels that already have the parts for the day are skipped and changed
+    parts replace the ones posted earlier.
+    """
+    day = day or get_target_date(datetime.now())
+
+    async def post(bot: TelegramBot, message_parts: List[str]) -> bool:
+        if log is None:
+            return await bot.post_message_parts(message_parts)
+        delivered = log.delivered(bot.channel_id, day)
+        if unchanged(message_parts, delivered):
+            logging.info(f"Menu for {bot.channel_id} unchanged, not posting")
+            return True
+        # Each post is logged as soon as it returns: a sink timeout cancels
+        # the remaining posts, but never forgets the ones already made
+        success, delivered = await bot.update_message_parts(
+            message_parts,
+            delivered,
+            lambda parts: log.record(bot.channel_id, day, parts),
+        )
+        log.record(bot.channel_id, day, delivered)
+        return success
+
+    async def deliver(bot: TelegramBot, message_parts: List[str]) -> bool:
+        if not message_parts:
+            logging.warning(f"No menus to post to {bot.channel_id}")
+            return True
+        try:
+            success = await post(bot, message_parts)
+        except Exception as e:
+            logging.error(f"Error posting to {bot.channel_id}: {e}")
+            return False
+        if success:
+            logging.info(
+                f"Delivered {len(message_parts)} message parts to {bot.channel_id}"
+            )
+        return success
+
+    return list(await asyncio.gather(*(deliver(*d) for d in deliveries)))
+
+
+def broadcast_sync(
+    deliveries: List[Tuple[TelegramBot, List[str]]],
+    log: Optional[DeliveryLog] = None,
+    day: Optional[date] = None,
+) -> List[bool]:
+    """Synchronous wrapper for broadcast."""
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(broadcast(deliveries, log, day))
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for restaurant sites and the Telegram Bot API.
+
+FakeUpstream serves synthetic or recorded restaurant pages and JSON feeds with
+configurable latency, errors and size; the scraper is pointed at it with
+MENU_UPSTREAM_URL, which makes every fetch of https://host/path a request for
+/host/path on the fake server. FakeTelegram implements the Bot API methods
+the bots use (getMe, sendMessage, editMessageText, deleteMessage), including
+429 flood control answers, and is pointed at with TELEGRAM_API_URL.
+
+Run this file to start both servers with many synthetic restaurants for
+load-testing scraper.main by hand:
+
+    uv run tests/fakes.py --restaurants 300 --channels 20 --latency 0.05
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from restaurants.archive import ResponseArchive
+
+WEEKDAYS = ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai"]
+
+SPEC_TEMPLATE = """name = "{name}"
+url = "{url}"
+
+[days]
+headings = ["h2"]
+
+[days.names]
+maanantai = "Maanantai"
+tiistai = "Tiistai"
+keskiviikko = "Keskiviikko"
+torstai = "Torstai"
+perjantai = "Perjantai"
+
+[items]
+mode = "siblings"
+selector = "p"
+"""
+
+
+def synthetic_menu_html(name: str, dishes_per_day: int = 3, padding: int = 0) -> bytes:
+    """A restaurant page with a week of dishes, padded to grow its size."""
+    lines = [f"<html><body><h1>{name}</h1>"]
+    for day in WEEKDAYS:
+        lines.append(f"<h2>{day}</h2>")
+        lines += [f"<p>{name} {day} dish {i + 1} (L, G)</p>" for i in range(dishes_per_day)]
+    lines.append(f"<!-- {'x' * padding} --></body></html>")
+    return "\n".join(lines).encode("utf-8")
+
+
+class Page:
+    def __init__(self, body: bytes, content_type: str, status: int = 200,
+                 latency: Optional[float] = None):
+        self.body = body
+        self.content_type = content_type
+        self.status = status
+        self.latency = latency
+
+
+class _FakeServer:
+    """A threaded HTTP server on a free local port, run in the background."""
+
+    def __init__(self, handler):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.fake = self
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        fake = self.server.fake
+        page = fake.page(self.path)
+        time.sleep(page.latency if page.latency is not None else fake.latency)
+        self.send_response(page.status)
+        self.send_header("Content-Type", page.content_type)
+        self.send_header("Content-Length", str(len(page.body)))
+        self.end_headers()
+        self.wfile.write(page.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeUpstream(_FakeServer):
+    """Serves restaurant pages and feeds under /host/path."""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(UpstreamHandler)
+        self.latency = latency
+        self.pages: Dict[str, Page] = {}
+        self.requests: Counter = Counter()
+
+    @staticmethod
+    def path_of(url: str) -> str:
+        """The path the upstream URL override turns a URL into."""
+        parts = urlsplit(url)
+        path = f"/{parts.netloc}{parts.path or '/'}"
+        return f"{path}?{parts.query}" if parts.query else path
+
+    def add_page(self, url: str, body: bytes,
+                 content_type: str = "text/html; charset=utf-8", **kwargs) -> None:
+        """Serve a body for an upstream URL; kwargs are status and latency."""
+        self.pages[self.path_of(url)] = Page(body, content_type, **kwargs)
+
+    def add_json(self, url: str, data, **kwargs) -> None:
+        self.add_page(url, json.dumps(data).encode("utf-8"), "application/json", **kwargs)
+
+    def add_recorded(self, archive_dir: str) -> int:
+        """Serve the latest recorded response of every URL in an archive."""
+        archive = ResponseArchive(archive_dir)
+        latest = {record["url"]: record for record in archive.records()}
+        for url, record in latest.items():
+            body = archive.load_body(record["digest"])
+            content_type = record["headers"].get("Content-Type", "text/html")
+            self.add_page(url, body, content_type, status=record["status"])
+        return len(latest)
+
+    def page(self, path: str) -> Page:
+        with self.lock:
+            self.requests[path] += 1
+        return self.pages.get(path) or Page(b"Not found", "text/plain", status=404)
+
+    def add_restaurants(self, spec_dir: str, count: int, dishes_per_day: int = 3,
+                        padding: int = 0, failing: int = 0) -> List[str]:
+        """Write specs of synthetic restaurants served from here.
+
+        The first failing restaurants answer with HTTP 500. Returns the
+        restaurant names in order.
+        """
+        names = []
+        for i in range(count):
+            name = f"Fake Restaurant {i:03d}"
+            url = f"http://restaurant-{i:03d}.test/lounas/"
+            with open(os.path.join(spec_dir, f"fake_{i:03d}.toml"), "w", encoding="utf-8") as spec:
+                spec.write(SPEC_TEMPLATE.format(name=name, url=url))
+            self.add_page(url, synthetic_menu_html(name, dishes_per_day, padding),
+                          status=500 if i < failing else 200)
+            names.append(name)
+        return names
+
+
+class TelegramHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        fake = self.server.fake
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8")
+        method = self.path.rsplit("/", 1)[-1]
+        status, answer = fake.call(method, fake.parameters(body, self.headers))
+        payload = json.dumps(answer).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeTelegram(_FakeServer):
+    """Implements the Bot API methods the bots call, keeping sent messages."""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(TelegramHandler)
+        self.latency = latency
+        self.calls: Counter = Counter()
+        # Chat -> message id -> text
+        self.messages: Dict[str, Dict[int, str]] = {}
+        self.flood_limited = 0
+        self.next_message_id = 1
+        self._throttled = 0
+        self._retry_after = 1
+
+    def throttle(self, count: int, retry_after: int = 1) -> None:
+        """Answer the next count calls with 429 Too Many Requests."""
+        self._throttled = count
+        self._retry_after = retry_after
+
+    @staticmethod
+    def parameters(body: str, headers) -> dict:
+        """Decode form or JSON parameters; form values may be JSON encoded."""
+        if "json" in (headers.get("Content-Type") or ""):
+            return json.loads(body or "{}")
+        params = {}
+        for key, values in parse_qs(body).items():
+            try:
+                params[key] = json.loads(values[0])
+            except ValueError:
+                params[key] = values[0]
+        return params
+
+    def texts(self, chat_id: str) -> List[str]:
+        """The texts of a chat's messages, in the order they were posted."""
+        with self.lock:
+            return [text for _, text in sorted(self.messages.get(chat_id, {}).items())]
+
+    def call(self, method: str, params: dict):
+        time.sleep(self.latency)
+        with self.lock:
+            self.calls[method] += 1
+            if self._throttled and method != "getMe":
+                self._throttled -= 1
+                self.flood_limited += 1
+                return 429, {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {self._retry_after}",
+                    "parameters": {"retry_after": self._retry_after},
+                }
+            handler = getattr(self, f"_{method}", None)
+            if handler is None:
+                return 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+            return handler(params)
+
+    def _getMe(self, params):
+        return 200, {"ok": True, "result": {
+            "id": 1, "is_bot": True, "first_name": "Lunch", "username": "lunch_bot",
+        }}
+
+    def _sendMessage(self, params):
+        chat_id = str(params["chat_id"])
+        message_id = self.next_message_id
+        self.next_message_id += 1
+        self.messages.setdefault(chat_id, {})[message_id] = params["text"]
+        return 200, {"ok": True, "result": {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": -1000 - len(self.messages), "type": "channel", "title": chat_id},
+            "text": params["text"],
+        }}
+
+    def _editMessageText(self, params):
+        chat = self.messages.get(str(params["chat_id"]), {})
+        message_id = int(params["message_id"])
+        if message_id not in chat:
+            return 400, {"ok": False, "error_code": 400,
+                         "description": "Bad Request: message to edit not found"}
+        chat[message_id] = params["text"]
+        return 200, {"ok": True, "result": True}
+
+    def _deleteMessage(self, params):
+        chat = self.messages.get(str(params["chat_id"]), {})
+        chat.pop(int(params["message_id"]), None)
+        return 200, {"ok": True, "result": True}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve fake restaurants and Telegram")
+    parser.add_argument("--restaurants", type=int, default=100)
+    parser.add_argument("--channels", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per page")
+    parser.add_argument("--padding", type=int, default=0, help="Extra bytes per page")
+    parser.add_argument("--failing", type=int, default=0, help="Restaurants answering 500")
+    parser.add_argument("--recorded", help="Also serve the pages of a response archive")
+    args = parser.parse_args(argv)
+
+    spec_dir = tempfile.mkdtemp(prefix="fake-specs-")
+    upstream = FakeUpstream(args.latency).start()
+    telegram = FakeTelegram().start()
+    upstream.add_restaurants(spec_dir, args.restaurants, padding=args.padding,
+                             failing=args.failing)
+    if args.recorded:
+        upstream.add_recorded(args.recorded)
+    channels = ",".join(f"@load_{i}:fi" for i in range(args.channels))
+
+    print(f"export MENU_UPSTREAM_URL={upstream.url}")
+    print(f"export TELEGRAM_API_URL={telegram.url}")
+    print(f"export MENU_SPECS_DIR={spec_dir}")
+    print(f"export TELEGRAM_CHANNELS={channels}")
+    print("export TELEGRAM_BOT_TOKEN=123:fake", flush=True)
+    try:
+        while True:
+            time.sleep(10)
+            print(f"Telegram calls: {dict(telegram.calls)}", flush=True)
+    except KeyboardInterrupt:
+        upstream.stop()
+        telegram.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from restaurants.archive import ResponseArchive
+from restaurants.kahvila_epila import KahvilaEpila
+from restaurants.kontukeittio import KontukeittioNokia
+
+MENU_HTML = """
+<h2>Maanantai</h2><p>Lohikeitto (L, G)</p>
+<h2>Tiistai</h2><p>Broileripasta (L)</p>
+""".encode("utf-8")
+
+LUNCHER_JSON = json.dumps({
+    "success": True,
+    "data": {"week": {"days": [
+        {"dayName": {"fi": "Maanantai"}, "lunches": [{"title": {"fi": "Kalakeitto"}}]}
+    ]}},
+}).encode("utf-8")
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/api"):
+            body, content_type = LUNCHER_JSON, "application/json"
+        else:
+            body, content_type = MENU_HTML, "text/html; charset=utf-8"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestResponseArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def _restaurants(self):
+        epila = KahvilaEpila()
+        epila.url = f"{self.base_url}/lounaslista/"
+        kontu = KontukeittioNokia()
+        kontu.url = f"{self.base_url}/api/v1/week/test/active?language=fi"
+        return epila, kontu
+
+    def test_record_then_replay_offline(self):
+        """Test that recorded pages replay identically without the server."""
+        env = {"MENU_ARCHIVE_DIR": self.tmpdir.name, "MENU_ARCHIVE_MODE": "record"}
+        with patch.dict(os.environ, env):
+            epila, kontu = self._restaurants()
+            recorded = (epila.scrape_menu(), kontu.scrape_menu())
+
+        self.assertEqual(recorded[0]["Maanantai"], ["Lohikeitto (L, G)"])
+        self.assertEqual(recorded[1]["Maanantai"], ["Kalakeitto"])
+
+        # Stop the server so any live request would fail
+        self.server.shutdown()
+        self.server.server_close()
+
+        env["MENU_ARCHIVE_MODE"] = "replay"
+        with patch.dict(os.environ, env):
+            epila, kontu = self._restaurants()
+            replayed = (epila.scrape_menu(), kontu.scrape_menu())
+
+        self.assertEqual(replayed, recorded)
+
+    def test_identical_bodies_stored_once(self):
+        """Test that the archive is content-addressed."""
+        with patch.dict(os.environ, {"MENU_ARCHIVE_DIR": self.tmpdir.name}):
+            epila, _ = self._restaurants()
+            epila.scrape_menu()
+            epila.scrape_menu()
+
+        archive = ResponseArchive(self.tmpdir.name)
+        records = list(archive.records())
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["digest"], records[1]["digest"])
+        self.assertEqual(archive.load_body(records[0]["digest"]), MENU_HTML)
+        self.assertIn("Content-Type", records[0]["headers"])
+
+    def test_replay_missing_url_returns_empty_menu(self):
+        """Test that a URL missing from the archive fails like a network error."""
+        env = {"MENU_ARCHIVE_DIR": self.tmpdir.name, "MENU_ARCHIVE_MODE": "replay"}
+        with patch.dict(os.environ, env):
+            epila, _ = self._restaurants()
+            self.assertEqual(epila.scrape_menu(), {})
+
+    def test_concurrent_lookups_see_the_whole_index(self):
+        """Test that a lookup never sees an index that is still loading."""
+        archive = ResponseArchive(self.tmpdir.name)
+        with open(archive.index_path, "w", encoding="utf-8") as index_file:
+            for i in range(3):
+                record = {"url": f"https://menu.test/{i}", "fetched_at": "2026-10-19"}
+                index_file.write(json.dumps(record) + "\n")
+
+        records = archive.records
+        loading = threading.Event()
+
+        def slow_records():
+            for record in records():
+                loading.set()
+                yield record
+                time.sleep(0.05)
+
+        with patch.object(archive, "records", slow_records):
+            loader = threading.Thread(target=archive.lookup, args=("https://menu.test/0",))
+            loader.start()
+            loading.wait(5)
+            latest = archive.lookup("https://menu.test/2")
+            loader.join(5)
+        self.assertEqual(latest["url"], "https://menu.test/2")
+
+
+if __name__ == '__main__':
+    unittest.main()
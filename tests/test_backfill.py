@@ -0,0 +1,157 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from datetime import date, datetime
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from backfill import backfill, main, plan_snapshots
+from history import MenuHistory
+from restaurants.archive import ResponseArchive
+from restaurants.kahvila_epila import KahvilaEpila
+
+EPILA_URL = KahvilaEpila().url
+
+
+def epila_page(*dishes):
+    return "".join(f"<h2>{day}</h2><p>{dish}</p>" for day, dish in dishes).encode("utf-8")
+
+
+class TestBackfill(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.archive_dir = os.path.join(self.tmpdir.name, "archive")
+        self.archive = ResponseArchive(self.archive_dir)
+        self.history = MenuHistory(os.path.join(self.tmpdir.name, "history.db"))
+
+    def tearDown(self):
+        self.history.close()
+        self.tmpdir.cleanup()
+
+    def add_fetch(self, url, body, fetched_at, status=200):
+        """Append an archived response as if a run had fetched it."""
+        record = {
+            "url": url,
+            "status": status,
+            "reason": "OK",
+            "headers": {"Content-Type": "text/html; charset=utf-8"},
+            "digest": self.archive.store_body(body),
+            "fetched_at": fetched_at,
+        }
+        with open(self.archive.index_path, "a", encoding="utf-8") as index_file:
+            index_file.write(json.dumps(record) + "\n")
+
+    def record_weeks(self):
+        """Archive two weeks of Epilä and store them as an old parser did."""
+        self.add_fetch(EPILA_URL, epila_page(("Maanantai", "Lohikeitto (L, G)")),
+                       "2026-10-05T07:30:00")
+        self.add_fetch(EPILA_URL, epila_page(("Maanantai", "Broileripasta (L)")),
+                       "2026-10-12T07:30:00")
+        # The page changed mid-week; the same page again is parsed only once
+        updated = epila_page(("Maanantai", "Broileripasta (L)"), ("Keskiviikko", "Kasviscurry"))
+        self.add_fetch(EPILA_URL, updated, "2026-10-14T07:30:00")
+        self.add_fetch(EPILA_URL, updated, "2026-10-15T07:30:00")
+
+        self.history.record_week_menus(
+            {"Kahvila Epilä": {"Maanantai": ["Lohikeitto (L, G) Lisätiedot"]}},
+            now=datetime(2026, 10, 5, 7, 30),
+        )
+        self.history.record_week_menus(
+            {"Kahvila Epilä": {"Maanantai": ["Broileripasta (L)"]}},
+            now=datetime(2026, 10, 12, 7, 30),
+        )
+
+    def run_backfill(self, **kwargs):
+        return backfill(self.archive_dir, self.history, [KahvilaEpila()], **kwargs)
+
+    def test_plan_skips_unchanged_pages(self):
+        """Test that one snapshot is planned per distinct page and week."""
+        self.record_weeks()
+        snapshots = plan_snapshots(self.archive, [KahvilaEpila()])
+        self.assertEqual([s["fetched_at"] for s in snapshots], [
+            "2026-10-05T07:30:00", "2026-10-12T07:30:00", "2026-10-14T07:30:00"])
+        self.assertEqual(snapshots[1]["week"], date(2026, 10, 12))
+
+    def test_replay_covers_pages_fetched_later_in_the_run(self):
+        """Test that fallback pages fetched after the main page are replayed."""
+        self.add_fetch(EPILA_URL, b"Not found", "2026-10-05T07:30:00", status=404)
+        self.add_fetch(f"{EPILA_URL}menu", b"menu", "2026-10-05T07:30:02")
+        self.add_fetch(EPILA_URL, b"Not found", "2026-10-12T07:30:00", status=404)
+        snapshots = plan_snapshots(self.archive, [KahvilaEpila()])
+        self.assertEqual(snapshots[0]["as_of"], "2026-10-05T07:30:02")
+        self.assertEqual(snapshots[1]["as_of"], "2026-10-12T07:30:00")
+
+    def test_backfill_replaces_weeks_and_reports_changes(self):
+        """Test that re-parsed weeks replace stored dishes and are summarized."""
+        self.record_weeks()
+        changes, totals = self.run_backfill()
+
+        self.assertEqual(totals["pages"], 3)
+        self.assertEqual(totals["weeks"], 2)
+        self.assertEqual(totals["failed"], 0)
+        by_week = {c["week"]: c for c in changes}
+        self.assertEqual(by_week[date(2026, 10, 5)]["added"], 1)
+        self.assertEqual(by_week[date(2026, 10, 5)]["removed"], 1)
+        self.assertEqual(by_week[date(2026, 10, 12)]["added"], 1)
+        self.assertEqual(by_week[date(2026, 10, 12)]["removed"], 0)
+
+        self.assertEqual(self.history.menu_for_date(date(2026, 10, 5)),
+                         {"Kahvila Epilä": ["Lohikeitto (L, G)"]})
+        self.assertEqual(self.history.menu_for_date(date(2026, 10, 14)),
+                         {"Kahvila Epilä": ["Kasviscurry"]})
+        # The full-text index follows the replaced dishes
+        self.assertEqual(self.history.search("lisätiedot"), [])
+        self.assertEqual(len(self.history.search("lohikeitto")), 1)
+
+        # A second run finds nothing left to change
+        changes, _ = self.run_backfill()
+        self.assertFalse(any(c["added"] or c["removed"] for c in changes))
+
+    def test_dry_run_writes_nothing(self):
+        """Test that a dry run reports changes without storing them."""
+        self.record_weeks()
+        changes, _ = self.run_backfill(dry_run=True)
+        self.assertTrue(any(c["removed"] for c in changes))
+        self.assertEqual(self.history.menu_for_date(date(2026, 10, 5)),
+                         {"Kahvila Epilä": ["Lohikeitto (L, G) Lisätiedot"]})
+
+    def test_unparseable_week_is_kept(self):
+        """Test that stored dishes stay when no snapshot of the week parses."""
+        self.add_fetch(EPILA_URL, b"Server error", "2026-10-05T07:30:00", status=500)
+        self.history.record_week_menus(
+            {"Kahvila Epilä": {"Maanantai": ["Lohikeitto"]}}, now=datetime(2026, 10, 5)
+        )
+        changes, totals = self.run_backfill()
+        self.assertEqual(changes, [])
+        self.assertEqual(totals["failed"], 1)
+        self.assertEqual(len(self.history.search("lohikeitto")), 1)
+
+    def test_process_pool_matches_serial_run(self):
+        """Test that re-parsing in worker processes gives the same result."""
+        self.record_weeks()
+        serial, _ = self.run_backfill(dry_run=True)
+        parallel, totals = self.run_backfill(workers=2, batch_size=1)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(totals["stored"], 3)
+
+    def test_cli(self):
+        """Test the command line backfill of a history database."""
+        self.record_weeks()
+        db_path = os.path.join(self.tmpdir.name, "history.db")
+        with patch("builtins.print") as printed:
+            self.assertTrue(main(["--archive", self.archive_dir, "--db", db_path,
+                                  "--workers", "1"]))
+        summary = printed.call_args_list[-1].args[0]
+        self.assertIn("Re-parsed 3 pages into 2 restaurant weeks", summary)
+        self.assertIn("2 changed, +2/-1 dishes", summary)
+
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertFalse(main(["--db", db_path]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+
+# Add src and benchmarks to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../benchmarks')))
+
+from parsers import RESTAURANT_CLASSES, compare, run_benchmarks, serve_body
+from fixtures import FIXTURES
+from scale import chart, run_scale, scaling_exponent, superlinear, synthetic_registry
+
+
+class TestParserBenchmarks(unittest.TestCase):
+    def test_fixtures_parse_for_every_restaurant(self):
+        """Test that the synthetic pages exercise the real parse paths."""
+        for restaurant_class in RESTAURANT_CLASSES:
+            restaurant = restaurant_class()
+            serve_body(restaurant, FIXTURES[restaurant.name](1))
+            menu = restaurant.scrape_menu()
+            self.assertIn("Maanantai", menu, restaurant.name)
+            self.assertIn("Perjantai", menu, restaurant.name)
+
+    def test_run_reports_every_stage(self):
+        """Test that a run reports time and memory for all stages."""
+        results = run_benchmarks([1], None, repeat=1)
+        self.assertEqual(len(results), len(RESTAURANT_CLASSES) + 2)
+        self.assertIn("synthetic-x1/telegram/split", results)
+        for metrics in results.values():
+            self.assertGreaterEqual(metrics["time_ms"], 0)
+            self.assertGreater(metrics["peak_kib"], 0)
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        """Test baseline comparison."""
+        baseline = {"a": {"time_ms": 10.0, "peak_kib": 100.0}}
+        self.assertEqual(compare({"a": {"time_ms": 12.0, "peak_kib": 100.0}}, baseline, 0.25), [])
+        regressions = compare({"a": {"time_ms": 13.0, "peak_kib": 200.0}}, baseline, 0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertEqual(compare({"new": {"time_ms": 1.0, "peak_kib": 1.0}}, baseline, 0.25), [])
+
+
+class TestScaleBenchmark(unittest.TestCase):
+    def test_registry_copies_every_restaurant_type(self):
+        """Test that the synthetic registry has unique restaurants of all types."""
+        registry = synthetic_registry(12)
+        self.assertEqual(len({r.name for r in registry}), 12)
+        self.assertEqual(len({type(r) for r in registry}), len(RESTAURANT_CLASSES))
+        self.assertIn("Perjantai", registry[-1].scrape_menu())
+
+    def test_run_reports_every_size(self):
+        """Test a dry run of the pipeline at two registry sizes."""
+        rows = run_scale([10, 5], channel_count=4)
+
+        self.assertEqual([row["restaurants"] for row in rows], [5, 10])
+        for row in rows:
+            self.assertEqual(row["failed"], 0)
+            self.assertGreaterEqual(row["messages"], 4)
+            self.assertGreater(row["peak_mib"], 0)
+            self.assertGreater(row["restaurants_per_s"], 0)
+        self.assertNotIn("time_exponent", rows[0])
+        self.assertIsNotNone(rows[1]["time_exponent"])
+        self.assertEqual(len(chart(rows, "peak_mib", "MiB")), 2)
+
+    def test_superlinear_growth_is_flagged(self):
+        """Test the scaling exponent and the superlinear check."""
+        self.assertAlmostEqual(scaling_exponent(200, 40.0, 100, 10.0), 2.0)
+        self.assertIsNone(scaling_exponent(100, 0.0, 50, 1.0))
+        rows = [
+            {"restaurants": 100},
+            {"restaurants": 200, "time_exponent": 2.0, "memory_exponent": 1.0},
+        ]
+        problems = superlinear(rows, 1.3)
+        self.assertEqual(len(problems), 1)
+        self.assertIn("time", problems[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+import sys
+import os
+import time
+import asyncio
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import scraper
+from channels import load_channels, view_key
+from restaurants.diets import diet_codes, filter_menu
+from restaurants.base import get_target_day
+from telegram_bot import TelegramBot, broadcast_sync
+
+CHANNELS_TOML = """
+[[channels]]
+id = "@tehdas"
+restaurants = ["Kartano", "Kahvila"]
+
+[[channels]]
+id = "@toimisto"
+restaurants = ["Kartano", "Kahvila"]
+
+[[channels]]
+id = "@gluteeniton"
+locale = "en"
+diets = ["g", "L"]
+"""
+
+
+def fake_restaurant(name):
+    restaurant = MagicMock()
+    restaurant.name = name
+    restaurant.format_current_day_menu.side_effect = (
+        lambda menu, locale: f"🍽️ **{name}**\n" + "".join(f"• {i}\n" for i in menu[get_target_day()])
+    )
+    return restaurant
+
+
+class TestChannelConfiguration(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "channels.toml")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(CHANNELS_TOML)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_channel_file(self):
+        """Test restaurant subsets, order and diet filters from TOML."""
+        with patch.dict(os.environ, {"TELEGRAM_CHANNELS_FILE": self.path}):
+            channels = load_channels()
+
+        self.assertEqual(channels[0], {
+            "channel_id": "@tehdas", "locale": "fi", "restaurants": ["Kartano", "Kahvila"],
+        })
+        self.assertEqual(channels[2]["diets"], ["gluten-free", "lactose-free"])
+        self.assertEqual(view_key(channels[0]), view_key(channels[1]))
+        self.assertNotEqual(view_key(channels[0]), view_key(channels[2]))
+
+    def test_diet_filter(self):
+        """Test that only items with all wanted diet codes are kept."""
+        self.assertEqual(diet_codes("Pizza (L, M, VEG)"), {"L", "M", "VEG"})
+        menu = {"Maanantai": ["Kalakeitto (L, G)", "Pasta (L)", "Salaatti"]}
+        self.assertEqual(filter_menu(menu, ["gluten-free"]), {"Maanantai": ["Kalakeitto (L, G)"]})
+        self.assertIsNone(filter_menu(None, ["G"]))
+
+
+class TestFanOut(unittest.TestCase):
+    def setUp(self):
+        day = get_target_day()
+        self.kahvila = fake_restaurant("Kahvila")
+        self.kartano = fake_restaurant("Kartano")
+        self.pizza = fake_restaurant("Pizza")
+        self.restaurants_by_locale = {
+            locale: [self.kahvila, self.kartano, self.pizza] for locale in ("fi", "en")
+        }
+        week_menus = {
+            "Kahvila": {day: ["Keitto (L, G)", "Pulla (L)"]},
+            "Kartano": {day: ["Pasta (M)"]},
+            "Pizza": {day: ["Pizza (L, G)"]},
+        }
+        self.menus_by_locale = {"fi": week_menus, "en": week_menus}
+        self.channels = [
+            {"channel_id": "@tehdas", "locale": "fi", "restaurants": ["Kartano", "Kahvila"]},
+            {"channel_id": "@toimisto", "locale": "fi", "restaurants": ["Kartano", "Kahvila"]},
+            {"channel_id": "@kaikki", "locale": "fi"},
+            {"channel_id": "@gluteeniton", "locale": "en", "diets": ["gluten-free"]},
+        ]
+        self.env_patcher = patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "token"})
+        self.env_patcher.start()
+
+    def tearDown(self):
+        self.env_patcher.stop()
+
+    def test_views_rendered_once(self):
+        """Test subsets, ordering and filters, rendering each view once."""
+        cache = {}
+        subset = scraper.render_channel_menus(self.channels[0], self.restaurants_by_locale, self.menus_by_locale, cache)
+        again = scraper.render_channel_menus(self.channels[1], self.restaurants_by_locale, self.menus_by_locale, cache)
+        everything = scraper.render_channel_menus(self.channels[2], self.restaurants_by_locale, self.menus_by_locale, cache)
+        gluten_free = scraper.render_channel_menus(self.channels[3], self.restaurants_by_locale, self.menus_by_locale, cache)
+
+        self.assertIs(subset, again)
+        self.assertTrue(subset[0].startswith("🍽️ **Kartano**"))
+        self.assertEqual(subset[1], everything[0])
+        # Unfiltered views reuse the locale render, filtered ones format once
+        self.assertEqual(self.kahvila.format_current_day_menu.call_count, 2)
+        self.assertIn("Keitto (L, G)", gluten_free[0])
+        self.assertNotIn("Pulla", gluten_free[0])
+
+    def test_deliveries_share_renders_and_client(self):
+        """Test that channels with the same view share one rendered message."""
+        with patch("telegram_bot.Bot") as bot_class:
+            deliveries = scraper.build_deliveries(self.channels, self.restaurants_by_locale, self.menus_by_locale)
+
+        bot_class.assert_called_once()
+        self.assertIs(deliveries[0][1], deliveries[1][1])
+        self.assertEqual([bot.channel_id for bot, _ in deliveries], ["@tehdas", "@toimisto", "@kaikki", "@gluteeniton"])
+        self.assertIn("Lunch menu", deliveries[3][1][0])
+
+    def test_concurrent_delivery(self):
+        """Test that channels are posted to concurrently and independently."""
+        async def send_message(chat_id, text, parse_mode):
+            await asyncio.sleep(0.2)
+            if chat_id == "@rikki":
+                raise RuntimeError("Forbidden")
+
+        client = MagicMock()
+        client.send_message.side_effect = send_message
+        channel_ids = ["@a", "@b", "@rikki", "@c"]
+        deliveries = [(TelegramBot(channel_id, bot=client), ["osa 1", "osa 2"]) for channel_id in channel_ids]
+
+        start = time.perf_counter()
+        results = broadcast_sync(deliveries)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(results, [True, True, False, True])
+        self.assertLess(elapsed, 0.2 * 2 * 2)
+        self.assertEqual(client.send_message.call_count, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from restaurants.compass import CompassGroupProvider
+from restaurants.nokian_kartano import NokianKartano
+from restaurants.provider import prefetch_feeds
+
+RESPONSE_DELAY = 0.3
+
+
+def compass_feed(cost_number):
+    return json.dumps({"MenusForDays": [
+        {
+            "Date": "2026-10-12T00:00:00+00:00",
+            "SetMenus": [
+                {"Name": "Lounas", "Components": [f"Keitto {cost_number}", "Pasta  (L,\n G)"]},
+                {"Name": "Jälkiruoka", "Components": ["Kiisseli"]},
+            ],
+        },
+        {"Date": "2026-10-17T00:00:00+00:00", "SetMenus": [{"Name": "Lounas", "Components": ["Brunssi"]}]},
+    ]}).encode("utf-8")
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+
+    def do_GET(self):
+        cost_number = parse_qs(urlparse(self.path).query)["costNumber"][0]
+        self.requests_seen.append(cost_number)
+        time.sleep(RESPONSE_DELAY)
+        body = compass_feed(cost_number)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCompassGroupProvider(unittest.TestCase):
+    def setUp(self):
+        FeedHandler.requests_seen = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.provider = CompassGroupProvider(
+            {str(1000 + i): f"Ravintola {i}" for i in range(6)},
+            feed_url=f"http://127.0.0.1:{self.server.server_port}/menuapi/feed/json",
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_feeds_are_fetched_concurrently(self):
+        """Test that many restaurants cost about one round trip."""
+        restaurants = self.provider.restaurants()
+        start = time.perf_counter()
+        prefetch_feeds(restaurants)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, RESPONSE_DELAY * 3)
+        self.assertEqual(sorted(FeedHandler.requests_seen), sorted(self.provider.cost_numbers))
+
+        # Scraping uses the prefetched feeds without further requests
+        menus = [restaurant.scrape_menu() for restaurant in restaurants]
+        self.assertEqual(len(FeedHandler.requests_seen), 6)
+        self.assertEqual(menus[0], {"Maanantai": ["Keitto 1000", "Pasta (L, G)"]})
+        self.assertEqual(menus[5]["Maanantai"][0], "Keitto 1005")
+
+    def test_prefetched_feed_is_used_once(self):
+        """Test that a later scrape fetches a fresh feed."""
+        restaurant = self.provider.restaurants()[0]
+        prefetch_feeds([restaurant])
+        restaurant.scrape_menu()
+        restaurant.scrape_menu()
+        self.assertEqual(len(FeedHandler.requests_seen), 2)
+
+    def test_restaurants_share_one_session(self):
+        """Test that all restaurants of a provider use its pooled session."""
+        sessions = {id(r.session) for r in self.provider.restaurants()}
+        self.assertEqual(sessions, {id(self.provider.session)})
+
+    def test_nokian_kartano_is_a_compass_restaurant(self):
+        """Test that the existing scraper is configured by cost number."""
+        restaurant = NokianKartano()
+        self.assertEqual(restaurant.cost_number, "3443")
+        self.assertIn("costNumber=3443&language=fi", restaurant.url)
+
+
+if __name__ == '__main__':
+    unittest.main()
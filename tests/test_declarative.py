@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+from bs4 import BeautifulSoup
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from restaurants.declarative import (
+    DeclarativeRestaurant,
+    HtmlMenuExtractor,
+    load_extractor,
+    spec_path,
+    spec_restaurants,
+)
+from restaurants.kahvila_epila import KahvilaEpila
+
+LIST_SPEC = """
+name = "Testikahvila"
+url = "https://example.com/lounas"
+
+[days]
+headings = ["h2"]
+
+[days.names]
+maanantai = "Maanantai"
+tiistai = "Tiistai"
+
+[items]
+mode = "siblings"
+selector = "li"
+min_length = 4
+exclude = ["Lounas sisältää", "kahvi"]
+"""
+
+LIST_HTML = """
+<h2>Maanantai 12.10.</h2>
+<li>Lohikeitto   (L, G)</li>
+<li>abc</li>
+<p>Not an item</p>
+<li>Lounas sisältää salaattipöydän</li>
+<h2>Tiistai 13.10.</h2>
+<li>Broileripasta (L)</li>
+<li>Kahvi ja pulla</li>
+"""
+
+
+class TestDeclarativeEngine(unittest.TestCase):
+    def test_siblings_mode_with_cleanup(self):
+        """Test sibling collection, whitespace cleanup and exclusions."""
+        import tomllib
+        extractor = HtmlMenuExtractor(tomllib.loads(LIST_SPEC))
+        menu = extractor.extract(BeautifulSoup(LIST_HTML, "html.parser"))
+        self.assertEqual(menu, {
+            "Maanantai": ["Lohikeitto (L, G)"],
+            "Tiistai": ["Broileripasta (L)"],
+        })
+
+    def test_invalid_specs_are_rejected(self):
+        """Test that incomplete specs raise a clear error."""
+        with self.assertRaises(ValueError):
+            HtmlMenuExtractor({"name": "X", "url": "https://example.com"})
+        with self.assertRaises(ValueError):
+            HtmlMenuExtractor({
+                "name": "X", "url": "https://example.com",
+                "days": {"names": {"maanantai": "Maanantai"}},
+                "items": {"mode": "table"},
+            })
+
+    def test_specs_are_compiled_once(self):
+        """Test that restaurants of the same spec share one extractor."""
+        self.assertIs(KahvilaEpila().extractor, KahvilaEpila().extractor)
+        self.assertIs(
+            load_extractor(spec_path("stahlberg_kolmenkulma")),
+            load_extractor(spec_path("stahlberg_kolmenkulma")),
+        )
+
+    def test_new_restaurant_without_code(self):
+        """Test that a spec file in MENU_SPECS_DIR becomes a restaurant."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "testikahvila.toml"), "w", encoding="utf-8") as f:
+                f.write(LIST_SPEC)
+            with patch.dict(os.environ, {"MENU_SPECS_DIR": tmpdir}):
+                restaurants = spec_restaurants(["stahlberg_kolmenkulma"])
+
+        self.assertEqual([r.name for r in restaurants], ["Ståhlberg Kolmenkulma", "Testikahvila"])
+        restaurant = restaurants[1]
+        self.assertIsInstance(restaurant, DeclarativeRestaurant)
+        restaurant.get_page_content = MagicMock(return_value=BeautifulSoup(LIST_HTML, "html.parser"))
+        self.assertEqual(restaurant.scrape_menu()["Tiistai"], ["Broileripasta (L)"])
+
+    def test_kahvila_epila_structure_from_spec(self):
+        """Test that Kahvila Epilä's structured parsing uses its spec."""
+        html = "<h3>Monday</h3><p>Pinaattikeitto (L, G)</p><div>Possunleike (L)</div><h3>Perjantai</h3><p>Xyz</p>"
+        restaurant = KahvilaEpila()
+        restaurant.get_page_content = MagicMock(return_value=BeautifulSoup(html, "html.parser"))
+        self.assertEqual(restaurant.scrape_menu(), {"Maanantai": ["Pinaattikeitto (L, G)", "Possunleike (L)"]})
+        self.assertEqual(restaurant.strategy, "structure")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,276 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import scraper
+import telegram_bot
+from telegram import error
+from delivery_log import DeliveryLog, part_digest
+from restaurants.kahvila_epila import KahvilaEpila
+from sinks import TelegramSink, dispatch_sync
+from telegram_bot import TelegramBot, broadcast_sync
+
+DAY = date(2024, 1, 15)
+MENU_HTML = "<h2>Maanantai</h2><p>Lohikeitto (L, G)</p>".encode("utf-8")
+
+
+class FakeTelegram:
+    """Records the Bot API calls and numbers the messages it posts."""
+
+    def __init__(self):
+        self.calls = []
+        self.messages = {}
+        self.posted = 0
+        self.fail_sends = False
+        # Posts after this many hang until cancelled
+        self.hang_after = None
+
+    async def initialize(self):
+        pass
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.calls.append(("send", text))
+        if self.fail_sends:
+            raise error.NetworkError("connection reset")
+        if self.hang_after is not None and self.posted >= self.hang_after:
+            await asyncio.sleep(60)
+        self.posted += 1
+        self.messages[self.posted] = text
+        return SimpleNamespace(message_id=self.posted)
+
+    async def edit_message_text(self, text, chat_id, message_id, parse_mode=None):
+        self.calls.append(("edit", message_id, text))
+        if message_id not in self.messages:
+            raise error.BadRequest("Message to edit not found")
+        self.messages[message_id] = text
+
+    async def delete_message(self, chat_id, message_id):
+        self.calls.append(("delete", message_id))
+        del self.messages[message_id]
+
+
+class TestDeliveryLog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "delivery.db")
+        self.log = DeliveryLog(self.path)
+        self.telegram = FakeTelegram()
+        with patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "test"}):
+            self.bot = TelegramBot("@lounas", bot=self.telegram)
+
+    def tearDown(self):
+        self.log.close()
+        self.tmpdir.cleanup()
+
+    def deliver(self, parts):
+        self.telegram.calls = []
+        return broadcast_sync([(self.bot, parts)], self.log, DAY)[0]
+
+    def test_unchanged_menu_is_not_posted_again(self):
+        """Test that a rerun with the same parts makes no API calls."""
+        self.assertTrue(self.deliver(["part 1", "part 2"]))
+        self.assertEqual(len(self.telegram.calls), 2)
+
+        # The log survives reopening, like between workflow runs
+        self.log.close()
+        self.log = DeliveryLog(self.path)
+        self.assertTrue(self.deliver(["part 1", "part 2"]))
+        self.assertEqual(self.telegram.calls, [])
+
+    def test_changed_part_is_edited(self):
+        """Test that only the changed message is edited, in place."""
+        self.deliver(["part 1", "part 2"])
+        self.assertTrue(self.deliver(["part 1", "part 2 fixed"]))
+
+        self.assertEqual(self.telegram.calls, [("edit", 2, "part 2 fixed")])
+        self.assertEqual(self.telegram.messages, {1: "part 1", 2: "part 2 fixed"})
+        self.assertEqual(
+            self.log.delivered("@lounas", DAY), [(part_digest("part 1"), 1), (part_digest("part 2 fixed"), 2)]
+        )
+
+    def test_parts_added_and_removed(self):
+        """Test that new parts are posted and surplus messages deleted."""
+        self.deliver(["part 1"])
+        self.deliver(["part 1", "part 2"])
+        self.assertEqual(self.telegram.calls, [("send", "part 2")])
+
+        self.deliver(["part 1 longer"])
+        self.assertEqual(self.telegram.calls, [("edit", 1, "part 1 longer"), ("delete", 2)])
+        self.assertEqual(self.telegram.messages, {1: "part 1 longer"})
+
+    def test_uneditable_message_is_posted_anew(self):
+        """Test falling back to a new message when the old one is gone."""
+        self.deliver(["part 1"])
+        del self.telegram.messages[1]
+
+        self.assertTrue(self.deliver(["part 1 fixed"]))
+        self.assertEqual(self.telegram.calls, [("edit", 1, "part 1 fixed"), ("send", "part 1 fixed")])
+        self.assertEqual(self.log.delivered("@lounas", DAY)[0][1], 2)
+
+    def test_failed_post_is_retried(self):
+        """Test that a failed post is not logged as delivered."""
+        self.telegram.fail_sends = True
+        self.assertFalse(self.deliver(["part 1", "part 2"]))
+        self.assertEqual(self.log.delivered("@lounas", DAY), [])
+
+        self.telegram.fail_sends = False
+        self.assertTrue(self.deliver(["part 1", "part 2"]))
+        self.assertEqual(len(self.telegram.calls), 2)
+
+    def test_timed_out_sink_keeps_posted_parts(self):
+        """Test that parts posted before a sink timeout are not posted again."""
+        self.telegram.hang_after = 1
+        sink = TelegramSink([(self.bot, ["part 1", "part 2"])], timeout=0.2, log=self.log)
+        self.assertEqual(dispatch_sync([sink], SimpleNamespace(date=DAY)), [False])
+        self.assertEqual(self.log.delivered("@lounas", DAY), [(part_digest("part 1"), 1)])
+
+        self.telegram.hang_after = None
+        self.assertTrue(self.deliver(["part 1", "part 2"]))
+        self.assertEqual(self.telegram.calls, [("send", "part 2")])
+
+    def test_days_and_channels_are_separate(self):
+        """Test that the log is kept per channel and day, and pruned."""
+        self.log.record("@lounas", DAY, [("a", 1)])
+        self.log.record("@lunch", DAY, [("b", 2)])
+        self.log.record("@lounas", date(2024, 1, 1), [("c", 3)])
+
+        self.assertEqual(self.log.delivered("@lunch", DAY), [("b", 2)])
+        self.assertEqual(self.log.prune(DAY, keep_days=7), 1)
+        self.assertEqual(self.log.delivered("@lounas", date(2024, 1, 1)), [])
+        self.assertEqual(self.log.delivered("@lounas", DAY), [("a", 1)])
+
+
+class TestRenders(unittest.TestCase):
+    MENUS = [
+        "🍽️ **Restaurant 1**\n📅 **Maanantai**\n• Menu item 1",
+        "🍽️ **Restaurant 2**\n📅 **Maanantai**\n• Menu item 2",
+        "❌ Restaurant 3: Error scraping menu",
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "delivery.db")
+        with patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "test"}):
+            self.bot = TelegramBot("@lounas", bot=FakeTelegram())
+            self.english_bot = TelegramBot("@lunch", locale="en", bot=FakeTelegram())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def render(self, menus, bot=None):
+        """Render in a run of its own; return the parts and rendered menus."""
+        bot = bot or self.bot
+        log = DeliveryLog(self.path)
+        try:
+            with patch.object(bot, "_format_single_menu", wraps=bot._format_single_menu) as fmt:
+                parts = bot.render_current_day_messages(menus, log)
+        finally:
+            log.close()
+        return parts, [c.args[0] for c in fmt.call_args_list]
+
+    def test_unchanged_menus_are_not_rendered_again(self):
+        """Test that a later run reuses the stored message parts."""
+        parts, rendered = self.render(self.MENUS)
+        self.assertEqual(rendered, self.MENUS)
+        self.assertEqual(parts, self.bot.render_current_day_messages(self.MENUS))
+
+        again, rendered = self.render(self.MENUS)
+        self.assertEqual(again, parts)
+        self.assertEqual(rendered, [])
+
+    def test_changed_restaurant_renders_one_fragment(self):
+        """Test that only the changed restaurant's fragment is rendered again."""
+        self.render(self.MENUS)
+        changed = list(self.MENUS)
+        changed[1] = "🍽️ **Restaurant 2**\n📅 **Maanantai**\n• Menu item 3"
+
+        parts, rendered = self.render(changed)
+        self.assertEqual(rendered, [changed[1]])
+        self.assertIn("Menu item 3", parts[0])
+        self.assertNotIn("Menu item 2", parts[0])
+
+    def test_locale_and_template_version_are_keys(self):
+        """Test that other locales and template versions do not reuse messages."""
+        finnish, _ = self.render(self.MENUS)
+        english, _ = self.render(self.MENUS, self.english_bot)
+        self.assertNotEqual(finnish, english)
+
+        with patch("telegram_bot.TEMPLATE_VERSION", telegram_bot.TEMPLATE_VERSION + 1):
+            _, rendered = self.render(self.MENUS)
+        self.assertEqual(rendered, self.MENUS)
+
+    def test_old_renders_are_pruned(self):
+        """Test that renders are forgotten with the deliveries."""
+        log = DeliveryLog(self.path)
+        log.store_render("old", "fragment", date(2024, 1, 1))
+        log.store_render("new", "fragment", DAY)
+        log.prune(DAY, keep_days=7)
+        self.assertIsNone(log.render("old"))
+        self.assertEqual(log.render("new"), "fragment")
+        log.close()
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(MENU_HTML)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRerun(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmpdir.name, "delivery.db")
+        self.telegram = FakeTelegram()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def run_main(self):
+        env = {
+            "TELEGRAM_BOT_TOKEN": "test",
+            "TELEGRAM_CHANNEL_ID": "@lounas",
+            "DELIVERY_LOG_DB": self.log_path,
+        }
+        restaurant = KahvilaEpila()
+        restaurant.url = f"http://127.0.0.1:{self.server.server_port}/"
+        with patch.dict(os.environ, env, clear=True), \
+                patch("scraper.get_localized_restaurants", return_value={"fi": [restaurant]}), \
+                patch("scraper.prewarm_client", return_value=self.telegram):
+            return scraper.main([])
+
+    def test_rerun_posts_nothing(self):
+        """Test that a second run of the scraper on the same day posts nothing."""
+        self.assertTrue(self.run_main())
+        self.assertEqual(len(self.telegram.calls), 1)
+        self.assertTrue(self.run_main())
+        self.assertEqual(len(self.telegram.calls), 1)
+
+    def test_corrupt_log_still_posts(self):
+        """Test that an unreadable delivery log is logged and posting goes on."""
+        with open(self.log_path, "wb") as db_file:
+            db_file.write(b"not a database" * 100)
+        with self.assertLogs(level="ERROR"):
+            self.assertTrue(self.run_main())
+        self.assertEqual(len(self.telegram.calls), 1)
+
+if __name__ == '__main__':
+    unittest.main()
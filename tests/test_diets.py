@@ -0,0 +1,134 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import scraper
+from interactive_bot import MenuCommands
+from menu_cache import MenuCache
+from restaurants.base import get_target_day
+from restaurants.diets import filter_menu, item_flags, parse_filters
+from subscriptions import SubscriptionStore
+
+WEEK_MENUS = {
+    "Kartano": {"Keskiviikko": ["Kasviscurry (VEG, G)", "Lohikeitto (* ,G ,L ,M)", "Pasta (L)"]},
+    "Pizza Buffa": {"Keskiviikko": ["Pizza margherita (L, M, VEG)", "Kebabpizza"]},
+}
+
+
+class TestDietFlags(unittest.TestCase):
+    def test_codes_of_every_provider(self):
+        """Test Compass, Luncher and HTML code formats."""
+        self.assertEqual(item_flags("Lohikeitto (* ,G ,L ,M)"),
+                         {"gluten-free", "lactose-free", "low-lactose", "milk-free"})
+        self.assertEqual(item_flags("Kalakeitto (L, G) 11,50€"),
+                         {"gluten-free", "lactose-free", "low-lactose"})
+        self.assertIn("vegan", item_flags("Pizza margherita (L, M, VEG)"))
+        self.assertIn("vegetarian", item_flags("Tofuwok (Veg)"))
+        self.assertEqual(item_flags("Kebabpizza"), frozenset())
+
+    def test_filter_names(self):
+        """Test filter aliases in English, Finnish and codes."""
+        self.assertEqual(parse_filters(["Vegaani", "G"]), {"vegan", "gluten-free"})
+        self.assertEqual(parse_filters(["maidoton", "dairy-free"]), {"milk-free"})
+        with self.assertRaises(ValueError):
+            parse_filters(["keto"])
+
+    def test_filter_menu(self):
+        """Test that filters keep dishes with all flags."""
+        menu = filter_menu(WEEK_MENUS["Kartano"], {"vegan"})
+        self.assertEqual(menu, {"Keskiviikko": ["Kasviscurry (VEG, G)"]})
+        menu = filter_menu(WEEK_MENUS["Kartano"], {"gluten-free", "milk-free"})
+        self.assertEqual(len(menu["Keskiviikko"]), 2)
+
+
+class TestSubscriptions(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = SubscriptionStore(os.path.join(self.tmpdir.name, "subscriptions.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_subscribe_and_unsubscribe(self):
+        """Test storing, replacing and removing subscriptions."""
+        self.store.subscribe(1, ["vegan"])
+        self.store.subscribe(2, ["veg"])
+        self.store.subscribe(3, ["gluteeniton"], locale="en")
+        self.store.subscribe(1, ["vegaani", "g"])
+
+        self.assertEqual(self.store.get(1), {"vegan", "gluten-free"})
+        self.assertEqual(self.store.filter_sets(), {frozenset({"vegan", "gluten-free"}), frozenset({"vegan"}), frozenset({"gluten-free"})})
+        self.assertEqual(self.store.channels()[2], {"channel_id": "3", "locale": "en", "diets": ["gluten-free"]})
+        self.assertTrue(self.store.unsubscribe(2))
+        self.assertFalse(self.store.unsubscribe(2))
+        self.assertIsNone(self.store.get(2))
+
+    def test_subscribers_share_renders(self):
+        """Test that each distinct filter set is rendered once for the broadcast."""
+        for chat_id in range(10):
+            self.store.subscribe(chat_id, ["vegan"] if chat_id % 2 else ["G"])
+
+        day = get_target_day()
+        restaurant = MagicMock()
+        restaurant.name = "Kartano"
+        restaurant.format_current_day_menu.side_effect = lambda menu, locale: "\n".join(menu[day])
+        restaurants_by_locale = {"fi": [restaurant]}
+        menus_by_locale = {"fi": {"Kartano": {day: WEEK_MENUS["Kartano"]["Keskiviikko"]}}}
+
+        with patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "token"}), patch("telegram_bot.Bot"):
+            deliveries = scraper.build_deliveries(self.store.channels(), restaurants_by_locale, menus_by_locale)
+
+        self.assertEqual(len(deliveries), 10)
+        self.assertEqual(restaurant.format_current_day_menu.call_count, 2)
+        self.assertEqual(len({id(parts) for _, parts in deliveries}), 2)
+        self.assertNotIn("Pasta", deliveries[1][1][0])
+
+
+class TestFilteredAnswers(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = SubscriptionStore(os.path.join(self.tmpdir.name, "subscriptions.db"))
+        self.store.subscribe("100", ["vegan"])
+        self.cache = MenuCache(MagicMock(return_value=WEEK_MENUS))
+        self.commands = MenuCommands(self.cache, subscriptions=self.store)
+        self.cache.filter_sets = self.commands.filter_sets
+        self.cache.refresh()
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_answers_rendered_once_per_filter_set(self):
+        """Test that filtered answers are precomputed and shared."""
+        snapshot = self.cache.snapshot
+        vegan = frozenset({"vegan"})
+        self.assertIs(snapshot.answers_for(vegan), snapshot.answers_for(frozenset({"vegan"})))
+
+        with patch("menu_cache.filter_menu") as filter_menu_mock:
+            snapshot.answer(None, "Keskiviikko", vegan)
+        filter_menu_mock.assert_not_called()
+
+    def test_subscribed_chat_gets_filtered_menu(self):
+        """Test /subscribe, filtered /menu and /unsubscribe."""
+        reply = self.commands.handle("/menu keskiviikko", chat_id=100)
+        self.assertIn("Kasviscurry", reply)
+        self.assertNotIn("Lohikeitto", reply)
+
+        self.assertIn("gluten-free", self.commands.handle("/subscribe gluteeniton", chat_id=200))
+        reply = self.commands.handle("/menu kartano keskiviikko", chat_id=200)
+        self.assertIn("Lohikeitto", reply)
+        self.assertNotIn("Pasta", reply)
+
+        self.assertIn("Unknown diet filter", self.commands.handle("/subscribe keto", chat_id=300))
+        self.assertIn("Unsubscribed", self.commands.handle("/unsubscribe", chat_id=100))
+        self.assertIn("Pasta", self.commands.handle("/menu keskiviikko", chat_id=100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import scraper
+from fakes import FakeTelegram, FakeUpstream, synthetic_menu_html
+from restaurants.kahvila_epila import KahvilaEpila
+
+
+class TestEndToEnd(unittest.TestCase):
+    """Runs scraper.main against local fake restaurant sites and Telegram."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.upstream = FakeUpstream(latency=0.005).start()
+        self.telegram = FakeTelegram().start()
+        self.env = {
+            "MENU_UPSTREAM_URL": self.upstream.url,
+            "TELEGRAM_API_URL": self.telegram.url,
+            "TELEGRAM_BOT_TOKEN": "123:fake",
+            "MENU_SPECS_DIR": self.tmpdir.name,
+        }
+
+    def tearDown(self):
+        self.upstream.stop()
+        self.telegram.stop()
+        self.tmpdir.cleanup()
+
+    def run_main(self, **env):
+        with patch.dict(os.environ, {**self.env, **env}, clear=True):
+            return scraper.main([])
+
+    def test_many_restaurants_and_channels(self):
+        """Test a run with hundreds of restaurants, many channels and flood control."""
+        names = self.upstream.add_restaurants(self.tmpdir.name, 200, failing=5)
+        channels = [f"@load_{i}" for i in range(8)]
+        self.telegram.throttle(3)
+
+        start = time.perf_counter()
+        self.assertTrue(self.run_main(TELEGRAM_CHANNELS=",".join(f"{c}:fi" for c in channels)))
+        elapsed = time.perf_counter() - start
+
+        for name in names:
+            self.assertEqual(self.upstream.requests[FakeUpstream.path_of(
+                f"http://restaurant-{name[-3:]}.test/lounas/")], 1)
+        for channel in channels:
+            text = "\n".join(self.telegram.texts(channel))
+            self.assertIn("Fake Restaurant 199", text)
+            self.assertIn("Fake Restaurant 000: Unable to fetch menu", text)
+            self.assertGreater(len(self.telegram.texts(channel)), 1)
+        self.assertEqual(self.telegram.flood_limited, 3)
+        self.assertLess(elapsed, 30)
+
+    def test_built_in_restaurant_through_override(self):
+        """Test that built-in restaurants fetch from the upstream override."""
+        restaurant = KahvilaEpila()
+        self.upstream.add_page(restaurant.url, synthetic_menu_html("Epilä", padding=50_000))
+        with patch("scraper.get_localized_restaurants", return_value={"fi": [restaurant]}):
+            self.assertTrue(self.run_main(TELEGRAM_CHANNEL_ID="@lounas"))
+
+        self.assertEqual(self.upstream.requests[FakeUpstream.path_of(restaurant.url)], 1)
+        self.assertIn("Epilä", self.telegram.texts("@lounas")[0])
+        self.assertEqual(self.telegram.calls["getMe"], 1)
+
+    def test_persistent_flood_control_fails_the_post(self):
+        """Test that a post is given up after repeated 429 answers."""
+        self.upstream.add_restaurants(self.tmpdir.name, 1)
+        self.telegram.throttle(100)
+        with patch("telegram_bot.FLOOD_RETRIES", 1):
+            self.assertFalse(self.run_main(TELEGRAM_CHANNEL_ID="@lounas"))
+        self.assertEqual(self.telegram.calls["sendMessage"], 2)
+
+    def test_recorded_pages(self):
+        """Test serving pages recorded with the response archive."""
+        self.upstream.add_restaurants(self.tmpdir.name, 3)
+        archive_dir = os.path.join(self.tmpdir.name, "archive")
+        self.assertTrue(self.run_main(TELEGRAM_CHANNEL_ID="@lounas", MENU_ARCHIVE_DIR=archive_dir))
+
+        with FakeUpstream() as recorded:
+            # Archived URLs already point at the first fake server
+            self.assertGreaterEqual(recorded.add_recorded(archive_dir), 3)
+            path = next(p for p in recorded.pages if "restaurant-002.test" in p)
+            self.assertIn(b"Fake Restaurant 002", recorded.pages[path].body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import scraper
+from performance import PerformanceHistory
+from restaurants.hedging import HedgePolicy, get_hedge_policy, set_hedge_policy
+from restaurants.instrumentation import reset_instrumentation
+from restaurants.kahvila_epila import KahvilaEpila
+
+MENU_HTML = "<h2>Maanantai</h2><p>Lohikeitto (L, G)</p>".encode("utf-8")
+
+
+class StallingHandler(BaseHTTPRequestHandler):
+    """Stalls every request whose number is in the server's stall set."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.count += 1
+            number = self.server.count
+        if number in self.server.stall:
+            time.sleep(1.5)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(MENU_HTML)))
+        self.end_headers()
+        self.wfile.write(MENU_HTML)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHedging(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StallingHandler)
+        self.server.lock = threading.Lock()
+        self.server.count = 0
+        self.server.stall = {1}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.restaurant = KahvilaEpila()
+        self.restaurant.url = f"http://127.0.0.1:{self.server.server_port}/"
+        self.instrumentation = reset_instrumentation()
+
+    def tearDown(self):
+        set_hedge_policy(None)
+        self.restaurant.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def timed_fetch(self):
+        start = time.perf_counter()
+        response = self.restaurant.fetch()
+        return response, time.perf_counter() - start
+
+    def test_stalled_request_is_hedged(self):
+        """Test that the hedge answers while the first request stalls."""
+        set_hedge_policy(HedgePolicy({"127.0.0.1": 0.1}))
+        response, elapsed = self.timed_fetch()
+
+        self.assertEqual(response.content, MENU_HTML)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(get_hedge_policy().hedges, 1)
+        # A hedged fetch says nothing about how fast the host is
+        fetch = next(e for e in self.instrumentation.events if e["stage"] == "fetch")
+        self.assertNotIn("host", fetch)
+
+    def test_unhedged_fetch_is_a_host_sample(self):
+        """Test that fetches answered within the delay record their host."""
+        self.server.stall = set()
+        set_hedge_policy(HedgePolicy({"127.0.0.1": 1.0}))
+        self.timed_fetch()
+        fetch = next(e for e in self.instrumentation.events if e["stage"] == "fetch")
+        self.assertEqual(fetch["host"], "127.0.0.1")
+        self.assertEqual(get_hedge_policy().hedges, 0)
+
+    def test_other_hosts_are_not_hedged(self):
+        """Test that hedging is opt-in per host."""
+        set_hedge_policy(HedgePolicy({"lounas.example": 0.1}))
+        _, elapsed = self.timed_fetch()
+        self.assertGreater(elapsed, 1.4)
+        self.assertEqual(get_hedge_policy().hedges, 0)
+
+    def test_hedge_budget(self):
+        """Test that hedges stop once the budget is used up."""
+        self.server.stall = {1, 3, 5}
+        policy = HedgePolicy({"127.0.0.1": 0.1}, max_ratio=0.0, burst=1)
+        set_hedge_policy(policy)
+
+        _, hedged = self.timed_fetch()
+        _, unhedged = self.timed_fetch()
+
+        self.assertLess(hedged, 1.0)
+        self.assertGreater(unhedged, 1.4)
+        self.assertEqual((policy.requests, policy.hedges), (2, 1))
+
+    def test_hedge_delays_learned_from_history(self):
+        """Test hedge delays from the stored p95 fetch duration."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "perf.db")
+            history = PerformanceHistory(path)
+            for run in range(12):
+                self.restaurant.fetch()
+                history.record_run([self.restaurant], {"Kahvila Epilä": {}}, self.instrumentation)
+                self.instrumentation = reset_instrumentation()
+            self.assertEqual(len(history.host_fetch_times("127.0.0.1")), 12)
+            history.close()
+
+            env = {"PERF_HISTORY_DB": path, "HEDGE_HOSTS": "127.0.0.1, slow.example=2.5, new.example"}
+            with patch.dict(os.environ, env):
+                scraper.configure_hedging()
+
+        delays = get_hedge_policy().delays
+        self.assertEqual(set(delays), {"127.0.0.1", "slow.example"})
+        self.assertLess(delays["127.0.0.1"], 1.5)
+        self.assertEqual(delays["slow.example"], 2.5)
+
+    def test_invalid_entries_are_skipped(self):
+        """Test that bad hedge settings are logged and the valid ones apply."""
+        env = {"HEDGE_HOSTS": "example.com=1.5s, slow.example=2.5, bad.example=-1",
+               "HEDGE_MAX_RATIO": "lots"}
+        with patch.dict(os.environ, env), self.assertLogs(level="WARNING") as logs:
+            scraper.configure_hedging()
+
+        self.assertEqual(get_hedge_policy().delays, {"slow.example": 2.5})
+        self.assertEqual(get_hedge_policy().max_ratio, 0.1)
+        self.assertEqual(len(logs.records), 3)
+
+    def test_unreadable_history_disables_learning(self):
+        """Test that a corrupt performance history only skips learned delays."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "perf.db")
+            with open(path, "wb") as db_file:
+                db_file.write(b"not a database" * 100)
+            env = {"PERF_HISTORY_DB": path, "HEDGE_HOSTS": "127.0.0.1, slow.example=2.5"}
+            with patch.dict(os.environ, env), self.assertLogs(level="ERROR"):
+                scraper.configure_hedging()
+
+        self.assertEqual(get_hedge_policy().delays, {"slow.example": 2.5})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import date, datetime
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from history import MenuHistory, main
+
+
+class TestMenuHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "history.db")
+        self.history = MenuHistory(self.db_path)
+        # Wednesday 2026-10-14, week starts on Monday 2026-10-12
+        self.now = datetime(2026, 10, 14, 7, 30)
+
+    def tearDown(self):
+        self.history.close()
+        self.tmpdir.cleanup()
+
+    def test_record_and_search(self):
+        """Test that recorded dishes are found with full-text search."""
+        stored = self.history.record_week_menus(
+            {
+                "Kahvila Epilä": {
+                    "Maanantai": ["Lohikeitto (L, G)", "Broileripasta (L)"],
+                    "Keskiviikko": ["Kasviscurry (VEG)"],
+                },
+                "Kontukeittiö Nokia": {"Tiistai": ["Lohikeitto ja ruisleipä"]},
+            },
+            now=self.now,
+        )
+        self.assertEqual(stored, 4)
+
+        results = self.history.search("lohikeitto")
+        self.assertEqual(len(results), 2)
+        # Newest first
+        self.assertEqual(results[0][0], "2026-10-13")
+        self.assertEqual(results[0][2], "Kontukeittiö Nokia")
+        self.assertEqual(results[1], ("2026-10-12", "Maanantai", "Kahvila Epilä", "Lohikeitto (L, G)"))
+
+        vegan = self.history.search("veg", since=date(2026, 10, 1), until=date(2026, 10, 31))
+        self.assertEqual([row[3] for row in vegan], ["Kasviscurry (VEG)"])
+
+    def test_rerun_does_not_duplicate(self):
+        """Test that recording the same menus twice stores nothing new."""
+        menus = {"Kahvila Epilä": {"Maanantai": ["Lohikeitto (L, G)"]}}
+        self.assertEqual(self.history.record_week_menus(menus, now=self.now), 1)
+        self.assertEqual(self.history.record_week_menus(menus, now=self.now), 0)
+        self.assertEqual(len(self.history.search("lohikeitto")), 1)
+
+    def test_last_served_by_restaurant(self):
+        """Test finding the latest date a restaurant served a dish."""
+        self.history.record_week_menus(
+            {"Kahvila Epilä": {"Maanantai": ["Lohikeitto"], "Torstai": ["Lohikeitto"]}},
+            now=self.now,
+        )
+        row = self.history.last_served("lohikeitto", restaurant="Kahvila Epilä")
+        self.assertEqual(row[0], "2026-10-15")
+        self.assertIsNone(self.history.last_served("lohikeitto", restaurant="Muu"))
+
+    def test_failed_scrapes_are_skipped(self):
+        """Test that failed (None) and weekend entries are ignored."""
+        stored = self.history.record_week_menus(
+            {"Broken": None, "Weekend": {"Lauantai": ["Brunssi"]}}, now=self.now
+        )
+        self.assertEqual(stored, 0)
+
+    def test_cli_month_search(self):
+        """Test the command line search restricted to a month."""
+        self.history.record_week_menus(
+            {"Kahvila Epilä": {"Maanantai": ["Kasviscurry (VEG)"]}}, now=self.now
+        )
+        self.assertTrue(main(["--db", self.db_path, "search", "veg", "--month", "2026-10"]))
+        self.assertFalse(main(["--db", self.db_path, "search", "veg", "--month", "2026-09"]))
+        self.assertTrue(main(["--db", self.db_path, "last", "kasviscurry"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
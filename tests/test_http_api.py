@@ -0,0 +1,113 @@
+import unittest
+import sys
+import os
+import json
+import threading
+import http.client
+from datetime import datetime
+from unittest.mock import MagicMock
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from http_api import MenuApi, create_server, etag_matches, slugify
+from menu_cache import MenuCache
+
+WEEK_MENUS = {
+    "Nokian Kartano (FoodCo)": {"Keskiviikko": ["Lohikeitto (L, G)"]},
+    "Kahvila Epilä": {"Keskiviikko": ["Jauhelihakastike <talon>"], "Torstai": ["Hernekeitto"]},
+    "Pizza Buffa": None,
+}
+
+
+class TestMenuApi(unittest.TestCase):
+    def setUp(self):
+        self.loader = MagicMock(return_value=WEEK_MENUS)
+        self.cache = MenuCache(self.loader)
+        self.api = MenuApi(self.cache)
+        self.cache.refresh()
+        self.server = create_server(self.api, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.conn = http.client.HTTPConnection("127.0.0.1", self.server.server_port)
+
+    def tearDown(self):
+        self.conn.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path, headers=None):
+        self.conn.request("GET", path, headers=headers or {})
+        response = self.conn.getresponse()
+        return response, response.read()
+
+    def test_json_views(self):
+        """Test week, day and restaurant JSON documents."""
+        response, body = self.get("/week.json")
+        self.assertEqual(response.status, 200)
+        week = json.loads(body)
+        self.assertEqual([r["slug"] for r in week["restaurants"]],
+                         ["nokian-kartano-foodco", "kahvila-epila", "pizza-buffa"])
+        self.assertFalse(week["restaurants"][2]["available"])
+
+        response, body = self.get("/restaurant/nokian-kartano-foodco/keskiviikko.json")
+        item = json.loads(body)["items"][0]
+        self.assertEqual(item, {"name": "Lohikeitto (L, G)", "diets": ["gluten-free", "lactose-free", "low-lactose"]})
+
+        response, body = self.get("/day/torstai.json")
+        self.assertEqual(json.loads(body)["restaurants"][1]["items"][0]["name"], "Hernekeitto")
+
+    def test_html_views_are_escaped(self):
+        """Test that HTML pages escape menu content."""
+        response, body = self.get("/restaurant/kahvila-epila.html")
+        self.assertEqual(response.getheader("Content-Type"), "text/html; charset=utf-8")
+        self.assertIn("Jauhelihakastike &lt;talon&gt;", body.decode("utf-8"))
+
+    def test_conditional_requests(self):
+        """Test strong ETags and 304 responses without a body."""
+        response, body = self.get("/week.json")
+        etag = response.getheader("ETag")
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+
+        response, body = self.get("/week.json", {"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+
+        # An unchanged refresh keeps the ETag; a changed menu replaces it
+        self.cache.refresh()
+        response, _ = self.get("/week.json", {"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.loader.return_value = {**WEEK_MENUS, "Pizza Buffa": {"Keskiviikko": ["Pizza"]}}
+        self.cache.refresh()
+        response, _ = self.get("/week.json", {"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.getheader("ETag"), etag)
+
+    def test_requests_never_scrape(self):
+        """Test that serving only reads precomputed bodies."""
+        for _ in range(20):
+            self.get("/day/today.json")
+            self.get("/")
+        self.assertEqual(self.loader.call_count, 1)
+
+    def test_aliases_and_missing(self):
+        """Test today/tomorrow aliases and 404s."""
+        wednesday = datetime(2026, 10, 14, 9, 0)
+        self.assertIs(self.api.resolve("/day/today.json", wednesday), self.api.routes["/day/keskiviikko.json"])
+        self.assertIs(self.api.resolve("/restaurant/kahvila-epila/tomorrow.html", wednesday),
+                      self.api.routes["/restaurant/kahvila-epila/torstai.html"])
+        friday = datetime(2026, 10, 16, 9, 0)
+        self.assertIsNone(self.api.resolve("/day/tomorrow.json", friday))
+        self.assertIsNone(self.api.resolve("/restaurant/kahvila-epila/tomorrow.html", friday))
+        response, _ = self.get("/restaurant/hesburger.json")
+        self.assertEqual(response.status, 404)
+
+    def test_helpers(self):
+        """Test slugs and If-None-Match parsing."""
+        self.assertEqual(slugify("Ståhlberg Kolmenkulma"), "stahlberg-kolmenkulma")
+        self.assertTrue(etag_matches('"a", W/"b"', '"b"'))
+        self.assertTrue(etag_matches("*", '"b"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+
+
+if __name__ == '__main__':
+    unittest.main()
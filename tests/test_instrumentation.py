@@ -0,0 +1,131 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import socket
+import threading
+from unittest.mock import patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from restaurants.instrumentation import Instrumentation, percentile, reset_instrumentation
+from restaurants.kahvila_epila import KahvilaEpila
+from scraper import format_current_day_menus, scrape_week_menus
+
+MENU_HTML = "".join(
+    f"<h2>{day}</h2><p>Lohikeitto (L, G)</p>"
+    for day in ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai"]
+).encode("utf-8")
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(MENU_HTML)))
+        self.end_headers()
+        self.wfile.write(MENU_HTML)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.restaurant = KahvilaEpila()
+        self.restaurant.url = f"http://127.0.0.1:{self.server.server_port}/"
+        self.instrumentation = reset_instrumentation()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _stages(self):
+        return [e["stage"] for e in self.instrumentation.events]
+
+    def test_pipeline_stages_are_recorded(self):
+        """Test that fetch phases, parse and render are recorded."""
+        week_menus = scrape_week_menus([self.restaurant])
+        format_current_day_menus([self.restaurant], week_menus)
+
+        stages = self._stages()
+        for stage in ["fetch", "fetch.dns", "fetch.connect", "fetch.ttfb",
+                      "fetch.download", "parse", "render"]:
+            self.assertIn(stage, stages)
+
+        fetch = next(e for e in self.instrumentation.events if e["stage"] == "fetch")
+        self.assertEqual(fetch["bytes"], len(MENU_HTML))
+        self.assertEqual(fetch["restaurant"], "Kahvila Epilä")
+
+    def test_reused_connection_has_no_connect_phase(self):
+        """Test that a keep-alive connection skips DNS and connect."""
+        self.restaurant.fetch()
+        self.restaurant.fetch()
+        self.assertEqual(self._stages().count("fetch"), 2)
+        self.assertEqual(self._stages().count("fetch.connect"), 1)
+
+    def test_falls_back_to_next_resolved_address(self):
+        """Test that a dead first address does not fail the fetch."""
+        port = self.server.server_port
+        addresses = [
+            # Nothing listens on 127.0.0.2, so the connection is refused
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.2", port)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port)),
+        ]
+        resolve = socket.getaddrinfo
+
+        def getaddrinfo(host, *args, **kwargs):
+            return addresses if host == "menu.test" else resolve(host, *args, **kwargs)
+
+        self.restaurant.url = f"http://menu.test:{port}/"
+        with patch("socket.getaddrinfo", side_effect=getaddrinfo):
+            response = self.restaurant.fetch()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("fetch.connect", self._stages())
+
+    def test_exports(self):
+        """Test JSON lines, Prometheus and summary outputs."""
+        scrape_week_menus([self.restaurant])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            jsonl = os.path.join(tmpdir, "metrics.jsonl")
+            prom = os.path.join(tmpdir, "lunch.prom")
+            summary = os.path.join(tmpdir, "summary.json")
+            self.instrumentation.write_jsonl(jsonl)
+            self.instrumentation.write_prometheus(prom)
+            self.instrumentation.write_summary(summary)
+
+            with open(jsonl, encoding="utf-8") as f:
+                events = [json.loads(line) for line in f]
+            self.assertEqual(len(events), len(self.instrumentation.events))
+
+            with open(prom, encoding="utf-8") as f:
+                prom_text = f.read()
+            self.assertIn('lunch_menu_stage_duration_seconds{restaurant="Kahvila Epilä",stage="parse"}', prom_text)
+            self.assertIn('lunch_menu_stage_bytes{restaurant="Kahvila Epilä",stage="fetch"}', prom_text)
+
+            with open(summary, encoding="utf-8") as f:
+                stages = json.load(f)["stages"]
+            self.assertEqual(stages["fetch"]["bytes"], len(MENU_HTML))
+            self.assertIn("p95_s", stages["parse"])
+
+    def test_summary_percentiles(self):
+        """Test p50/p95 over several restaurants."""
+        instrumentation = Instrumentation()
+        for i in range(1, 21):
+            instrumentation.record(f"R{i}", "parse", i / 100)
+        stage = instrumentation.summary()["stages"]["parse"]
+        self.assertEqual(stage["count"], 20)
+        self.assertAlmostEqual(stage["p50_s"], 0.10)
+        self.assertAlmostEqual(stage["p95_s"], 0.19)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
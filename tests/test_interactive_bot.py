@@ -0,0 +1,182 @@
+import unittest
+import sys
+import os
+import time
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from telegram import error
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from interactive_bot import InteractiveBot, MenuCommands, parse_day
+from menu_cache import MenuCache
+
+WEDNESDAY = datetime(2026, 10, 14, 11, 0)
+FRIDAY = datetime(2026, 10, 16, 11, 0)
+SATURDAY = datetime(2026, 10, 17, 11, 0)
+
+WEEK_MENUS = {
+    "Nokian Kartano (FoodCo)": {
+        "Keskiviikko": ["Lohikeitto (L, G)", "Broileripasta (L)"],
+        "Torstai": ["Hernekeitto (M, G)"],
+    },
+    "Kahvila Epilä": {"Keskiviikko": ["Jauhelihakastike (L)"]},
+    "Pizza Buffa": None,
+}
+
+
+class TestMenuCache(unittest.TestCase):
+    def setUp(self):
+        self.loader = MagicMock(return_value=WEEK_MENUS)
+        self.cache = MenuCache(self.loader)
+        self.cache.refresh()
+
+    def test_lookups_are_precomputed(self):
+        """Test that answers come from the snapshot without scraping."""
+        snapshot = self.cache.snapshot
+        self.assertEqual(snapshot.find_restaurant("kartano"), "Nokian Kartano (FoodCo)")
+        self.assertIsNone(snapshot.find_restaurant("hesburger"))
+
+        answer = snapshot.answer("Nokian Kartano (FoodCo)", "Torstai")
+        self.assertIn("Hernekeitto (M, G)", answer)
+        self.assertIn("Torstai", answer)
+        everything = snapshot.answer(None, "Keskiviikko")
+        self.assertIn("Lohikeitto", everything)
+        self.assertIn("Jauhelihakastike", everything)
+        self.assertIn("❌ Pizza Buffa", everything)
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            snapshot.answer(snapshot.find_restaurant("epilä"), "Keskiviikko")
+            snapshot.search("keitto")
+        self.assertLess((time.perf_counter() - start) / 1000, 0.001)
+        self.loader.assert_called_once()
+
+    def test_search(self):
+        """Test dish search over the week."""
+        matches = self.cache.snapshot.search("KEITTO")
+        self.assertEqual([m[2] for m in matches], ["Lohikeitto (L, G)", "Hernekeitto (M, G)"])
+
+    def test_failed_refresh_keeps_last_good_menus(self):
+        """Test that scrape failures do not empty the cache."""
+        self.loader.return_value = {**WEEK_MENUS, "Kahvila Epilä": None}
+        self.cache.refresh()
+        self.assertIn("Jauhelihakastike", self.cache.snapshot.answer("Kahvila Epilä", "Keskiviikko"))
+
+        self.loader.side_effect = RuntimeError("network down")
+        self.assertFalse(self.cache.refresh())
+        self.assertIn("Lohikeitto", self.cache.snapshot.answer(None, "Keskiviikko"))
+
+    def test_background_refresh(self):
+        """Test that the cache refreshes itself in the background."""
+        cache = MenuCache(self.loader, refresh_seconds=0.05)
+        cache.start()
+        try:
+            time.sleep(0.3)
+        finally:
+            cache.stop()
+        self.assertGreaterEqual(self.loader.call_count, 3)
+
+
+class TestMenuCommands(unittest.TestCase):
+    def setUp(self):
+        cache = MenuCache(MagicMock(return_value=WEEK_MENUS))
+        cache.refresh()
+        self.commands = MenuCommands(cache)
+
+    def test_parse_day(self):
+        """Test day names, prefixes and relative days."""
+        self.assertEqual(parse_day("perjantai", WEDNESDAY), "Perjantai")
+        self.assertEqual(parse_day("Thursday", WEDNESDAY), "Torstai")
+        self.assertEqual(parse_day("ti", WEDNESDAY), "Tiistai")
+        self.assertEqual(parse_day("tänään", WEDNESDAY), "Keskiviikko")
+        self.assertEqual(parse_day("huomenna", WEDNESDAY), "Torstai")
+        self.assertIsNone(parse_day("tomorrow", FRIDAY))
+        self.assertEqual(parse_day("today", SATURDAY), "Maanantai")
+        self.assertIsNone(parse_day("t", WEDNESDAY))
+        self.assertIsNone(parse_day("kartano", WEDNESDAY))
+
+    def test_menu_commands(self):
+        """Test /menu with restaurant and day arguments."""
+        reply = self.commands.handle("/menu@LounasBot kartano huomenna", WEDNESDAY)
+        self.assertIn("Hernekeitto", reply)
+        self.assertNotIn("Jauhelihakastike", reply)
+
+        reply = self.commands.handle("/menu", WEDNESDAY)
+        self.assertIn("Lohikeitto", reply)
+        self.assertIn("Jauhelihakastike", reply)
+
+        reply = self.commands.handle("/menu kartano huomenna", FRIDAY)
+        self.assertIn("No menus for tomorrow", reply)
+        self.assertNotIn("Lohikeitto", self.commands.handle("/menu tomorrow", FRIDAY))
+
+        reply = self.commands.handle("/menu hesburger", WEDNESDAY)
+        self.assertIn("Unknown restaurant", reply)
+
+    def test_search_and_other_messages(self):
+        """Test /search and that plain messages are ignored."""
+        self.assertIn("Keskiviikko – Nokian Kartano (FoodCo): Lohikeitto", self.commands.handle("/search lohi"))
+        self.assertIn("No dishes", self.commands.handle("/search sushi"))
+        self.assertIsNone(self.commands.handle("mitä tänään syötäisiin?"))
+        self.assertIsNone(self.commands.handle("/unknown"))
+
+
+class TestPolling(unittest.TestCase):
+    def test_poll_once_answers_and_advances_offset(self):
+        """Test that updates are answered and acknowledged."""
+        cache = MenuCache(MagicMock(return_value=WEEK_MENUS))
+        cache.refresh()
+        message = SimpleNamespace(text="/search hernekeitto", chat_id=42)
+        updates = [
+            SimpleNamespace(update_id=7, effective_message=message),
+            SimpleNamespace(update_id=8, effective_message=SimpleNamespace(text="hei", chat_id=42)),
+        ]
+        client = MagicMock()
+        client.get_updates = AsyncMock(return_value=updates)
+        client.send_message = AsyncMock()
+
+        bot = InteractiveBot(client, MenuCommands(cache), poll_timeout=0)
+        self.assertEqual(asyncio.run(bot.poll_once()), 2)
+
+        self.assertEqual(bot.offset, 9)
+        client.send_message.assert_awaited_once()
+        kwargs = client.send_message.await_args.kwargs
+        self.assertEqual(kwargs["chat_id"], 42)
+        self.assertIn("Hernekeitto", kwargs["text"])
+
+    def test_flood_control_wait_is_capped(self):
+        """Test that polling waits out flood control, at most a minute."""
+        client = MagicMock()
+        client.get_updates = AsyncMock(side_effect=error.RetryAfter(timedelta(minutes=5)))
+        bot = InteractiveBot(client, MenuCommands(MagicMock()), poll_timeout=0)
+        with patch("interactive_bot.asyncio.sleep", new=AsyncMock()) as sleep:
+            self.assertEqual(asyncio.run(bot.poll_once()), 0)
+        sleep.assert_awaited_once_with(60)
+
+    def test_long_answer_is_sent_in_parts(self):
+        """Test that an answer over Telegram's limit is split in order."""
+        week_menus = {
+            f"Ravintola {i}": {"Keskiviikko": [f"Annos {i}.{j} " + "x" * 60 for j in range(5)]}
+            for i in range(40)
+        }
+        cache = MenuCache(MagicMock(return_value=week_menus))
+        cache.refresh()
+        client = MagicMock()
+        client.send_message = AsyncMock()
+        bot = InteractiveBot(client, MenuCommands(cache), poll_timeout=0)
+        message = SimpleNamespace(text="/menu keskiviikko", chat_id=42)
+        asyncio.run(bot.handle_update(SimpleNamespace(effective_message=message)))
+
+        texts = [call.kwargs["text"] for call in client.send_message.await_args_list]
+        self.assertGreater(len(texts), 1)
+        self.assertTrue(all(len(text) <= 4096 for text in texts))
+        self.assertIn("Annos 0.0", texts[0])
+        self.assertIn("Annos 39.4", texts[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
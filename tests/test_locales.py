@@ -0,0 +1,154 @@
+import unittest
+import sys
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import scraper
+from channels import channel_locales, load_channels, parse_channels
+from restaurants.base import get_target_day
+from restaurants.compass import CompassGroupProvider
+from restaurants.locales import localize_day
+from restaurants.luncher import LuncherProvider
+from telegram_bot import TelegramBot
+
+RESPONSE_DELAY = 0.3
+DISHES = {"fi": "Kalakeitto", "en": "Fish soup"}
+
+
+class LocalizedFeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        language = parse_qs(parsed.query)["language"][0]
+        self.requests_seen.append((parsed.path, language))
+        time.sleep(RESPONSE_DELAY)
+        if "compass" in parsed.path:
+            day = datetime.now().strftime("%Y-%m-%dT00:00:00+00:00")
+            body = {"MenusForDays": [{"Date": day, "SetMenus": [
+                {"Name": "Lounas", "Components": [DISHES[language]]},
+            ]}]}
+        else:
+            body = {"success": True, "data": {"week": {"endDate": "2099-01-04", "days": [
+                {"dayName": {"fi": get_target_day(), "en": "Whatever"}, "lunches": [
+                    {"title": {"fi": "Kanakeitto", "en": "Chicken soup"}},
+                    {"title": {"fi": "Puuro"}},
+                ]},
+            ]}}}
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestLocales(unittest.TestCase):
+    def test_localize_day(self):
+        """Test that Finnish day keys are shown in the locale's language."""
+        self.assertEqual(localize_day("Keskiviikko", "en"), "Wednesday")
+        self.assertEqual(localize_day("Keskiviikko", "fi"), "Keskiviikko")
+        with self.assertRaises(ValueError):
+            localize_day("Maanantai", "sv")
+
+    def test_parse_channels(self):
+        """Test the channel:locale list format."""
+        channels = parse_channels("@lounas:fi, -100123:en, @oletus")
+        self.assertEqual(channels, [
+            {"channel_id": "@lounas", "locale": "fi"},
+            {"channel_id": "-100123", "locale": "en"},
+            {"channel_id": "@oletus", "locale": "fi"},
+        ])
+        self.assertEqual(channel_locales(channels), ["fi", "en"])
+        with self.assertRaises(ValueError):
+            parse_channels("@lounas:xx")
+
+    def test_single_channel_from_environment(self):
+        """Test that the single channel configuration keeps working."""
+        with patch.dict(os.environ, {"TELEGRAM_CHANNEL_ID": "@lounas"}, clear=True):
+            self.assertEqual(load_channels(), [{"channel_id": "@lounas", "locale": "fi"}])
+        with patch.dict(os.environ, {"TELEGRAM_CHANNEL_ID": "@lunch", "TELEGRAM_LOCALE": "en"}, clear=True):
+            self.assertEqual(load_channels(), [{"channel_id": "@lunch", "locale": "en"}])
+
+    def test_english_bot_header(self):
+        """Test that the bot renders headers and footers in its locale."""
+        with patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "token"}):
+            with patch("telegram_bot.Bot"):
+                bot = TelegramBot(channel_id="@lunch", locale="en")
+        message = bot.format_combined_menu_message(["🍽️ **Test**\n📅 **Monday**\n• Soup\n"])
+        self.assertIn("Lunch menu - ", message)
+        self.assertIn("Updated automatically", message)
+        self.assertEqual(bot.channel_id, "@lunch")
+
+
+class TestLocalizedScraping(unittest.TestCase):
+    def setUp(self):
+        LocalizedFeedHandler.requests_seen = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), LocalizedFeedHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        self.compass = CompassGroupProvider({"1": "Kartano"}, feed_url=f"{base}/compass")
+        self.luncher = LuncherProvider({"2": "Keittiö"}, api_url=f"{base}/luncher")
+        self.html_restaurant = MagicMock()
+        self.html_restaurant.name = "Kahvila"
+        self.html_restaurant.scrape_menu.return_value = {get_target_day(): ["Pulla"]}
+        self.restaurants_by_locale = {
+            locale: [
+                self.html_restaurant,
+                *self.luncher.restaurants(locale),
+                *self.compass.restaurants(locale),
+            ]
+            for locale in ("fi", "en")
+        }
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_all_languages_in_one_batch(self):
+        """Test that a second locale adds no serial fetch latency."""
+        start = time.perf_counter()
+        menus = scraper.scrape_localized_menus(self.restaurants_by_locale)
+        self.assertLess(time.perf_counter() - start, RESPONSE_DELAY * 2)
+
+        self.assertEqual(len(LocalizedFeedHandler.requests_seen), 4)
+        self.html_restaurant.scrape_menu.assert_called_once()
+
+        day = get_target_day()
+        if datetime.now().weekday() < 5:
+            self.assertEqual(menus["en"]["Kartano"][day], ["Fish soup"])
+            self.assertEqual(menus["fi"]["Kartano"][day], ["Kalakeitto"])
+        # Missing translations fall back to Finnish
+        self.assertEqual(menus["en"]["Keittiö"][day], ["Chicken soup", "Puuro"])
+        self.assertEqual(menus["en"]["Kahvila"], menus["fi"]["Kahvila"])
+
+    def test_each_locale_rendered_once_per_day(self):
+        """Test that channels sharing a locale reuse the rendered menus."""
+        menus = scraper.scrape_localized_menus(self.restaurants_by_locale)
+        cache = {}
+        with patch.object(scraper, "format_current_day_menus", wraps=scraper.format_current_day_menus) as render:
+            english = scraper.render_locale_menus(self.restaurants_by_locale, menus, "en", cache)
+            again = scraper.render_locale_menus(self.restaurants_by_locale, menus, "en", cache)
+            scraper.render_locale_menus(self.restaurants_by_locale, menus, "fi", cache)
+
+        self.assertIs(english, again)
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(set(cache), {("en", get_target_day()), ("fi", get_target_day())})
+        self.assertIn(f"📅 **{localize_day(get_target_day(), 'en')}**", english[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import json
+import time
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from restaurants.kontukeittio import KontukeittioNokia
+from restaurants.luncher import LuncherProvider
+from restaurants.provider import prefetch_feeds
+
+RESPONSE_DELAY = 0.3
+
+
+class WeekHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+    week_end = date.today() + timedelta(days=3)
+
+    def do_GET(self):
+        restaurant_id = self.path.split("/")[-2]
+        self.requests_seen.append(restaurant_id)
+        time.sleep(RESPONSE_DELAY)
+        body = json.dumps({"success": True, "data": {"week": {
+            "endDate": self.week_end.isoformat(),
+            "days": [
+                {"dayName": {"fi": "Maanantai"}, "lunches": [
+                    {"title": {"fi": f"Kalakeitto {restaurant_id}"},
+                     "allergens": [{"abbreviation": {"fi": "L"}}, {"abbreviation": {"fi": "G"}}],
+                     "normalPrice": {"price": "11,50"}},
+                    {"title": {"fi": "Salaattipöytä"}, "description": {"fi": "Salaattipöytä"}},
+                ]},
+                {"dayName": {"fi": "Tiistai"}, "isClosed": True, "lunches": []},
+            ],
+        }}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestLuncherProvider(unittest.TestCase):
+    def setUp(self):
+        WeekHandler.requests_seen = []
+        WeekHandler.week_end = date.today() + timedelta(days=3)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), WeekHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.provider = LuncherProvider(
+            {f"id-{i}": f"Keittiö {i}" for i in range(5)},
+            api_url=f"http://127.0.0.1:{self.server.server_port}/api/v1/week",
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_chain_costs_one_round_trip(self):
+        """Test that all week documents are fetched concurrently."""
+        restaurants = self.provider.restaurants()
+        start = time.perf_counter()
+        prefetch_feeds(restaurants)
+        self.assertLess(time.perf_counter() - start, RESPONSE_DELAY * 3)
+
+        menus = [restaurant.scrape_menu() for restaurant in restaurants]
+        self.assertEqual(len(WeekHandler.requests_seen), 5)
+        self.assertEqual(menus[2], {"Maanantai": ["Kalakeitto id-2 (L, G) 11,50€"]})
+
+    def test_week_document_cached_until_week_ends(self):
+        """Test that later scrapes in the same week hit the cache."""
+        restaurant = self.provider.restaurants()[0]
+        prefetch_feeds([restaurant])
+        restaurant.scrape_menu()
+        restaurant.scrape_menu()
+        prefetch_feeds([restaurant])
+        self.assertEqual(WeekHandler.requests_seen, ["id-0"])
+
+        expiry = self.provider._expiry({"data": {"week": {"endDate": "2026-10-18"}}})
+        self.assertEqual(expiry, datetime(2026, 10, 19))
+
+    def test_past_week_is_refetched(self):
+        """Test that a document of an already ended week is not cached."""
+        WeekHandler.week_end = date.today() - timedelta(days=1)
+        restaurant = self.provider.restaurants()[0]
+        restaurant.scrape_menu()
+        restaurant.scrape_menu()
+        self.assertEqual(len(WeekHandler.requests_seen), 2)
+
+    def test_kontukeittio_is_a_luncher_restaurant(self):
+        """Test that the existing scraper is configured by restaurant id."""
+        restaurant = KontukeittioNokia()
+        self.assertEqual(restaurant.restaurant_id, "1baa89be-11dc-4447-abb3-bbaef16cc6d1")
+        self.assertIn("europe-west1-luncher-7cf76.cloudfunctions.net", restaurant.url)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+import threading
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from scraper import scrape_week_menus
+from performance import PerformanceHistory
+from restaurants.instrumentation import reset_instrumentation
+from restaurants.kahvila_epila import KahvilaEpila
+from restaurants.memory import MemoryBudget, PeakMonitor
+
+MB = 1024 * 1024
+
+
+class HeavyRestaurant:
+    """Allocates a page-sized buffer and notes how many scrapes overlap."""
+
+    strategy = "default"
+
+    def __init__(self, name, size, tracker):
+        self.name = name
+        self.size = size
+        self.tracker = tracker
+
+    def scrape_menu(self):
+        with self.tracker["lock"]:
+            self.tracker["running"] += 1
+            self.tracker["max"] = max(self.tracker["max"], self.tracker["running"])
+        page = bytearray(self.size)
+        time.sleep(0.1)
+        del page
+        with self.tracker["lock"]:
+            self.tracker["running"] -= 1
+        return {"Maanantai": [self.name]}
+
+
+class TestParseTreeDisposal(unittest.TestCase):
+    def test_tree_is_decomposed_after_extraction(self):
+        """Test that the parse tree is released once the menu is extracted."""
+        restaurant = KahvilaEpila()
+        soup = BeautifulSoup("<h2>Maanantai</h2><p>Lohikeitto (L, G)</p>", "html.parser")
+        with patch.object(restaurant, "get_page_content", return_value=soup):
+            menu = restaurant.scrape_menu()
+
+        self.assertEqual(menu["Maanantai"], ["Lohikeitto (L, G)"])
+        self.assertTrue(soup.decomposed)
+
+    def test_tree_is_decomposed_on_error(self):
+        """Test that a failing extraction still releases the tree."""
+        restaurant = KahvilaEpila()
+        soup = BeautifulSoup("<h2>Maanantai</h2>", "html.parser")
+        with patch.object(restaurant, "get_page_content", return_value=soup), \
+                patch.object(restaurant, "_extract_menu_from_structure", side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                restaurant.scrape_menu()
+        self.assertTrue(soup.decomposed)
+
+
+class TestPeakMonitor(unittest.TestCase):
+    def test_peak_of_block(self):
+        """Test that the peak includes memory freed before the block ended."""
+        monitor = PeakMonitor()
+        with monitor.track() as memory:
+            buffer = bytearray(4 * MB)
+            del buffer
+        monitor.close()
+        self.assertGreaterEqual(memory["peak"], 4 * MB)
+        self.assertLess(memory["peak"], 6 * MB)
+
+    def test_overlapping_blocks_are_not_exact(self):
+        """Test that only a block that ran alone has an exact peak."""
+        monitor = PeakMonitor()
+        with monitor.track() as alone:
+            pass
+        with monitor.track() as first:
+            with monitor.track() as second:
+                pass
+        with monitor.track() as later:
+            pass
+        monitor.close()
+        self.assertTrue(alone["exact"])
+        self.assertFalse(first["exact"])
+        self.assertFalse(second["exact"])
+        self.assertTrue(later["exact"])
+
+    def test_disabled_monitor(self):
+        """Test that a disabled monitor measures nothing."""
+        with PeakMonitor(enabled=False).track() as memory:
+            pass
+        self.assertEqual(memory, {})
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def run_concurrently(self, budget, estimates):
+        """Run blocks holding the estimates; return the most that overlapped."""
+        tracker = {"running": 0, "max": 0, "lock": threading.Lock()}
+
+        def work(estimate):
+            with budget.reserve(estimate):
+                HeavyRestaurant("x", 0, tracker).scrape_menu()
+
+        threads = [threading.Thread(target=work, args=(e,)) for e in estimates]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(budget.running, 0)
+        return tracker["max"]
+
+    def test_light_scrapes_run_together(self):
+        """Test that scrapes fitting in the budget overlap."""
+        self.assertEqual(self.run_concurrently(MemoryBudget(100), [30, 30, 30]), 3)
+
+    def test_heavy_scrapes_are_serialized(self):
+        """Test that scrapes not fitting together run one at a time."""
+        self.assertEqual(self.run_concurrently(MemoryBudget(100), [60, 60, 60]), 1)
+
+    def test_oversized_scrape_runs_alone(self):
+        """Test that a scrape over the whole budget still runs, alone."""
+        self.assertEqual(self.run_concurrently(MemoryBudget(100), [500, 500]), 1)
+
+    def test_scrape_without_estimate_runs_alone(self):
+        """Test that a scrape without an estimate holds the whole budget."""
+        self.assertEqual(self.run_concurrently(MemoryBudget(100), [None, 10, None]), 1)
+        self.assertEqual(self.run_concurrently(MemoryBudget(), [None, None]), 2)
+
+    def test_no_limit(self):
+        """Test that without a limit everything is admitted."""
+        self.assertEqual(self.run_concurrently(MemoryBudget(), [500, 500, 500]), 3)
+
+
+class TestScrapeScheduling(unittest.TestCase):
+    def setUp(self):
+        self.tracker = {"running": 0, "max": 0, "lock": threading.Lock()}
+        self.restaurants = [HeavyRestaurant(f"Heavy {i}", 2 * MB, self.tracker) for i in range(3)]
+        self.instrumentation = reset_instrumentation()
+
+    def test_peaks_recorded_and_used_as_estimates(self):
+        """Test that recorded peaks make heavy parsers run one after another."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "perf.db")
+            with patch.dict(os.environ, {"TRACK_SCRAPE_MEMORY": "1"}):
+                week_menus = scrape_week_menus(self.restaurants)
+            self.assertEqual(week_menus["Heavy 2"], {"Maanantai": ["Heavy 2"]})
+
+            peaks = [e for e in self.instrumentation.events if e["stage"] == "peak_memory"]
+            self.assertEqual(len(peaks), 3)
+            self.assertTrue(all(e["bytes"] >= 2 * MB for e in peaks))
+
+            history = PerformanceHistory(path)
+            history.record_run(self.restaurants, week_menus, self.instrumentation)
+            self.assertGreaterEqual(history.peak_memory("Heavy 0")[0], 2 * MB)
+            history.close()
+
+            # Two 2 MB parsers do not fit in a 3 MB budget together
+            self.tracker["max"] = 0
+            env = {"PERF_HISTORY_DB": path, "SCRAPE_MEMORY_BUDGET_MB": "3"}
+            with patch.dict(os.environ, env):
+                week_menus = scrape_week_menus(self.restaurants)
+            self.assertEqual(len(week_menus), 3)
+            self.assertEqual(self.tracker["max"], 1)
+
+    def test_budgeted_run_learns_peaks(self):
+        """Test that restaurants without a recorded peak are measured alone."""
+        restaurants = [HeavyRestaurant(f"Heavy {i}", 2 * MB, self.tracker) for i in range(8)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "perf.db")
+            env = {"PERF_HISTORY_DB": path, "SCRAPE_MEMORY_BUDGET_MB": "64"}
+            with patch.dict(os.environ, env):
+                week_menus = scrape_week_menus(restaurants)
+            peaks = [e for e in self.instrumentation.events if e["stage"] == "peak_memory"]
+            self.assertEqual(len(peaks), 8)
+
+            history = PerformanceHistory(path)
+            history.record_run(restaurants, week_menus, self.instrumentation)
+            history.close()
+
+            # Learned 2 MB peaks fit in the budget together
+            self.tracker["max"] = 0
+            with patch.dict(os.environ, env):
+                scrape_week_menus(restaurants)
+            self.assertGreater(self.tracker["max"], 1)
+
+    def test_overlapping_peaks_not_recorded(self):
+        """Test that peaks including other scrapes are not learned from."""
+        env = {"TRACK_SCRAPE_MEMORY": "1", "SCRAPE_WORKERS": "3"}
+        with patch.dict(os.environ, env):
+            scrape_week_menus(self.restaurants)
+        self.assertEqual(self.tracker["max"], 3)
+        stages = {e["stage"] for e in self.instrumentation.events}
+        self.assertNotIn("peak_memory", stages)
+
+    def test_untracked_by_default(self):
+        """Test that scrapes run one at a time, untraced, by default."""
+        with patch.dict(os.environ, {}, clear=True):
+            scrape_week_menus(self.restaurants)
+        self.assertEqual(self.tracker["max"], 1)
+        stages = {e["stage"] for e in self.instrumentation.events}
+        self.assertNotIn("peak_memory", stages)
+
+
+if __name__ == '__main__':
+    unittest.main()
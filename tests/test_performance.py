@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from performance import PerformanceHistory, main, welch_statistic
+from restaurants.instrumentation import Instrumentation
+
+
+class TestPerformanceHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "perf.db")
+        self.history = PerformanceHistory(self.db_path)
+        self.start = datetime(2026, 9, 1, 4, 30)
+        self.runs = 0
+
+    def tearDown(self):
+        self.history.close()
+        self.tmpdir.cleanup()
+
+    def _record(self, latency, size=50000, strategy="structure", items=15):
+        """Record one run of a single restaurant."""
+        restaurant = SimpleNamespace(name="Kahvila Epilä", strategy=strategy)
+        instrumentation = Instrumentation()
+        instrumentation.record(restaurant.name, "fetch", latency, size)
+        instrumentation.record(restaurant.name, "parse", 0.05)
+        menu = {"Maanantai": [f"Ruoka {i}" for i in range(items)]} if items else {}
+        self.history.record_run(
+            [restaurant],
+            {restaurant.name: menu},
+            instrumentation,
+            now=self.start + timedelta(days=self.runs),
+        )
+        self.runs += 1
+
+    def _record_baseline(self):
+        for i in range(14):
+            self._record(0.40 + (i % 3) * 0.02)
+
+    def test_stable_runs_have_no_regressions(self):
+        """Test that normal variation is not flagged."""
+        self._record_baseline()
+        for latency in (0.41, 0.43, 0.40):
+            self._record(latency)
+        self.assertEqual(self.history.report(), {"Kahvila Epilä": []})
+
+    def test_slowdown_and_page_growth_are_flagged(self):
+        """Test that a clear latency and size increase is flagged."""
+        self._record_baseline()
+        for latency in (1.2, 1.3, 1.25):
+            self._record(latency, size=100000)
+        findings = self.history.find_regressions("Kahvila Epilä")
+        self.assertTrue(any(f.startswith("fetch latency") for f in findings))
+        self.assertTrue(any(f.startswith("page size") for f in findings))
+        self.assertFalse(main(["--db", self.db_path]))
+
+    def test_fallback_and_failure_are_flagged(self):
+        """Test that parser fallbacks and empty menus are flagged."""
+        self._record_baseline()
+        self._record(0.41, strategy="regex")
+        self._record(0.41, items=0)
+        self._record(0.41)
+        findings = self.history.find_regressions("Kahvila Epilä")
+        self.assertIn("strategy changed from structure to regex", findings)
+        self.assertTrue(any(f.startswith("success rate") for f in findings))
+
+    def test_too_few_runs(self):
+        """Test that no report is made without a baseline."""
+        self._record(0.4)
+        self.assertEqual(self.history.find_regressions("Kahvila Epilä"), [])
+        self.assertTrue(main(["--db", self.db_path]))
+
+    def test_welch_statistic(self):
+        """Test the t statistic used for significance."""
+        self.assertGreater(welch_statistic([1.0, 1.1, 0.9, 1.0], [2.0, 2.1]), 3)
+        self.assertLess(welch_statistic([1.0, 1.1, 0.9, 1.0], [1.05]), 3)
+        self.assertEqual(welch_statistic([1.0], [2.0]), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import sys
+import os
+import re
+import random
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from restaurants.kontukeittio import KontukeittioNokia
+from restaurants.phrases import ANYWHERE, START, WORDS, PhraseMatcher, load_dictionary
+from restaurants.pizza_buffa import PizzaBuffa
+
+
+def naive_find(phrases, text):
+    """Try every phrase in turn, as the parsers did before the automaton."""
+    text = text.strip().lower()
+    for anchor, entries in phrases.items():
+        for phrase in entries:
+            if anchor == ANYWHERE and phrase in text:
+                return True
+            if anchor == START and text.startswith(phrase):
+                return True
+            if anchor == WORDS and (text == phrase or text.startswith(phrase + " ")):
+                return True
+    return False
+
+
+class TestPhraseMatcher(unittest.TestCase):
+    def test_overlapping_phrases(self):
+        """Test phrases that are found through failure links."""
+        matcher = PhraseMatcher({ANYWHERE: ["he", "she", "his", "hers"]})
+        self.assertEqual(matcher.find("ushers"), "she")
+        self.assertEqual(matcher.find("ahishers"), "his")
+        self.assertIsNone(matcher.find("hxs"))
+
+        # "hers" starts inside a failed match of "sha"
+        matcher = PhraseMatcher({ANYWHERE: ["sha", "hers"]})
+        self.assertEqual(matcher.find("shers"), "hers")
+
+    def test_anchors(self):
+        """Test start, whole word and anywhere phrases in one automaton."""
+        matcher = PhraseMatcher({
+            START: ["lasten"],
+            WORDS: ["salad"],
+            ANYWHERE: ["ja kahvi"],
+        })
+        self.assertTrue(matcher.matches("Lastenlista"))
+        self.assertFalse(matcher.matches("Ei lasten"))
+        self.assertTrue(matcher.matches("  Salad "))
+        self.assertTrue(matcher.matches("Salad bar"))
+        self.assertFalse(matcher.matches("Salads"))
+        self.assertFalse(matcher.matches("Greek salad"))
+        self.assertTrue(matcher.matches("Leipä ja kahvi"))
+        self.assertFalse(matcher.matches(""))
+
+    def test_matches_like_trying_every_phrase(self):
+        """Test the automaton against trying each phrase on random texts."""
+        rng = random.Random(7)
+        alphabet = "aäbs "
+        words = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+                 for _ in range(40)]
+        phrases = {
+            START: [w.strip() for w in words[:10] if w.strip()],
+            WORDS: [w.strip() for w in words[10:20] if w.strip()],
+            ANYWHERE: [w.strip() for w in words[20:] if len(w.strip()) > 2],
+        }
+        matcher = PhraseMatcher(phrases)
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            self.assertEqual(matcher.matches(text), naive_find(phrases, text), text)
+
+    def test_invalid_anchor(self):
+        """Test that an unknown anchor is rejected with its source."""
+        with self.assertRaisesRegex(ValueError, "test.toml"):
+            PhraseMatcher({"ending": ["x"]}, source="test.toml")
+
+
+class TestProviderDictionaries(unittest.TestCase):
+    def test_dictionaries_are_compiled_once(self):
+        """Test that a provider's dictionaries load once per process."""
+        self.assertIs(load_dictionary("luncher"), load_dictionary("luncher"))
+        self.assertIn("boilerplate", load_dictionary("luncher"))
+        self.assertIn("exclude", load_dictionary("pizza_buffa"))
+
+    def test_luncher_boilerplate(self):
+        """Test boilerplate detection of Luncher menus."""
+        restaurant = KontukeittioNokia()
+        for text in ["Salaattipöytä", "salaattipöytä ja kahvi", "Buffet ", "", "Makea leivonnainen"]:
+            self.assertTrue(restaurant._is_boilerplate(text), text)
+        for text in ["Lohikeitto", "Kinkkusalaatti", "Salaattipöytäkirja"]:
+            self.assertFalse(restaurant._is_boilerplate(text), text)
+
+    def test_pizza_buffa_exclusions(self):
+        """Test that the dictionary excludes what the old patterns excluded."""
+        old_patterns = [
+            r"^\d+[,.]?\d*\s*€",
+            r"^(Buffantai|Lasten|Alle|Lounas:|Pizzavalikoima)",
+            r"(salaatti- ja leipäpöytä|ruokajuomat ja kahvi)",
+        ]
+        restaurant = PizzaBuffa()
+        for dish in [
+            "12,90 € Buffet", "Buffantai-tarjous", "Lasten annos", "Alle 12-vuotiaat",
+            "LOUNAS: Pizza", "Pizzavalikoima vaihtuu", "Sis. salaatti- ja leipäpöytä",
+            "Hintaan ruokajuomat ja kahvi", "Broileripasta (L)", "Kasvislasagne (VEG)",
+        ]:
+            excluded = any(re.search(p, dish, re.IGNORECASE) for p in old_patterns)
+            self.assertEqual(restaurant._is_valid_dish(dish), not excluded, dish)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import scraper
+from restaurants.base import create_session
+from restaurants.instrumentation import reset_instrumentation
+from restaurants.kahvila_epila import KahvilaEpila
+from restaurants.prewarm import prewarm_connections
+
+MENU_HTML = "<h2>Maanantai</h2><p>Lohikeitto (L, G)</p>".encode("utf-8")
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(MENU_HTML)))
+        self.end_headers()
+        self.wfile.write(MENU_HTML)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingServer(ThreadingHTTPServer):
+    """Counts accepted TCP connections."""
+
+    connections = 0
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections += 1
+        return request
+
+
+class TestPrewarm(unittest.TestCase):
+    def setUp(self):
+        self.server = CountingServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        self.instrumentation = reset_instrumentation()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def restaurant(self, session=None):
+        restaurant = KahvilaEpila()
+        restaurant.url = self.url
+        if session:
+            restaurant.session = session
+        return restaurant
+
+    def test_fetch_uses_warm_connection(self):
+        """Test that a fetch after pre-warming opens no connection."""
+        restaurant = self.restaurant()
+        self.assertEqual(prewarm_connections([restaurant]), 1)
+        self.assertEqual(self.server.connections, 1)
+
+        restaurant.fetch()
+        stages = {e["stage"] for e in self.instrumentation.events}
+        self.assertIn("fetch.ttfb", stages)
+        self.assertNotIn("fetch.connect", stages)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_connection_per_concurrent_fetch(self):
+        """Test that restaurants sharing a session get a connection each."""
+        session = create_session(pool_maxsize=4)
+        restaurants = [self.restaurant(session) for _ in range(3)]
+        restaurants.append(MagicMock())  # Not a fetching restaurant, skipped
+
+        self.assertEqual(prewarm_connections(restaurants), 3)
+        self.assertEqual(self.server.connections, 3)
+
+        # Warming again reuses the open connections
+        self.assertEqual(prewarm_connections(restaurants), 3)
+        self.assertEqual(self.server.connections, 3)
+
+    def test_replay_is_not_warmed(self):
+        """Test that replayed sessions open no connections."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env = {"MENU_ARCHIVE_DIR": tmpdir, "MENU_ARCHIVE_MODE": "replay"}
+            with patch.dict(os.environ, env):
+                restaurant = self.restaurant(create_session())
+            self.assertEqual(prewarm_connections([restaurant]), 0)
+        self.assertEqual(self.server.connections, 0)
+
+    def test_post_at_schedule(self):
+        """Test pre-warming before the post time and measuring time to post."""
+        restaurant = self.restaurant()
+        post_at = datetime.now() - timedelta(seconds=1)
+        calls = []
+        env = {"MENU_OUTPUT_FILES": os.path.join(tempfile.gettempdir(), "prewarm-menu.txt")}
+        with patch.dict(os.environ, env, clear=True), \
+                patch("scraper.get_localized_restaurants", return_value={"fi": [restaurant]}), \
+                patch("scraper.post_time", return_value=post_at), \
+                patch("scraper.wait_until", side_effect=lambda moment: calls.append(("wait", moment))), \
+                patch("scraper.prewarm_connections", side_effect=lambda rs: calls.append(("warm", list(rs)))), \
+                patch("scraper.reset_instrumentation", return_value=self.instrumentation):
+            self.assertTrue(scraper.main(["--post-at", "01:30", "--prewarm-lead", "20"]))
+
+        self.assertEqual(calls, [
+            ("wait", post_at - timedelta(seconds=20)),
+            ("warm", [restaurant]),
+            ("wait", post_at),
+        ])
+        time_to_post = [e for e in self.instrumentation.events if e["stage"] == "time_to_post"]
+        self.assertGreaterEqual(time_to_post[0]["duration_s"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
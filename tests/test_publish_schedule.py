@@ -0,0 +1,160 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import scraper
+from publish_schedule import DUE, EARLY, MISSED, READY, WAITING, PublishTracker, learn_schedule
+
+def week_menu(weeks_ago):
+    """The menu a restaurant published in an earlier week."""
+    return {"Maanantai": [f"Lohikeitto {weeks_ago}"], "Tiistai": ["Pasta"]}
+
+
+MENU = week_menu(0)
+
+
+def monday(weeks_ago, hour, minute=0):
+    """A Monday of an earlier week at the given time."""
+    return datetime(2026, 10, 12, hour, minute) - timedelta(weeks=weeks_ago)
+
+
+def fake_restaurant(name, menu):
+    restaurant = MagicMock()
+    restaurant.name = name
+    restaurant.scrape_menu.return_value = menu
+    restaurant.format_current_day_menu.side_effect = lambda week_menu, locale: f"{name}: {week_menu}"
+    return restaurant
+
+
+class TestPublishSchedule(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "publish.db")
+        self.tracker = PublishTracker(self.path)
+
+    def tearDown(self):
+        self.tracker.close()
+        self.tmpdir.cleanup()
+
+    def observe_late_publisher(self, weeks=4):
+        """Menus that appear on Monday between 9:00 and 10:30."""
+        for week in range(1, weeks + 1):
+            for hour in range(1, 12):
+                now = monday(week, hour, 30)
+                published = hour >= 9 + week % 2
+                menu = week_menu(week) if published else {}
+                self.tracker.record_fetches({"Late": menu}, now)
+
+    def test_publish_times_learned(self):
+        """Test that the first appearance of a week's content is recorded."""
+        self.assertEqual(self.tracker.record_fetches({"Late": {}}, monday(1, 8)), [])
+        self.assertEqual(self.tracker.record_fetches({"Late": MENU}, monday(1, 9, 30)), ["Late"])
+        self.assertEqual(self.tracker.record_fetches({"Late": MENU}, monday(1, 10)), [])
+        self.assertEqual(self.tracker.publish_offsets("Late"), [timedelta(hours=9, minutes=30)])
+
+    def test_last_weeks_menu_is_not_a_publish(self):
+        """Test that last week's page still online on Monday is not a publish."""
+        friday = datetime(2026, 10, 16, 12, 0)
+        self.assertEqual(self.tracker.record_fetches({"R": MENU}, friday), ["R"])
+        stale = datetime(2026, 10, 19, 1, 30)
+        self.assertEqual(self.tracker.record_fetches({"R": MENU}, stale), [])
+        self.assertNotEqual(self.tracker.decide("R", stale), READY)
+        self.assertEqual(len(self.tracker.publish_offsets("R")), 1)
+
+        updated = datetime(2026, 10, 19, 9, 30)
+        self.assertEqual(self.tracker.record_fetches({"R": week_menu(1)}, updated), ["R"])
+        self.assertEqual(self.tracker.publish_offsets("R")[0], timedelta(hours=9, minutes=30))
+
+    def test_schedule(self):
+        """Test the fetch window and polling interval of a late publisher."""
+        self.observe_late_publisher()
+        schedule = self.tracker.schedule("Late")
+        self.assertEqual(schedule["first_fetch"], timedelta(hours=8, minutes=30))
+        self.assertEqual(schedule["poll_interval"], timedelta(minutes=30))
+        self.assertEqual(schedule["stop"], timedelta(hours=13, minutes=30))
+        self.assertEqual(learn_schedule([])["first_fetch"], timedelta(0))
+
+    def test_decisions(self):
+        """Test early, due, waiting, missed and ready decisions."""
+        self.observe_late_publisher()
+        self.assertEqual(self.tracker.decide("Late", monday(0, 1, 30)), EARLY)
+        self.assertEqual(self.tracker.decide("Late", monday(0, 9)), DUE)
+        self.tracker.record_fetches({"Late": {}}, monday(0, 9))
+        self.assertEqual(self.tracker.decide("Late", monday(0, 9, 15)), WAITING)
+        self.assertEqual(self.tracker.decide("Late", monday(0, 9, 30)), DUE)
+        self.assertEqual(self.tracker.decide("Late", monday(0, 14)), MISSED)
+        self.tracker.record_fetches({"Late": MENU}, monday(0, 9, 30))
+        self.assertEqual(self.tracker.decide("Late", monday(0, 10)), READY)
+
+
+class TestScheduledRuns(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "publish.db")
+        self.early = fake_restaurant("Early", MENU)
+        self.late = fake_restaurant("Late", MENU)
+        self.sink = MagicMock()
+        tracker = PublishTracker(self.path)
+        for week in range(1, 4):
+            tracker.record_fetches({"Early": week_menu(week), "Late": {}}, monday(week, 1, 30))
+            tracker.record_fetches({"Late": week_menu(week)}, monday(week, 9, 30))
+        tracker.close()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_at(self, now):
+        env = {"PUBLISH_SCHEDULE_DB": self.path, "MENU_OUTPUT_FILES": os.path.join(self.tmpdir.name, "menu.txt")}
+        with patch.dict(os.environ, env, clear=True), \
+                patch("scraper.get_localized_restaurants", return_value={"fi": [self.early, self.late]}), \
+                patch("scraper.dispatch_sync", return_value=[True]) as dispatch, \
+                patch("publish_schedule.datetime") as clock:
+            clock.now.return_value = now
+            clock.fromisoformat = datetime.fromisoformat
+            clock.combine = datetime.combine
+            clock.min = datetime.min
+            self.assertTrue(scraper.main(["--scheduled"]))
+        return dispatch
+
+    def test_late_menu_polled_and_reposted(self):
+        """Test skipping early fetches, polling late menus and reposting once."""
+        dispatch = self.run_at(monday(0, 1, 30))
+        self.late.scrape_menu.assert_not_called()
+        dispatch.assert_called_once()
+        late_menu = dispatch.call_args[0][1].restaurants[1]
+        self.assertEqual(late_menu, ("Late", []))
+
+        # Already posted and nothing due yet: no fetches at all
+        dispatch = self.run_at(monday(0, 5))
+        dispatch.assert_not_called()
+        self.assertEqual(self.early.scrape_menu.call_count, 1)
+
+        # Late menu appears inside its polling window and is reposted
+        dispatch = self.run_at(monday(0, 9, 30))
+        self.late.scrape_menu.assert_called_once()
+        dispatch.assert_called_once()
+
+        dispatch = self.run_at(monday(0, 10, 30))
+        dispatch.assert_not_called()
+
+    def test_corrupt_database_does_not_stop_posting(self):
+        """Test that an unreadable schedule database is logged and ignored."""
+        with open(self.path, "wb") as db_file:
+            db_file.write(b"not a database" * 100)
+        env = {"PUBLISH_SCHEDULE_DB": self.path, "MENU_OUTPUT_FILES": os.path.join(self.tmpdir.name, "menu.txt")}
+        with patch.dict(os.environ, env, clear=True), \
+                patch("scraper.get_localized_restaurants", return_value={"fi": [self.early, self.late]}), \
+                patch("scraper.dispatch_sync", return_value=[True]) as dispatch, \
+                self.assertLogs(level="ERROR"):
+            self.assertTrue(scraper.main([]))
+        dispatch.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
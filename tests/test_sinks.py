@@ -0,0 +1,200 @@
+import unittest
+import sys
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+import socketserver
+from datetime import datetime
+from email import message_from_bytes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import scraper
+from sinks import DayMenu, EmailSink, FileSink, Sink, WebhookSink, dispatch_sync, load_sinks
+from static_export import FILE_MODE
+
+WEDNESDAY = datetime(2026, 10, 14, 9, 0)
+
+WEEK_MENUS = {
+    "Nokian Kartano (FoodCo)": {"Keskiviikko": ["Lohikeitto (L, G)", "Pasta & pesto"]},
+    "Kahvila Epilä": {"Torstai": ["Hernekeitto"]},
+    "Pizza Buffa": None,
+}
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append((self.path, json.loads(body)))
+        self.send_response(500 if self.path == "/broken" else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept one message."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 localhost")
+        while True:
+            command = self.rfile.readline().decode().strip()
+            verb = command.split(" ")[0].upper()
+            if verb == "DATA":
+                self.reply("354 go ahead")
+                data = b""
+                while not data.endswith(b"\r\n.\r\n"):
+                    data += self.rfile.readline()
+                self.server.received.append(data[:-5])
+                self.reply("250 queued")
+            elif verb == "QUIT":
+                self.reply("221 bye")
+                return
+            elif verb in ("EHLO", "HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 ok")
+            else:
+                self.reply("502 unsupported")
+
+
+class SlowSink(Sink):
+    name = "slow"
+
+    def render(self, day_menu):
+        return day_menu.text
+
+    async def send(self, payload):
+        await asyncio.sleep(5)
+
+
+def serve(server):
+    server.received = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TestDayMenu(unittest.TestCase):
+    def test_structured_menu(self):
+        """Test the day menu picked from week menus and its renderings."""
+        day_menu = DayMenu.from_week_menus(WEEK_MENUS, "en", now=WEDNESDAY)
+
+        self.assertEqual(day_menu.title, "Lunch menu - Wednesday")
+        self.assertEqual(day_menu.to_dict()["restaurants"][1], {"name": "Kahvila Epilä", "available": True, "items": []})
+        self.assertIn("• Pasta & pesto", day_menu.text)
+        self.assertIn("Pizza Buffa: Error scraping menu", day_menu.text)
+        self.assertIn("<li>Pasta &amp; pesto</li>", day_menu.html)
+        self.assertIs(day_menu.text, day_menu.text)
+
+
+class TestSinks(unittest.TestCase):
+    def setUp(self):
+        self.day_menu = DayMenu.from_week_menus(WEEK_MENUS, now=WEDNESDAY)
+        self.http = serve(ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler))
+        self.smtp = serve(socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPHandler))
+        self.url = f"http://127.0.0.1:{self.http.server_port}"
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        for server in (self.http, self.smtp):
+            server.shutdown()
+            server.server_close()
+        self.tmpdir.cleanup()
+
+    def test_webhook_formats(self):
+        """Test Slack, Teams and plain JSON payloads."""
+        self.assertEqual(WebhookSink("https://hooks.slack.com/services/x").payload_format, "slack")
+        self.assertEqual(WebhookSink("https://acme.webhook.office.com/x").payload_format, "teams")
+        sinks = [
+            WebhookSink(f"{self.url}/slack", "slack"),
+            WebhookSink(f"{self.url}/teams", "teams"),
+            WebhookSink(f"{self.url}/json"),
+        ]
+        self.assertEqual(dispatch_sync(sinks, self.day_menu), [True, True, True])
+
+        received = dict(self.http.received)
+        self.assertEqual(received["/slack"]["text"], self.day_menu.text)
+        self.assertEqual(received["/teams"]["@type"], "MessageCard")
+        self.assertEqual(received["/json"]["restaurants"][0]["items"][1], "Pasta & pesto")
+
+    def test_email_and_file(self):
+        """Test the SMTP and file sinks."""
+        text_path = os.path.join(self.tmpdir.name, "menu.txt")
+        json_path = os.path.join(self.tmpdir.name, "out", "menu.json")
+        sinks = [
+            EmailSink("127.0.0.1", "lounas@example.com", ["a@example.com", "b@example.com"], port=self.smtp.server_address[1]),
+            FileSink(text_path),
+            FileSink(json_path),
+        ]
+        self.assertEqual(dispatch_sync(sinks, self.day_menu), [True, True, True])
+
+        message = message_from_bytes(self.smtp.received[0])
+        self.assertEqual(message["Subject"], "Lounaslista - Keskiviikko")
+        self.assertEqual(message["To"], "a@example.com, b@example.com")
+        self.assertEqual([part.get_content_type() for part in message.get_payload()], ["text/plain", "text/html"])
+        with open(text_path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), self.day_menu.text)
+        with open(json_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["date"], "2026-10-14")
+        self.assertEqual(os.stat(text_path).st_mode & 0o777, FILE_MODE)
+
+    def test_failures_and_timeouts_are_isolated(self):
+        """Test that a slow or failing sink does not hold up the others."""
+        slow = SlowSink(timeout=0.2)
+        sinks = [slow, WebhookSink(f"{self.url}/broken"), WebhookSink(f"{self.url}/ok")]
+
+        start = time.perf_counter()
+        results = dispatch_sync(sinks, self.day_menu)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(results, [False, False, True])
+        self.assertLess(elapsed, 2)
+        self.assertIn("/ok", dict(self.http.received))
+
+    def test_load_sinks(self):
+        """Test sink configuration from the environment."""
+        env = {
+            "MENU_WEBHOOK_URLS": f"{self.url}/a, https://hooks.slack.com/services/x",
+            "MENU_SMTP_HOST": "127.0.0.1",
+            "MENU_EMAIL_FROM": "lounas@example.com",
+            "MENU_EMAIL_TO": "a@example.com",
+            "MENU_OUTPUT_FILES": "menu.txt",
+            "MENU_SINK_TIMEOUT": "5",
+        }
+        with patch.dict(os.environ, env):
+            sinks = load_sinks()
+        self.assertEqual([sink.name for sink in sinks], ["webhook:127.0.0.1", "webhook:hooks.slack.com", "email", "file:menu.txt"])
+        self.assertEqual({sink.timeout for sink in sinks}, {5.0})
+
+        with patch.dict(os.environ, {"MENU_SMTP_HOST": "127.0.0.1"}), self.assertRaises(ValueError):
+            load_sinks()
+
+    def test_main_without_telegram(self):
+        """Test a scrape run that delivers only to non-Telegram sinks."""
+        json_path = os.path.join(self.tmpdir.name, "menu.json")
+        restaurant = MagicMock()
+        restaurant.name = "Kahvila"
+        restaurant.scrape_menu.return_value = {"Keskiviikko": ["Keitto"]}
+        env = {"MENU_OUTPUT_FILES": json_path, "MENU_WEBHOOK_URLS": f"{self.url}/hook"}
+        with patch.dict(os.environ, env, clear=True), \
+                patch("scraper.get_localized_restaurants", return_value={"fi": [restaurant]}), \
+                patch("telegram_bot.Bot") as bot_class:
+            self.assertTrue(scraper.main([]))
+
+        bot_class.assert_not_called()
+        with open(json_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["restaurants"][0]["name"], "Kahvila")
+        self.assertEqual(self.http.received[0][0], "/hook")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import scraper
+from static_export import MANIFEST_NAME, StaticExporter
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+MONDAY = datetime(2026, 10, 12, 9, 0)
+TUESDAY = datetime(2026, 10, 13, 9, 0)
+
+WEEK_MENUS = {
+    "Nokian Kartano (FoodCo)": {"Maanantai": ["Lohikeitto (L, G)"], "Tiistai": ["Pasta & pesto"]},
+    "Kahvila Epilä": {"Maanantai": ["Hernekeitto"]},
+    "Pizza Buffa": None,
+}
+
+
+class TestStaticExport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.out_dir = self.tmpdir.name
+        self.exporter = StaticExporter(self.out_dir, base_url="https://lounas.example/")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read(self, path):
+        with open(os.path.join(self.out_dir, path), "rb") as f:
+            return f.read()
+
+    def test_bundle_contents(self):
+        """Test the JSON feed, per-day HTML, index and Atom feed."""
+        self.exporter.export(WEEK_MENUS, now=MONDAY)
+
+        week = json.loads(self.read("week.json"))
+        self.assertEqual(week["restaurants"][0]["days"]["Tiistai"]["items"][0]["name"], "Pasta & pesto")
+        self.assertEqual(self.read("index.html"), self.read("day/maanantai.html"))
+        self.assertIn(b"Hernekeitto", self.read("restaurant/kahvila-epila/maanantai.html"))
+
+        feed = ET.fromstring(self.read("feed.xml"))
+        entries = feed.findall(f"{ATOM}entry")
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0].find(f"{ATOM}id").text, "urn:lunch-menu:fi:2026-10-12")
+        self.assertEqual(entries[1].find(f"{ATOM}link").get("href"), "https://lounas.example/day/tiistai.html")
+        self.assertIn("<li>Pasta &amp; pesto</li>", entries[1].find(f"{ATOM}content").text)
+
+    def test_files_get_the_default_mode(self):
+        """Test that exported files are as readable as open() makes them."""
+        umask = os.umask(0o022)
+        os.umask(umask)
+        self.exporter.export(WEEK_MENUS, now=MONDAY)
+        for name in ("week.json", "feed.xml", "index.html", MANIFEST_NAME):
+            mode = os.stat(os.path.join(self.out_dir, name)).st_mode & 0o777
+            self.assertEqual(mode, 0o666 & ~umask, name)
+
+    def test_incremental_export(self):
+        """Test that only files whose content changed are rewritten."""
+        first = self.exporter.export(WEEK_MENUS, now=MONDAY)
+        self.assertEqual(first["unchanged"], 0)
+
+        with patch("static_export.write_atomic") as write_mock:
+            second = self.exporter.export(WEEK_MENUS, now=MONDAY)
+        write_mock.assert_not_called()
+        self.assertEqual(second["written"], 0)
+
+        # A changed Tuesday menu rewrites its views and the feed, nothing else
+        changed = {**WEEK_MENUS, "Kahvila Epilä": {"Maanantai": ["Hernekeitto"], "Tiistai": ["Pulla"]}}
+        third = self.exporter.export(changed, now=MONDAY)
+        self.assertLess(third["written"], first["written"] / 3)
+        self.assertEqual(third["removed"], 0)
+
+    def test_feed_entry_updated_only_on_change(self):
+        """Test that unchanged days keep their Atom updated time."""
+        self.exporter.export(WEEK_MENUS, now=MONDAY)
+        changed = {**WEEK_MENUS, "Kahvila Epilä": {"Maanantai": ["Hernekeitto"], "Tiistai": ["Pulla"]}}
+        self.exporter.export(changed, now=TUESDAY)
+
+        entries = ET.fromstring(self.read("feed.xml")).findall(f"{ATOM}entry")
+        updated = [entry.find(f"{ATOM}updated").text for entry in entries]
+        self.assertTrue(updated[0].startswith("2026-10-12"))
+        self.assertTrue(updated[1].startswith("2026-10-13"))
+
+    def test_stale_files_removed(self):
+        """Test that files of removed restaurants are deleted."""
+        self.exporter.export(WEEK_MENUS, now=MONDAY)
+        menus = {name: menu for name, menu in WEEK_MENUS.items() if name != "Pizza Buffa"}
+        stats = self.exporter.export(menus, now=MONDAY)
+
+        self.assertEqual(stats["removed"], 12)
+        self.assertFalse(os.path.exists(os.path.join(self.out_dir, "restaurant/pizza-buffa.json")))
+        with open(os.path.join(self.out_dir, MANIFEST_NAME)) as f:
+            self.assertNotIn("restaurant/pizza-buffa.json", json.load(f)["files"])
+
+    def test_scraper_export_stage(self):
+        """Test that the scrape run exports when a directory is configured."""
+        instrumentation = MagicMock()
+        with patch.dict(os.environ, {"MENU_EXPORT_DIR": self.out_dir}):
+            scraper.export_static_site(WEEK_MENUS, "en", instrumentation)
+        instrumentation.stage.assert_called_once_with("static", "export")
+        self.assertIn(b'lang="en"', self.read("week.html"))
+
+
+if __name__ == '__main__':
+    unittest.main()